@@ -0,0 +1,112 @@
+"""
+房产存储的内存占用基准：用 tracemalloc 统计每套房产（Property + AVLNode + 复合键）占用的字节数，
+对比改用 __slots__ 前后的实现；另外单独统计按需构建的两个地址索引。
+
+    python benchmarks/memory_footprint.py --rows 1000000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from real_estate.models import Property, PropertyType, PropertyStatus  # noqa: E402
+from real_estate.managers.property_manager import PropertyManager  # noqa: E402
+from real_estate.structures.avl_tree import AVLNode  # noqa: E402
+
+
+class DictProperty:
+    """改动前的 Property：实例属性存放在 __dict__ 中"""
+
+    def __init__(self, property_ID, address, price, property_type, status, owner=None):
+        self.property_ID = property_ID
+        self.address = address
+        self.price = price
+        self.property_type = property_type
+        self.status = status
+        self.owner = owner
+        self.views = 0
+        self.inquiries = 0
+
+
+class DictAVLNode:
+    """改动前的 AVLNode"""
+
+    def __init__(self, key, property_obj):
+        self.key = key
+        self.property = property_obj
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+        self.total = key[0]
+
+
+def make_rows(count, seed=0):
+    rng = random.Random(seed)
+    types = list(PropertyType)
+    # 地址在真实数据中大量重复（同一街道），这里预先生成，使两种实现共享相同的字符串
+    addresses = [f"{i} Main St" for i in range(5000)]
+    return [(i, addresses[i % len(addresses)], float(rng.randrange(50000, 2000000)), rng.choice(types))
+            for i in range(count)]
+
+
+def measure(build, rows):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(rows)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return used / len(rows)
+
+
+def build_nodes(property_cls, node_cls):
+    def build(rows):
+        return [node_cls((price, pid), property_cls(pid, address, price, ptype, PropertyStatus.AVAILABLE))
+                for pid, address, price, ptype in rows]
+    return build
+
+
+def build_manager(rows):
+    manager = PropertyManager()
+    manager.add_properties(Property(pid, address, price, ptype, PropertyStatus.AVAILABLE)
+                           for pid, address, price, ptype in rows)
+    return manager
+
+
+def measure_index(build_index, rows):
+    """在已建好的管理器上单独统计某个按需构建的索引"""
+    manager = build_manager(rows)
+    return measure(lambda _: build_index(manager), rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    before = measure(build_nodes(DictProperty, DictAVLNode), rows)
+    after = measure(build_nodes(Property, AVLNode), rows)
+    manager = measure(build_manager, rows)
+    locations = measure_index(PropertyManager.location_index, rows)
+    addresses = measure_index(PropertyManager.address_index, rows)
+
+    print(f"rows: {args.rows:,}")
+    print(f"Property + AVLNode + key, __dict__:               {before:7.1f} bytes/listing")
+    print(f"Property + AVLNode + key, __slots__:              {after:7.1f} bytes/listing "
+          f"({(1 - after / before) * 100:.0f}% smaller)")
+    print(f"PropertyManager (tree, ID index, market stats):   {manager:7.1f} bytes/listing, "
+          f"{manager * args.rows / 2 ** 20:,.0f} MiB total")
+    print(f"  + location token index (on demand):             {locations:7.1f} bytes/listing")
+    print(f"  + address trigram index (on demand):            {addresses:7.1f} bytes/listing")
+
+
+if __name__ == "__main__":
+    main()
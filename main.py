@@ -1,4 +1,4 @@
-from real_estate.managers import ClientManager, PropertyManager
+from real_estate.managers import ClientManager, PropertyManager, MatchingEngine
 from real_estate.utils.loader import load_dataset
 from PyQt5.QtWidgets import QApplication
 import sys
@@ -13,16 +13,17 @@ def main():
     # 加载数据集
     client_manager, property_manager = load_dataset(data_dir, client_filename, property_filename)
 
+    # 获取所有房产（中序遍历），可售房产只建一次匹配索引，成交后从中移除
+    properties = property_manager.tree.search_by_price_range(float('-inf'), float('inf'))
+    engine = MatchingEngine(properties)
+
     # 处理客户端请求
     while not client_manager.clients.is_empty():
         client = client_manager.clients.dequeue()  # 直接移除队列顶部的客户端
         print(f"Processing client request: {client}")
 
-        # 获取所有房产（中序遍历）
-        properties = property_manager.tree.search_by_price_range(float('-inf'), float('inf'))
-
         # 查找符合预算的房产
-        matches = client_manager.match_properties(properties, client)
+        matches = client_manager.match_properties(engine, client)
         if matches:
             print(f"Matching properties for client {client.client_ID}:")
             for client_match, matched_properties in matches:
@@ -35,6 +36,7 @@ def main():
         if matches:
             property_to_buy = matches[0][1][0]
             client_manager.buy_property(client, property_to_buy.property_ID, property_manager)
+            engine.remove(property_to_buy)
             print(f"Client {client.client_ID} has bought property {property_to_buy.property_ID}.")
         else:
             print(f"Client {client.client_ID} did not buy any property.")
@@ -1,5 +1,5 @@
 from .models import Client, Property, PropertyType, PropertyStatus
-from .structures import AVLTree, ClientQueue
+from .structures import AVLTree, ClientQueue, ClientScheduler
 from .managers import PropertyManager, ClientManager
 from .utils import loader  # 导入 utils 包，允许访问 loader 模块
 
@@ -3,12 +3,11 @@ import os
 from datetime import datetime
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QLineEdit, QTextEdit, QListWidget, QTabWidget,
-    QMenu, QAction, QToolTip, QGraphicsView, QGraphicsScene, QGraphicsEllipseItem,
-    QGraphicsTextItem, QGraphicsItem, QMessageBox, QSizePolicy, QHeaderView, QAbstractScrollArea, QGraphicsDropShadowEffect
+    QTableView, QLineEdit, QTextEdit, QListWidget, QTabWidget,
+    QToolTip, QMessageBox, QSizePolicy, QHeaderView, QProgressBar
 )
-from PyQt5.QtGui import QColor, QBrush, QCursor, QFont, QPen
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, QTimer, QThreadPool
 
 # matplotlib集成
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
@@ -17,85 +16,14 @@ import matplotlib.pyplot as plt
 from ..managers.client_manager import ClientManager
 from ..managers.property_manager import PropertyManager
 from ..utils.loader import load_dataset
-from ..models import PropertyType, PropertyStatus, Property, Client
-from ..structures.avl_tree import AVLTree
+from ..utils.journal import Journal, recover
+from ..utils.analytics import type_distribution, average_price_by_type, transaction_rate_by_type
+from ..structures.client_scheduler import ClientScheduler
+from ..structures.trigram_index import IncrementalSearch
 from .dialogs import AddClientDialog, AddPropertyDialog
-
-# Tree Node for AVL Tree visualization
-class TreeNodeItem(QGraphicsEllipseItem):
-    def __init__(self, node, x, y, gui_ref, radius=48):
-        super().__init__(x - radius, y - radius, 2 * radius, 2 * radius)
-        self.node = node
-        self.gui_ref = gui_ref
-        self.radius = radius
-        self.setAcceptHoverEvents(True)
-        self.setFlag(QGraphicsEllipseItem.ItemIsSelectable, True)
-        # 淡蓝色填充，蓝色边
-        self.setBrush(QBrush(QColor("#d0e8ff")))
-        self.setPen(QPen(QColor("#d0e8ff"), 3))
-        self.setZValue(1)
-
-        prop = node.property
-
-        # 编号（大号居中）
-        self.id_text = QGraphicsTextItem(str(prop.property_ID), self)
-        self.id_text.setFont(QFont('Segoe UI', 19, QFont.Bold))
-        self.id_text.setDefaultTextColor(QColor("#0d233a"))
-        # 价格（小号居中，偏下）
-        price_str = f"¥{int(prop.price)}"
-        self.price_text = QGraphicsTextItem(price_str, self)
-        self.price_text.setFont(QFont('Segoe UI', 11, QFont.Normal))
-        self.price_text.setDefaultTextColor(QColor("#1565c0"))
-
-        # 居中编号
-        id_rect = self.id_text.boundingRect()
-        self.id_text.setPos(
-            self.rect().center().x() - id_rect.width() / 2,
-            self.rect().center().y() - id_rect.height() / 1.9
-        )
-        # 价格在圈内偏下
-        price_rect = self.price_text.boundingRect()
-        self.price_text.setPos(
-            self.rect().center().x() - price_rect.width() / 2,
-            self.rect().center().y() + self.radius/2.2 - price_rect.height() / 2
-        )
-
-    def hoverEnterEvent(self, event):
-        self.setBrush(QBrush(QColor("#90caf9")))  # highlight
-        prop = self.node.property
-        info = f"""ID: {prop.property_ID}\nAddress: {prop.address}\nPrice: {prop.price:.2f}\nType: {prop.property_type.name}\nStatus: {prop.status.name}"""
-        QToolTip.showText(event.screenPos(), info.strip())
-
-    def hoverLeaveEvent(self, event):
-        self.setBrush(QBrush(QColor("#d0e8ff")))
-
-    def contextMenuEvent(self, event):
-        menu = QMenu()
-        delete_action = QAction("Delete Property", menu)
-        delete_action.triggered.connect(self.delete_node)
-        menu.addAction(delete_action)
-        menu.exec_(event.screenPos().toPoint())
-
-    def delete_node(self):
-        prop = self.node.property
-        self.gui_ref.log(f"Deleting property {prop.property_ID} from AVL and manager")
-        self.gui_ref.property_manager.remove_property(prop.property_ID)
-        self.gui_ref.refresh_views()
-
-    # 美化 draw avl node
-    def _draw_avl_node(self, node, x, y, offset):
-        if not node:
-            return
-        node_item = TreeNodeItem(node, x, y, self)
-        self.tree_scene.addItem(node_item)
-        # 连线加粗且美观
-        pen = QPen(QColor("#82c0f3"), 4, Qt.SolidLine)
-        if node.left:
-            self.tree_scene.addLine(x, y + node_item.radius, x - offset, y + 90 - node_item.radius, pen)
-            self._draw_avl_node(node.left, x - offset, y + 90, offset / 1.55)
-        if node.right:
-            self.tree_scene.addLine(x, y + node_item.radius, x + offset, y + 90 - node_item.radius, pen)
-            self._draw_avl_node(node.right, x + offset, y + 90, offset / 1.55)
+from .property_table import PropertyTableModel, ActionButtonDelegate, ACTIONS_COLUMN, PropertyRole
+from .workers import Worker
+from .tree_view import AVLTreeView
 
 # Main GUI class
 class RealEstateGUI(QMainWindow):
@@ -105,11 +33,17 @@ class RealEstateGUI(QMainWindow):
         self.setMinimumSize(1400, 900)
         self.client_manager = ClientManager()
         self.property_manager = PropertyManager()
-        self.avl_tree = AVLTree()
         self.favorites = set()
+        self._client_items = {}  # client_ID -> QListWidgetItem，按事件增量更新客户列表
+        # 加载、匹配与分析在线程池中执行，主线程只负责界面和管理器的修改
+        self.thread_pool = QThreadPool.globalInstance()
+        self._workers = []
+        self.journal = None
+        self._address_search = None  # 输入框逐字搜索时复用上一次结果，首次输入时创建
         self.apply_styles()
         self._build_menu()
         self._build_tabs()
+        self._build_status_bar()
         self.load_initial_data()
 
     def apply_styles(self):
@@ -137,7 +71,7 @@ class RealEstateGUI(QMainWindow):
                 border-radius: 4px;
                 font-size: 18px;
             }
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 alternate-background-color: #f0f4ff;
                 font-size: 18px;
@@ -173,6 +107,54 @@ class RealEstateGUI(QMainWindow):
         help_menu = menubar.addMenu("Help")
         help_menu.addAction("About", lambda: QMessageBox.information(self, "About", "Real Estate System v1.0"))
 
+    def _build_status_bar(self):
+        self.task_label = QLabel()
+        self.task_progress = QProgressBar()
+        self.task_progress.setMaximumWidth(300)
+        self.btn_cancel_task = QPushButton("Cancel")
+        self.btn_cancel_task.clicked.connect(self.cancel_tasks)
+        status = self.statusBar()
+        status.addPermanentWidget(self.task_label)
+        status.addPermanentWidget(self.task_progress)
+        status.addPermanentWidget(self.btn_cancel_task)
+        self._show_task_status(False)
+
+    def _show_task_status(self, visible):
+        for widget in (self.task_label, self.task_progress, self.btn_cancel_task):
+            widget.setVisible(visible)
+
+    def _start_task(self, label, fn, *args, on_result=None, **kwargs):
+        """在线程池中执行 fn（见 Worker），进度显示在状态栏，结果排队回到主线程交给 on_result"""
+        worker = Worker(fn, *args, **kwargs)
+        if on_result is not None:
+            worker.signals.result.connect(on_result)
+        worker.signals.progress.connect(self._on_task_progress)
+        worker.signals.error.connect(lambda message: self.log(f"{label} failed: {message}"))
+        worker.signals.cancelled.connect(lambda: self.log(f"{label} cancelled"))
+        worker.signals.finished.connect(lambda: self._on_task_finished(worker))
+        self._workers.append(worker)
+        self.task_label.setText(f"{label}...")
+        self.task_progress.setRange(0, 0)  # 收到第一次进度前显示忙碌动画
+        self._show_task_status(True)
+        self.thread_pool.start(worker)
+        return worker
+
+    def _on_task_progress(self, done, total):
+        if total > 0:
+            self.task_progress.setRange(0, 1000)
+            self.task_progress.setValue(int(done * 1000 / total))
+        else:
+            self.task_progress.setRange(0, 0)
+
+    def _on_task_finished(self, worker):
+        self._workers.remove(worker)
+        if not self._workers:
+            self._show_task_status(False)
+
+    def cancel_tasks(self):
+        for worker in self._workers:
+            worker.cancel()
+
     def _build_tabs(self):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
@@ -214,24 +196,16 @@ class RealEstateGUI(QMainWindow):
             if widget is not None:
                 widget.deleteLater()
 
+    # 图表数据直接取自 PropertyManager 随修改维护的聚合（O(类型数)），不再扫描全部房产
     def plot_property_type_distribution(self):
-        props = self.property_manager.search_properties()
-        from collections import Counter
-        type_counts = Counter([p.property_type.name for p in props])
+        type_counts = type_distribution(self.property_manager.stats.by_type())
         fig, ax = plt.subplots(figsize=(6, 4))
         ax.pie(type_counts.values(), labels=type_counts.keys(), autopct='%1.1f%%', startangle=90, colors=["#90caf9", "#b2dfdb", "#ffe082", "#ef9a9a"])
         ax.set_title("Property Type Distribution")
         self._show_chart(fig)
 
     def plot_property_type_avg_price(self):
-        props = self.property_manager.search_properties()
-        type_price = {}
-        type_count = {}
-        for p in props:
-            t = p.property_type.name
-            type_price[t] = type_price.get(t, 0) + p.price
-            type_count[t] = type_count.get(t, 0) + 1
-        type_avg = {t: type_price[t]/type_count[t] for t in type_price if type_count[t]}
+        type_avg = average_price_by_type(self.property_manager.stats.by_type())
         fig, ax = plt.subplots(figsize=(6, 4))
         ax.bar(type_avg.keys(), type_avg.values(), color="#64b5f6")
         ax.set_title("Average Price by Type")
@@ -239,15 +213,7 @@ class RealEstateGUI(QMainWindow):
         self._show_chart(fig)
 
     def plot_transaction_rate(self):
-        props = self.property_manager.search_properties()
-        type_total = {}
-        type_sold = {}
-        for p in props:
-            t = p.property_type.name
-            type_total[t] = type_total.get(t, 0) + 1
-            if p.status == PropertyStatus.SOLD:
-                type_sold[t] = type_sold.get(t, 0) + 1
-        type_rate = {t: (type_sold.get(t, 0) / type_total[t]) * 100 for t in type_total}
+        type_rate = transaction_rate_by_type(self.property_manager.stats.by_type())
         fig, ax = plt.subplots(figsize=(6, 4))
         ax.bar(type_rate.keys(), type_rate.values(), color="#81c784")
         ax.set_title("Transaction Rate (%) by Type")
@@ -256,8 +222,7 @@ class RealEstateGUI(QMainWindow):
         self._show_chart(fig)
 
     def plot_hot_properties(self):
-        props = self.property_manager.search_properties()
-        top_props = sorted(props, key=lambda p: p.views, reverse=True)[:10]
+        top_props = self.property_manager.top_viewed(10)
         labels = [f"{p.address[:10]}...({p.property_ID})" for p in top_props]
         views = [p.views for p in top_props]
         fig, ax = plt.subplots(figsize=(8, 5))
@@ -299,11 +264,24 @@ class RealEstateGUI(QMainWindow):
         lbl_prop = QLabel("Property List")
         lbl_prop.setFont(QFont('Segoe UI', 16, QFont.Bold))
         prop_group.addWidget(lbl_prop, alignment=Qt.AlignLeft)
-        self.property_table = QTableWidget()
-        self.property_table.setColumnCount(7)
-        self.property_table.setHorizontalHeaderLabels(["Price", "ID", "Address", "Type", "Status", "Owner", "Actions"])
-        self.property_table.setSizeAdjustPolicy(QAbstractScrollArea.AdjustToContents)
-        self.property_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        # 模型按需从 PropertyManager 取可见行，按钮由委托绘制
+        self.property_model = PropertyTableModel(self.property_manager, self)
+        self.property_table = QTableView()
+        self.property_table.setModel(self.property_model)
+        self.action_delegate = ActionButtonDelegate(self.favorites, self.property_table)
+        self.property_table.setItemDelegateForColumn(ACTIONS_COLUMN, self.action_delegate)
+        # 排队连接：删除会重置模型，不在委托的事件处理中途进行
+        self.action_delegate.favoriteClicked.connect(self.toggle_favorite, Qt.QueuedConnection)
+        self.action_delegate.viewingClicked.connect(self.request_viewing, Qt.QueuedConnection)
+        self.action_delegate.deleteClicked.connect(self.delete_property, Qt.QueuedConnection)
+        # 固定列宽与行高：ResizeToContents 需要测量所有行，大数据量时很慢
+        header = self.property_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        for i in range(ACTIONS_COLUMN):
+            self.property_table.setColumnWidth(i, 180)
+        self.property_table.setColumnWidth(ACTIONS_COLUMN, 400)
+        self.property_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.property_table.verticalHeader().setDefaultSectionSize(40)
         self.property_table.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
         self.property_table.setMinimumHeight(340)
         self.property_table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
@@ -315,14 +293,21 @@ class RealEstateGUI(QMainWindow):
         self.input_search = QLineEdit()
         self.input_search.setPlaceholderText("Search by address or price range (e.g. 100000-500000)")
         controls.addWidget(self.input_search)
+        # 边输入边搜索：停顿 250ms 后才查询，连续输入只触发一次
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(250)
+        self._search_timer.timeout.connect(self._search_as_you_type)
+        self.input_search.textChanged.connect(self._on_search_text_changed)
+        self.input_search.returnPressed.connect(self.search_property)
 
         btn_search = QPushButton("Search")
         btn_search.clicked.connect(self.search_property)
         controls.addWidget(btn_search)
 
-        btn_match = QPushButton("Match and Buy")
-        btn_match.clicked.connect(self.match_and_buy)
-        controls.addWidget(btn_match)
+        self.btn_match = QPushButton("Match and Buy")
+        self.btn_match.clicked.connect(self.match_and_buy)
+        controls.addWidget(self.btn_match)
 
         btn_add_prop = QPushButton("Add Property")
         btn_add_prop.clicked.connect(self.add_property)
@@ -345,56 +330,39 @@ class RealEstateGUI(QMainWindow):
     def _build_tree_tab(self):
         tab = QWidget()
         layout = QVBoxLayout(tab)
-        self.tree_view = QGraphicsView()
-        self.tree_scene = QGraphicsScene()
-        self.tree_view.setScene(self.tree_scene)
-        btn_refresh = QPushButton("Refresh AVL Tree")
-        btn_refresh.clicked.connect(self.refresh_tree_view)
+        # 只绘制可见部分，深层子树折叠为摘要，滚轮缩放、拖动平移
+        self.tree_view = AVLTreeView()
+        self.tree_view.deleteRequested.connect(self.delete_tree_node, Qt.QueuedConnection)
+        btn_refresh = QPushButton("Fit AVL Tree")
+        btn_refresh.clicked.connect(self.fit_tree_view)
         layout.addWidget(btn_refresh)
         layout.addWidget(self.tree_view)
         self.tabs.addTab(tab, "AVL Tree")
 
     def refresh_tree_view(self):
-        self.tree_scene.clear()
-        if not self.avl_tree.root:
-            self.tree_scene.addText("Empty Tree")
-            return
-        width = max(1600, self.tree_view.width())
-        height = max(800, self.tree_view.height())
-        self._draw_avl_node(self.avl_tree.root, width // 2, 60, width // 6)
-        self.tree_view.setSceneRect(0, 0, width, height)
-        self.tree_view.centerOn(width // 2, 0)
+        self.tree_view.refresh()
 
+    def fit_tree_view(self):
+        self.tree_view.fit()
+        self.tree_view.refresh()
 
-    def _draw_avl_node(self, node, x, y, offset):
-        if not node:
-            return
-        node_item = TreeNodeItem(node, x, y, self)
-        self.tree_scene.addItem(node_item)
-        label = QGraphicsTextItem(str(node.property.property_ID))
-        label.setFont(QFont('Segoe UI', 12, QFont.Bold))
-        label.setPos(x - 15, y - 15)
-        self.tree_scene.addItem(label)
-        if node.left:
-            self.tree_scene.addLine(x, y+20, x - offset, y + 80-20)
-            self._draw_avl_node(node.left, x - offset, y + 80, offset / 1.6)
-        if node.right:
-            self.tree_scene.addLine(x, y+20, x + offset, y + 80-20)
-            self._draw_avl_node(node.right, x + offset, y + 80, offset / 1.6)
+    def delete_tree_node(self, property_id):
+        self.log(f"Deleting property {property_id} from AVL and manager")
+        self.property_manager.remove_property(property_id)
 
     def match_and_buy(self):
         if self.client_manager.clients.is_empty():
             self.log("No clients in queue")
             return
-        client = self.client_manager.clients.peek()
+        client = self.client_manager.peek()
+        # 选房与购买都由 buy_property 在主线程完成：它会修改树和聚合，不能与界面的增删并发
         try:
             property_obj = self.client_manager.buy_property(client, None, self.property_manager)
-            self.client_manager.clients.dequeue()
+            self.client_manager.dequeue()
             self.log(f"Client {client.name} purchased property {property_obj.property_ID} ({property_obj.address})")
         except ValueError as e:
             self.log(f"Match failed for {client.name}: {str(e)}")
-            self.client_manager.clients.move_front_to_rear()
-        self.refresh_views()
+            self.client_manager.defer_client(client)
 
     def log(self, message):
         self.log_output.append(f"[INFO] {message} - {self.get_current_time()}")
@@ -402,68 +370,121 @@ class RealEstateGUI(QMainWindow):
     def get_current_time(self):
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+    def _state_path(self, filename):
+        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+        return os.path.join(base_dir, 'datasets', filename)
+
     def load_initial_data(self):
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
         data_dir = os.path.join(base_dir, 'datasets')
         client_file = 'client_requests_dataset.csv'
         property_file = 'real_estate_properties_dataset.csv'
-        self.client_manager, self.property_manager = load_dataset(data_dir, client_file, property_file)
+        self.snapshot_path = self._state_path('portfolio.snapshot')
+        self.journal_path = self._state_path('portfolio.journal')
+        # 加载期间禁用操作，避免修改随后被替换掉的空管理器
+        self.tabs.setEnabled(False)
+        worker = self._start_task("Loading data", self._load_state, data_dir, client_file, property_file,
+                                  on_result=self._on_data_loaded)
+        worker.signals.finished.connect(lambda: self.tabs.setEnabled(True))
+
+    def _load_state(self, data_dir, client_file, property_file, progress):
+        """后台线程：构建新的管理器并返回，不触碰界面"""
+        load_csv = lambda: load_dataset(data_dir, client_file, property_file, progress=progress)
+        # 快照 + 日志尾部恢复上次的运行时状态（成交、业主、预算等）；没有快照时以 CSV 为基线
+        try:
+            client_manager, property_manager, sequence = recover(
+                self.snapshot_path, self.journal_path, fallback=load_csv)
+            warning = None
+        except (ValueError, KeyError) as e:
+            client_manager, property_manager = load_csv()
+            # 无法读取的快照与日志改名保留（*.corrupt），不删除，以便事后排查或手工恢复
+            moved = []
+            for path in (self.snapshot_path, self.journal_path):
+                if os.path.exists(path):
+                    os.replace(path, path + ".corrupt")
+                    moved.append(os.path.basename(path) + ".corrupt")
+            sequence = 0
+            warning = f"Ignoring unreadable saved state: {e}\nThe old files were kept as: {', '.join(moved)}"
+        return client_manager, property_manager, sequence, warning
+
+    def _on_data_loaded(self, result):
+        self.client_manager, self.property_manager, sequence, warning = result
+        if warning:
+            QMessageBox.warning(self, "Recovery Error", warning)
+        # 之后的每次修改都追加到日志，批量 fsync
+        self.journal = Journal(self.journal_path, start_sequence=sequence)
+        self.journal.attach(self.client_manager, self.property_manager)
+        # 日志累积到阈值时定期压缩为快照，避免恢复时回放过长
+        self._compact_timer = QTimer(self)
+        self._compact_timer.timeout.connect(
+            lambda: self.journal.maybe_compact(self.snapshot_path, self.client_manager, self.property_manager))
+        self._compact_timer.start(30000)
+        # 浏览次数先缓冲在管理器中，定期写回
+        self._view_timer = QTimer(self)
+        self._view_timer.timeout.connect(lambda: self.property_manager.flush_views())
+        self._view_timer.start(2000)
+        # 界面按变更事件只更新受影响的行，不再每次操作后整体重建
+        self.client_manager.add_listener(self._on_client_event)
+        self.property_manager.add_listener(self._on_property_event)
+        # 匹配失败的客户按退避推迟，不再每次点击轮转整个队列
+        self.client_manager.use_scheduler(ClientScheduler())
+        self._address_search = None  # 换了管理器，索引在下一次输入时按新数据构建
         self.refresh_views()
+        self.log(f"Loaded {self.property_manager.count_properties()} properties "
+                 f"and {self.client_manager.clients.size()} clients")
 
     def refresh_views(self):
+        """整体重建客户列表、房产表格与树视图（仅用于初次加载和手动刷新）"""
         self.client_list.clear()
+        self._client_items = {}
         for c in self.client_manager.clients.to_list():
-            text = f"{c.client_ID} | {c.name} | {c.contact_info} | Budget: {c.budget:.2f} | Type: {c.property_type.name if c.property_type else 'None'}"
-            self.client_list.addItem(text)
-
-        props = self.property_manager.search_properties()
-        self.populate_property_table(props)
-
-        self.avl_tree = AVLTree()
-        for p in props:
-            self.avl_tree.insert_key((p.price, p.property_ID), p)
+            self._add_client_item(c)
+
+        self.property_model.set_manager(self.property_manager)
+        # 直接展示管理器中的树（同样以 (price, property_ID) 为键），不再逐个插入重建
+        self.tree_view.set_tree(self.property_manager.tree)
+
+    @staticmethod
+    def _client_text(c):
+        return f"{c.client_ID} | {c.name} | {c.contact_info} | Budget: {c.budget:.2f} | Type: {c.property_type.name if c.property_type else 'None'}"
+
+    def _add_client_item(self, client):
+        self.client_list.addItem(self._client_text(client))
+        self._client_items[client.client_ID] = self.client_list.item(self.client_list.count() - 1)
+
+    def _take_client_item(self, client_id):
+        item = self._client_items.pop(client_id, None)
+        if item is not None:
+            self.client_list.takeItem(self.client_list.row(item))
+
+    def _on_client_event(self, event, payload):
+        client = payload["client"]
+        if event == "client_added":
+            self._add_client_item(client)
+        elif event in ("client_removed", "client_dequeued"):
+            self._take_client_item(client.client_ID)
+        elif event == "client_deferred":
+            # 推迟的客户排到其他客户之后
+            self._take_client_item(client.client_ID)
+            self._add_client_item(client)
+        elif event == "client_updated":
+            item = self._client_items.get(client.client_ID)
+            if item is not None:
+                item.setText(self._client_text(client))
+
+    def _on_property_event(self, event, payload):
+        self.property_model.apply_event(event, payload)
+        # 树视图每次只布局可见窗口，直接请求重绘即可（页面不可见时不会绘制）
         self.refresh_tree_view()
 
     def populate_property_table(self, props):
-        self.property_table.setRowCount(0)
-        self.property_table.setRowCount(len(props))
-        # 可选：调整每列宽度，Actions列更宽
-        for i in range(6):
-            self.property_table.setColumnWidth(i, 180)
-        self.property_table.setColumnWidth(6, 400)
-
-        for row, prop in enumerate(props):
-            self.property_table.setItem(row, 0, QTableWidgetItem(f"{prop.price:.2f}"))
-            self.property_table.setItem(row, 1, QTableWidgetItem(str(prop.property_ID)))
-            self.property_table.setItem(row, 2, QTableWidgetItem(prop.address))
-            self.property_table.setItem(row, 3, QTableWidgetItem(prop.property_type.name))
-            self.property_table.setItem(row, 4, QTableWidgetItem(prop.status.name))
-            self.property_table.setItem(row, 5, QTableWidgetItem(prop.owner or "None"))
-
-            actions = QWidget()
-            layout = QHBoxLayout()
-            btn_fav = QPushButton("Favorite" if prop.property_ID not in self.favorites else "Unfavorite")
-            btn_fav.setMinimumWidth(120)
-            btn_fav.clicked.connect(lambda _, pid=prop.property_ID: self.toggle_favorite(pid))
-            btn_view = QPushButton("Request Viewing")
-            btn_view.setMinimumWidth(130)
-            btn_view.clicked.connect(lambda _, pid=prop.property_ID: self.request_viewing(pid))
-            btn_delete = QPushButton("Delete")
-            btn_delete.setMinimumWidth(100)
-            btn_delete.setStyleSheet("background-color:#ee5d5d;")
-            btn_delete.clicked.connect(lambda _, pid=prop.property_ID: self.delete_property(pid))
-            layout.addWidget(btn_fav)
-            layout.addWidget(btn_view)
-            layout.addWidget(btn_delete)
-            layout.setSpacing(16)
-            layout.setContentsMargins(0, 0, 0, 0)
-            actions.setLayout(layout)
-            self.property_table.setCellWidget(row, 6, actions)
+        """表格改为显示给定的房产列表（如搜索结果）"""
+        self.property_model.set_rows(props)
 
     def request_viewing(self, property_id):
         prop = self.property_manager.find_property_by_id(property_id)
         if prop:
-            prop.add_view()
+            self.property_manager.record_views([property_id])
             self.log(f"Viewing requested for property {property_id} ({prop.address})")
         else:
             self.log(f"Property {property_id} not found.")
@@ -475,14 +496,13 @@ class RealEstateGUI(QMainWindow):
         else:
             self.favorites.add(property_id)
             self.log(f"Favorited property {property_id}")
-        self.refresh_views()
+        self.property_model.refresh_property(property_id)
     
     def delete_property(self, property_id):
         confirm = QMessageBox.question(self, "Confirm Deletion", f"Delete property {property_id}?", QMessageBox.Yes | QMessageBox.No)
         if confirm == QMessageBox.Yes:
             self.property_manager.remove_property(property_id)
             self.log(f"Deleted property {property_id}")
-            self.refresh_views()
 
     def delete_selected_client(self):
         selected = self.client_list.currentItem()
@@ -494,7 +514,6 @@ class RealEstateGUI(QMainWindow):
         if confirm == QMessageBox.Yes:
             self.client_manager.remove_client(client_id)
             self.log(f"Deleted client {client_id}")
-            self.refresh_views()
 
     def add_property(self):
         dialog = AddPropertyDialog(self)
@@ -502,7 +521,6 @@ class RealEstateGUI(QMainWindow):
             prop = dialog.get_data()
             if prop:
                 self.property_manager.add_property(prop)
-                self.refresh_views()
 
     def add_client(self):
         dialog = AddClientDialog(self)
@@ -510,7 +528,6 @@ class RealEstateGUI(QMainWindow):
             client = dialog.get_data()
             if client:
                 self.client_manager.add_client(client)
-                self.refresh_views()
 
     def show_client_details(self, item):
         client_id = int(item.text().split('|')[0].strip())
@@ -519,38 +536,89 @@ class RealEstateGUI(QMainWindow):
             QToolTip.showText(self.client_list.mapToGlobal(self.client_list.pos()),
                               f"Client: {client.name}\nContact: {client.contact_info}\nBudget: {client.budget:.2f}\nType: {client.property_type.name if client.property_type else 'None'}")
 
-    def show_property_details(self, item):
-        row = self.property_table.currentRow()
-        prop_id = int(self.property_table.item(row, 1).text())
-        prop = self.property_manager.find_property_by_id(prop_id)
+    def show_property_details(self, index):
+        prop = index.data(PropertyRole)
         if prop:
             QToolTip.showText(self.property_table.mapToGlobal(self.property_table.pos()),
                               f"Property ID: {prop.property_ID}\nAddress: {prop.address}\nPrice: {prop.price:.2f}\nType: {prop.property_type.name}\nStatus: {prop.status.name}\nOwner: {prop.owner or 'None'}")
 
     def analyze_market(self):
-        props = self.property_manager.search_properties()
-        if not props:
+        if not self.property_manager.count_properties():
             self.log("No data to analyze")
             return
-        avg = sum(p.price for p in props) / len(props)
-        counts = {}
-        for p in props:
-            counts[p.property_type.name] = counts.get(p.property_type.name, 0) + 1
-        self.log(f"Avg Price: {avg:.2f}, Distribution: {counts}")
+        # 均价与中位数取自树的子树统计，类型分布取自聚合，均无需全量扫描
+        avg = self.property_manager.average_price()
+        median = self.property_manager.median_price()
+        counts = type_distribution(self.property_manager.stats.by_type())
+        self.log(f"Avg Price: {avg:.2f}, Median Price: {median:.2f}, Distribution: {counts}")
+
+    @staticmethod
+    def _parse_price_range(query):
+        """解析 "100000-500000" 形式的价格区间，不是区间返回 None（含连字符的地址按地址搜索）"""
+        low, sep, high = query.partition('-')
+        try:
+            return (float(low), float(high)) if sep else None
+        except ValueError:
+            return None
+
+    def _on_search_text_changed(self, _):
+        self._address_searcher()  # 第一次输入时才构建地址索引
+        self._search_timer.start()
+
+    def _address_searcher(self):
+        """
+        地址三元组索引只在第一次使用搜索框时构建（同步构建，期间显示等待光标），
+        不用搜索的会话不占这部分内存；之后随增删增量更新。
+        """
+        if self._address_search is None:
+            self.statusBar().showMessage("Indexing addresses...")
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                self._address_search = IncrementalSearch(self.property_manager.address_index())
+            finally:
+                QApplication.restoreOverrideCursor()
+                self.statusBar().clearMessage()
+        return self._address_search
+
+    def _search_as_you_type(self):
+        """输入停顿后预览地址搜索结果，不记录浏览；价格区间在点击 Search 或回车时查询"""
+        query = self.input_search.text().strip()
+        if self._parse_price_range(query):
+            return
+        if not query:
+            # 清空输入框时恢复按名次惰性显示全部房产，不构建全量列表
+            self.property_model.show_all()
+            return
+        self.populate_property_table(self.property_manager.query_address(query, self._address_searcher()))
 
     def search_property(self):
+        self._search_timer.stop()
         query = self.input_search.text().strip()
-        results = []
-        if '-' in query:
-            try:
-                low, high = map(float, query.split('-'))
-                results = self.property_manager.search_properties(price_range=(low, high))
-            except:
-                self.log("Invalid price range")
+        if not query:
+            self.property_model.show_all()
+            return
+        price_range = self._parse_price_range(query)
+        if price_range:
+            results = self.property_manager.search_properties(price_range=price_range)
         else:
-            results = [p for p in self.property_manager.search_properties() if query in p.address]
+            # 地址全文搜索（子串，无命中时模糊匹配），只为明确提交的搜索记录浏览
+            results = self.property_manager.query_address(query, self._address_searcher())
+            self.property_manager.record_views(results)
         self.populate_property_table(results)
 
+    def closeEvent(self, event):
+        # 取消后台任务，等它们在下一次汇报进度时退出
+        self.cancel_tasks()
+        self.thread_pool.waitForDone(5000)
+        if self.journal is not None:
+            # 退出时压缩为快照，下次启动无需回放日志
+            try:
+                self.journal.compact(self.snapshot_path, self.client_manager, self.property_manager)
+            except OSError as e:
+                QMessageBox.warning(self, "Snapshot Error", f"Failed to save snapshot: {e}")
+            self.journal.close()
+        super().closeEvent(event)
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = RealEstateGUI()
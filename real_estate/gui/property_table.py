@@ -0,0 +1,203 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+COLUMNS = ["Price", "ID", "Address", "Type", "Status", "Owner", "Actions"]
+ACTIONS_COLUMN = 6
+PropertyRole = Qt.UserRole  # data() 以该角色返回整行对应的 Property
+_CACHE_LIMIT = 4096
+
+
+class PropertyTableModel(QAbstractTableModel):
+    """
+    房产表格模型。默认按价格顺序显示 PropertyManager 中的全部房产，
+    第 row 行直接用树的 select(row) 取出（O(log n)），搜索时改为显示给定的结果列表。
+    QTableView 只为可见行调用 data()，因此不再为每一行创建单元格对象和按钮控件。
+    """
+
+    def __init__(self, property_manager, parent=None):
+        super().__init__(parent)
+        self.property_manager = property_manager
+        self._rows = None  # None 表示显示全部房产，否则为搜索结果列表
+        self._count = property_manager.count_properties()  # 显示全部时的行数，在 begin/end 之间更新
+        self._cache = {}  # 行号 -> Property，只保留最近绘制过的行
+
+    def set_manager(self, property_manager):
+        self.beginResetModel()
+        self.property_manager = property_manager
+        self._rows = None
+        self._count = property_manager.count_properties()
+        self._cache.clear()
+        self.endResetModel()
+
+    def show_all(self):
+        self.set_manager(self.property_manager)
+
+    def set_rows(self, properties):
+        """显示一组搜索结果（按给定顺序）"""
+        self.beginResetModel()
+        self._rows = list(properties)
+        self._cache.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self._rows is not None:
+            return len(self._rows)
+        return self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def property_at(self, row):
+        if self._rows is not None:
+            return self._rows[row]
+        prop = self._cache.get(row)
+        if prop is None:
+            if len(self._cache) >= _CACHE_LIMIT:
+                self._cache.clear()
+            prop = self._cache[row] = self.property_manager.tree.select(row).property
+        return prop
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        prop = self.property_at(index.row())
+        if role == PropertyRole:
+            return prop
+        if role == Qt.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return f"{prop.price:.2f}"
+            if column == 1:
+                return str(prop.property_ID)
+            if column == 2:
+                return prop.address
+            if column == 3:
+                return prop.property_type.name
+            if column == 4:
+                return prop.status.name
+            if column == 5:
+                return prop.owner or "None"
+        return None
+
+    def _row_of(self, prop):
+        """房产当前所在的行，不在表中返回 None"""
+        if self._rows is None:
+            row = self.property_manager.tree.index_of((prop.price, prop.property_ID))
+            return row if row < self._count and self.property_at(row) is prop else None
+        for row, p in enumerate(self._rows):
+            if p is prop:
+                return row
+        return None
+
+    def _row_changed(self, row):
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+    def refresh_property(self, property_id):
+        """只重绘某一套房产所在的行（如收藏状态变化）"""
+        prop = self.property_manager.find_property_by_id(property_id)
+        row = self._row_of(prop) if prop else None
+        if row is not None:
+            self._row_changed(row)
+
+    def apply_event(self, event, payload):
+        """
+        PropertyManager 变更事件的回调：单条增删改只插入/删除/重绘对应的一行，
+        批量添加与调价（会改变排序）才整体重置。搜索结果列表不自动加入新房产。
+        """
+        if event in ("properties_added", "prices_adjusted"):
+            if self._rows is None:
+                self.set_manager(self.property_manager)
+            elif self._rows:
+                self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, len(COLUMNS) - 1))
+            return
+        prop = payload.get("property")
+        if prop is None:
+            return
+        if event == "property_updated":
+            row = self._row_of(prop)
+            if row is not None:
+                self._row_changed(row)
+        elif event == "property_added" and self._rows is None:
+            row = self.property_manager.tree.index_of((prop.price, prop.property_ID))
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._count += 1
+            self._cache.clear()
+            self.endInsertRows()
+        elif event == "property_removed":
+            if self._rows is None:
+                # 事件在删除之后到达：比它小的 key 数量即它原来的行号
+                row = self.property_manager.tree.index_of((prop.price, prop.property_ID))
+            else:
+                row = self._row_of(prop)
+                if row is None:
+                    return
+            self.beginRemoveRows(QModelIndex(), row, row)
+            if self._rows is None:
+                self._count -= 1
+            else:
+                del self._rows[row]
+            self._cache.clear()
+            self.endRemoveRows()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """在 Actions 列直接绘制三个按钮，并把点击转换为信号（参数为 property_ID），不创建真实控件"""
+
+    favoriteClicked = pyqtSignal(int)
+    viewingClicked = pyqtSignal(int)
+    deleteClicked = pyqtSignal(int)
+
+    BUTTONS = (("favorite", 120), ("viewing", 130), ("delete", 100))
+    SPACING = 16
+
+    def __init__(self, favorites, parent=None):
+        super().__init__(parent)
+        self.favorites = favorites
+
+    def _button_rects(self, rect):
+        x = rect.left()
+        for name, width in self.BUTTONS:
+            yield name, QRect(x, rect.top() + 2, width, rect.height() - 4)
+            x += width + self.SPACING
+
+    def _label(self, name, prop):
+        if name == "favorite":
+            return "Unfavorite" if prop.property_ID in self.favorites else "Favorite"
+        return "Request Viewing" if name == "viewing" else "Delete"
+
+    def paint(self, painter, option, index):
+        prop = index.data(PropertyRole)
+        if prop is None:
+            return
+        style = option.widget.style() if option.widget else QApplication.style()
+        for name, rect in self._button_rects(option.rect):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = self._label(name, prop)
+            button.state = QStyle.State_Enabled | QStyle.State_Raised
+            if name == "delete":
+                button.palette.setColor(QPalette.Button, QColor("#ee5d5d"))
+            style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def sizeHint(self, option, index):
+        width = sum(w for _, w in self.BUTTONS) + self.SPACING * (len(self.BUTTONS) - 1)
+        return QSize(width, 36)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            prop = index.data(PropertyRole)
+            for name, rect in self._button_rects(option.rect):
+                if prop is not None and rect.contains(event.pos()):
+                    signal = {"favorite": self.favoriteClicked, "viewing": self.viewingClicked,
+                              "delete": self.deleteClicked}[name]
+                    signal.emit(prop.property_ID)
+                    return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,222 @@
+import math
+
+from PyQt5.QtCore import Qt, QPointF, QRectF, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor, QFont, QPainter, QPainterPath, QPen
+from PyQt5.QtWidgets import QAbstractScrollArea, QMenu, QToolTip
+
+from ..structures.tree_layout import layout_window, subtree_bounds, NODE
+
+
+class AVLTreeView(QAbstractScrollArea):
+    """
+    AVL 树可视化。不往场景里添加图元，每次绘制时按名次布局只计算可见窗口内的节点，
+    像素宽度不足的子树画成一个摘要三角形（节点数与价格区间），滚轮放大后自动展开。
+    拖动平移，悬停显示详情，右键节点可删除（发出 deleteRequested，由界面执行删除）。
+    """
+
+    deleteRequested = pyqtSignal(int)
+
+    RADIUS = 26
+    LEVEL_HEIGHT = 90
+    MARGIN = 40
+    COLLAPSE_WIDTH = 3 * RADIUS  # 子树宽度小于该像素数时折叠
+    MAX_UNIT = 4 * RADIUS  # 放大上限：每个名次的像素宽度
+
+    NODE_BRUSH = QColor("#d0e8ff")
+    HOVER_BRUSH = QColor("#90caf9")
+    SUMMARY_BRUSH = QColor("#e3f2fd")
+    EDGE_COLOR = QColor("#82c0f3")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tree = None
+        self.unit = self.MAX_UNIT  # 每个名次的像素宽度，由缩放决定
+        self._fitted = False
+        self._cells = []  # 最近一次绘制的单元格，用于悬停与右键命中
+        self._hover = None  # 悬停的节点（摘要时为子树根）
+        self._drag_origin = None
+        self.viewport().setMouseTracking(True)
+        self.horizontalScrollBar().setSingleStep(self.RADIUS)
+        self.verticalScrollBar().setSingleStep(self.RADIUS)
+
+    def set_tree(self, tree):
+        self.tree = tree
+        self._fitted = False
+        self.refresh()
+
+    def refresh(self):
+        """树变化后更新滚动范围并重绘，O(1)"""
+        if self.tree is not None and self.tree.size() and not self._fitted and self.viewport().width() > 0:
+            self.fit()
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def fit(self):
+        """缩放到整棵树恰好占满视口宽度"""
+        self._fitted = True
+        self.unit = self._min_unit()
+        self.horizontalScrollBar().setValue(0)
+
+    def _min_unit(self):
+        count = self.tree.size() if self.tree is not None else 0
+        width = max(1, self.viewport().width() - 2 * self.MARGIN)
+        return min(self.MAX_UNIT, width / count) if count else self.MAX_UNIT
+
+    def _content_size(self):
+        if self.tree is None or self.tree.root is None:
+            return 0, 0
+        width = self.tree.size() * self.unit + 2 * self.MARGIN
+        height = (self.tree.root.height - 1) * self.LEVEL_HEIGHT + 2 * self.MARGIN + 2 * self.RADIUS
+        return width, height
+
+    def _update_scrollbars(self):
+        width, height = self._content_size()
+        view = self.viewport()
+        self.horizontalScrollBar().setRange(0, max(0, int(math.ceil(width - view.width()))))
+        self.horizontalScrollBar().setPageStep(view.width())
+        self.verticalScrollBar().setRange(0, max(0, int(math.ceil(height - view.height()))))
+        self.verticalScrollBar().setPageStep(view.height())
+
+    def _origin(self):
+        """内容坐标到视口坐标的偏移"""
+        return (self.MARGIN - self.horizontalScrollBar().value(),
+                self.MARGIN + self.RADIUS - self.verticalScrollBar().value())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.refresh()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if not steps or self.tree is None or not self.tree.size():
+            return
+        # 以鼠标位置为锚点缩放：锚点下的名次保持不动
+        anchor = event.pos().x()
+        ox, _ = self._origin()
+        rank = (anchor - ox) / self.unit
+        self.unit = max(self._min_unit(), min(self.MAX_UNIT, self.unit * 1.25 ** steps))
+        self._update_scrollbars()
+        self.horizontalScrollBar().setValue(int(self.MARGIN + rank * self.unit - anchor))
+        self.viewport().update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_origin = (event.pos(), self.horizontalScrollBar().value(), self.verticalScrollBar().value())
+            self.viewport().setCursor(Qt.ClosedHandCursor)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_origin = None
+        self.viewport().unsetCursor()
+
+    def mouseMoveEvent(self, event):
+        if self._drag_origin is not None:
+            start, h, v = self._drag_origin
+            delta = event.pos() - start
+            self.horizontalScrollBar().setValue(h - delta.x())
+            self.verticalScrollBar().setValue(v - delta.y())
+            return
+        cell = self._cell_at(event.pos())
+        node = cell.node if cell else None
+        if node is not self._hover:
+            self._hover = node
+            self.viewport().update()
+        if cell is None:
+            QToolTip.hideText()
+        else:
+            QToolTip.showText(event.globalPos(), self._describe(cell), self.viewport())
+
+    def leaveEvent(self, event):
+        self._hover = None
+        self.viewport().update()
+
+    def contextMenuEvent(self, event):
+        cell = self._cell_at(event.pos())
+        if cell is None or cell.kind != NODE:
+            return
+        property_id = cell.node.property.property_ID
+        menu = QMenu(self)
+        menu.addAction("Delete Property", lambda: self.deleteRequested.emit(property_id))
+        menu.exec_(event.globalPos())
+
+    def _cell_at(self, pos):
+        ox, oy = self._origin()
+        for cell in self._cells:
+            y = oy + cell.depth * self.LEVEL_HEIGHT
+            if cell.kind == NODE:
+                if math.hypot(pos.x() - (ox + cell.x), pos.y() - y) <= self.RADIUS:
+                    return cell
+            elif ox + cell.x_start <= pos.x() <= ox + cell.x_end and y - self.RADIUS <= pos.y() <= y + self.RADIUS:
+                return cell
+        return None
+
+    @staticmethod
+    def _describe(cell):
+        if cell.kind == NODE:
+            prop = cell.node.property
+            return (f"ID: {prop.property_ID}\nAddress: {prop.address}\nPrice: {prop.price:.2f}\n"
+                    f"Type: {prop.property_type.name}\nStatus: {prop.status.name}")
+        low, high = subtree_bounds(cell.node)
+        return (f"{cell.node.size} properties (scroll to expand)\n"
+                f"Price: {low.key[0]:.2f} - {high.key[0]:.2f}\nAverage: {cell.node.total / cell.node.size:.2f}")
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.setRenderHint(QPainter.Antialiasing)
+        self._cells = []
+        if self.tree is None or self.tree.root is None:
+            painter.drawText(self.viewport().rect(), Qt.AlignCenter, "Empty Tree")
+            return
+        ox, oy = self._origin()
+        view = self.viewport().rect()
+        # 可见窗口换算为内容坐标；上一层也计入，以便画出从视口外父节点连下来的线
+        x_lo, x_hi = -ox - self.RADIUS, view.width() - ox + self.RADIUS
+        depth_lo = max(0, int((-oy - self.RADIUS) // self.LEVEL_HEIGHT))
+        depth_hi = int((view.height() - oy + self.RADIUS) // self.LEVEL_HEIGHT) + 1
+        self._cells = list(layout_window(self.tree.root, self.unit, x_lo, x_hi, depth_lo, depth_hi,
+                                         self.COLLAPSE_WIDTH))
+
+        painter.setPen(QPen(self.EDGE_COLOR, 3))
+        for cell in self._cells:
+            if cell.kind != NODE:
+                continue
+            y = oy + cell.depth * self.LEVEL_HEIGHT
+            for child_x in (cell.left_x, cell.right_x):
+                if child_x is not None:
+                    painter.drawLine(QPointF(ox + cell.x, y), QPointF(ox + child_x, y + self.LEVEL_HEIGHT))
+
+        id_font = QFont('Segoe UI', 13, QFont.Bold)
+        small_font = QFont('Segoe UI', 9)
+        for cell in self._cells:
+            y = oy + cell.depth * self.LEVEL_HEIGHT
+            brush = self.HOVER_BRUSH if cell.node is self._hover else None
+            if cell.kind == NODE:
+                painter.setPen(QPen(self.NODE_BRUSH.darker(115), 2))
+                painter.setBrush(QBrush(brush or self.NODE_BRUSH))
+                center = QPointF(ox + cell.x, y)
+                painter.drawEllipse(center, self.RADIUS, self.RADIUS)
+                prop = cell.node.property
+                painter.setPen(QColor("#0d233a"))
+                painter.setFont(id_font)
+                painter.drawText(QRectF(center.x() - self.RADIUS, y - self.RADIUS, 2 * self.RADIUS, self.RADIUS * 1.2),
+                                 Qt.AlignHCenter | Qt.AlignBottom, str(prop.property_ID))
+                painter.setPen(QColor("#1565c0"))
+                painter.setFont(small_font)
+                painter.drawText(QRectF(center.x() - 2 * self.RADIUS, y + 2, 4 * self.RADIUS, self.RADIUS),
+                                 Qt.AlignHCenter | Qt.AlignTop, f"¥{int(prop.price)}")
+            else:
+                # 摘要：顶点在子树根的位置，底边覆盖子树的名次范围
+                path = QPainterPath(QPointF(ox + cell.x, y - self.RADIUS))
+                path.lineTo(ox + cell.x_end - 1, y + self.RADIUS)
+                path.lineTo(ox + cell.x_start + 1, y + self.RADIUS)
+                path.closeSubpath()
+                painter.setPen(QPen(self.EDGE_COLOR, 1))
+                painter.setBrush(QBrush(brush or self.SUMMARY_BRUSH))
+                painter.drawPath(path)
+                if cell.x_end - cell.x_start >= 2 * self.RADIUS:
+                    painter.setPen(QColor("#1565c0"))
+                    painter.setFont(small_font)
+                    painter.drawText(QRectF(ox + cell.x_start, y, cell.x_end - cell.x_start, self.RADIUS),
+                                     Qt.AlignCenter, str(cell.node.size))
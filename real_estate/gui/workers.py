@@ -0,0 +1,63 @@
+import logging
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot
+
+logger = logging.getLogger(__name__)
+
+
+class TaskCancelled(Exception):
+    """任务被用户取消，由 progress 回调抛出"""
+
+
+class WorkerSignals(QObject):
+    # 信号在工作线程发出，排队送到主线程的槽函数中处理
+    progress = pyqtSignal('qint64', 'qint64')  # 已完成, 总量（未知时为 0）
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """
+    在 QThreadPool 中执行 fn(*args, progress=..., **kwargs)。
+    fn 用 progress(done, total) 汇报进度；cancel() 之后下一次汇报会抛出 TaskCancelled。
+    fn 只做读取和计算，界面更新与管理器修改都放在主线程的 result 槽中。
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def _progress(self, done, total=None):
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+        self.signals.progress.emit(int(done), int(total or 0))
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.fn(*self.args, progress=self._progress, **self.kwargs)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            logger.exception("Background task %s failed", getattr(self.fn, "__name__", self.fn))
+            self.signals.error.emit(f"{type(e).__name__}: {e}")
+        else:
+            if self._cancelled.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
@@ -1,4 +1,7 @@
 from .client_manager import ClientManager
 from .property_manager import PropertyManager
+from .matching_engine import MatchingEngine
+from .vector_scoring import VectorScorer
+from .market_stats import MarketStats
 
-__all__ = ["ClientManager", "PropertyManager"]
\ No newline at end of file
+__all__ = ["ClientManager", "PropertyManager", "MatchingEngine", "VectorScorer", "MarketStats"]
\ No newline at end of file
@@ -1,94 +1,133 @@
+import heapq
+from operator import itemgetter
 from ..models import Client, Property, PropertyStatus
 from ..structures.client_queue import ClientQueue
-
-class ClientManager:
-    def __init__(self):
-        self.clients = ClientQueue()
+from ..utils.address import token_set
+from .matching_engine import MatchingEngine
+from .vector_scoring import VectorScorer
+from .events import EventEmitter
+
+class ClientManager(EventEmitter):
+    def __init__(self, clients=None):
+        super().__init__()
+        # 默认 FIFO 队列；也可传入 ClientScheduler 等接口兼容的调度器
+        self.clients = clients if clients is not None else ClientQueue()
+
+    def use_scheduler(self, scheduler):
+        """切换到新的调度器（如按优先级/退避调度），按当前顺序迁移已有客户"""
+        for client in self.clients:
+            scheduler.enqueue(client)
+        self.clients = scheduler
 
     def add_client(self, client):
-        if isinstance(client, Client):
+        if isinstance(client, Client) and self.clients.get(client.client_ID) is None:
             self.clients.enqueue(client)
+            self._notify("client_added", client=client)
+
+    def add_clients(self, clients):
+        """批量入队，返回实际新增的客户数（重复 ID 不计）"""
+        before = self.clients.size()
+        for client in clients:
+            self.add_client(client)
+        return self.clients.size() - before
 
     def find_client_by_id(self, client_id):
-        current_node = self.clients.front
-        while current_node:
-            if current_node.data.client_ID == client_id:
-                return current_node.data
-            current_node = current_node.next
-        return None
+        return self.clients.get(client_id)
 
     def remove_client(self, client_id):
-        current = self.clients.front
-        prev = None
-        while current:
-            if current.data.client_ID == client_id:
-                if prev is None:
-                    # 删除头节点
-                    self.clients.front = current.next
-                    if self.clients.front is None:
-                        self.clients.rear = None
-                else:
-                    prev.next = current.next
-                    if current.next is None:
-                        # 如果是尾节点
-                        self.clients.rear = prev
-                self.clients._size -= 1
-                return True
-            prev = current
-            current = current.next
-        return False
-
-    def match_properties(self, properties):
-        matching = []
-        current_node = self.clients.front
-        while current_node:
-            client = current_node.data
-            matched = [
-                p for p in properties
-                if p.price <= client.budget
-                and p.status == PropertyStatus.AVAILABLE
-                and p.property_type == client.property_type
-            ]
-            if matched:
-                matching.append((client, matched))
-            current_node = current_node.next
-        return matching
-
-
-    def match_properties_advanced(self, properties, client):
+        client = self.clients.get(client_id)
+        if client is None or not self.clients.remove(client_id):
+            return False
+        self._notify("client_removed", client=client)
+        return True
+
+    def dequeue(self):
+        """队首客户处理完毕出队"""
+        client = self.clients.dequeue()
+        if client is not None:
+            self._notify("client_dequeued", client=client)
+        return client
+
+    def defer_client(self, client=None):
+        """匹配失败的客户（默认队首）推迟：调度器按退避推迟，FIFO 队列则移到队尾"""
+        client = client or self.clients.peek()
+        if client is None:
+            return None
+        defer = getattr(self.clients, "defer", None)
+        if defer is not None:
+            defer(client)
+        else:
+            self.clients.remove(client.client_ID)
+            self.clients.enqueue(client)
+        self._notify("client_deferred", client=client)
+        return client
+
+    def match_properties(self, properties, client=None):
         """
-        根据客户详细偏好为其匹配房产，返回按匹配分数排序的房产列表。
-        匹配分数考虑预算、类型、位置、特征等。
+        为队列中的客户（或仅为指定 client）匹配预算内、类型一致的可售房产，
+        返回 (client, matched) 列表。房产只建一次索引，每个客户按类型桶二分查找。
+        properties 也可以直接传入已构建好的 MatchingEngine，逐个客户反复匹配时复用同一索引
+        （成交后用 MatchingEngine.remove 移除已售房产）。
+        """
+        engine = properties if isinstance(properties, MatchingEngine) else MatchingEngine(properties)
+        clients = [client] if client is not None else self.clients
+        return engine.match_clients(clients)
+
+
+    def iter_matches_advanced(self, properties, client):
+        """
+        按输入顺序逐个产出 (score, property)，不排序也不缓存结果。
+        打分规则与 match_properties_advanced 相同，适合流式消费大批房产。
         """
-        results = []
+        # 区域词预先切分为 token 集合，地址 token 带缓存，匹配是集合包含判断而非子串扫描
+        neighborhoods = [tokens for tokens in map(token_set, client.preferred_neighborhoods) if tokens]
+        preferred_features = set(client.preferred_features)
         for prop in properties:
             # 如果价格超过预算，不计分，直接跳过
             if prop.price > client.budget:
                 continue
-            score = 0
             # 预算匹配
-            if prop.price <= client.budget:
-                score += 30
+            score = 30
             # 类型匹配
             if prop.property_type == client.property_type:
                 score += 20
             # 区域匹配
-            if hasattr(prop, 'address') and client.preferred_neighborhoods:
-                for n in client.preferred_neighborhoods:
-                    if n in prop.address:
+            if neighborhoods and hasattr(prop, 'address'):
+                address_tokens = token_set(prop.address)
+                for tokens in neighborhoods:
+                    if tokens <= address_tokens:
                         score += 20
                         break
             # 特征匹配
-            if hasattr(prop, 'features') and client.preferred_features:
-                matched = set(client.preferred_features) & set(getattr(prop, 'features', []))
-                score += 10 * len(matched)
+            if preferred_features and hasattr(prop, 'features'):
+                score += 10 * len(preferred_features.intersection(prop.features or ()))
             # 状态可售
-            if hasattr(prop, 'status') and getattr(prop, 'status', None).name == 'AVAILABLE':
+            if getattr(prop, 'status', None) == PropertyStatus.AVAILABLE:
                 score += 10
-            if score > 0:
-                results.append((score, prop))
+            yield score, prop
+
+    def match_properties_advanced(self, properties, client, backend="python", limit=None):
+        """
+        根据客户详细偏好为其匹配房产，返回按匹配分数排序的房产列表。
+        匹配分数考虑预算、类型、位置、特征等。
+        limit=k 时只保留分数最高的 k 个，用大小为 k 的堆筛选，内存 O(k)、排序 O(P log k)。
+        backend="numpy" 时使用列式向量化打分（需要安装 numpy）；
+        properties 也可以直接传入已构建好的 VectorScorer 以便复用。
+        """
+        if isinstance(properties, VectorScorer):
+            return properties.match(client, limit)
+        if backend == "numpy":
+            return VectorScorer(properties).match(client, limit)
+        if backend != "python":
+            raise ValueError(f"Unknown matching backend: {backend}")
+
+        scored = self.iter_matches_advanced(properties, client)
+        if limit is not None:
+            # nlargest 与稳定的降序排序后取前 k 个结果一致
+            return heapq.nlargest(limit, scored, key=itemgetter(0))
+        results = list(scored)
         # 按分数降序排序
-        results.sort(reverse=True, key=lambda x: x[0])
+        results.sort(reverse=True, key=itemgetter(0))
         return results
 
     def buy_property(self, client, property_id, property_manager):
@@ -108,25 +147,20 @@ class ClientManager:
             if client.budget < property_obj.price:
                 raise ValueError("Insufficient budget.")
 
-            property_obj.status = PropertyStatus.SOLD
-            property_obj.owner = client.name
-
         else:
-            matches = property_manager.search_properties(
+            # 纯查询，按价格升序，第一套可售的即最便宜的；自动选房不计入浏览量
+            matches = property_manager.iter_properties(
                 price_range=(0, client.budget),
                 property_type=client.property_type
             )
-            matches = [p for p in matches if p.status == PropertyStatus.AVAILABLE]
+            property_obj = next((p for p in matches if p.status == PropertyStatus.AVAILABLE), None)
 
-            if not matches:
+            if property_obj is None:
                 raise ValueError("No available properties match the client's criteria.")
 
-            matches.sort(key=lambda p: p.price)
-            property_obj = matches[0]
-
-        property_obj.status = PropertyStatus.SOLD
-        property_obj.owner = client.name
+        property_manager.mark_sold(property_obj.property_ID, client.name)
         client.budget -= property_obj.price
+        self._notify("client_updated", client=client)
 
 
 
@@ -136,6 +170,4 @@ class ClientManager:
 
 
     def peek(self):
-        if not self.clients.is_empty():
-            return self.clients.front.data
-        return None
\ No newline at end of file
+        return self.clients.peek()
\ No newline at end of file
@@ -0,0 +1,20 @@
+class EventEmitter:
+    """
+    管理器变更通知：每次修改后以 listener(event, payload) 回调所有监听器，
+    payload 为事件相关对象组成的 dict。日志持久化与界面增量刷新都通过它订阅变更。
+    """
+
+    def __init__(self):
+        self._listeners = []
+
+    def add_listener(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event, **payload):
+        for listener in list(self._listeners):
+            listener(event, payload)
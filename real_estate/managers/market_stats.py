@@ -0,0 +1,114 @@
+import heapq
+
+from ..models import PropertyStatus
+
+
+class MarketStats:
+    """
+    PropertyManager 维护的运行中聚合：按 (类型, 状态) 记录房产数与价格和，
+    每次增删、改状态、改价时 O(1) 更新，仪表盘查询只需 O(类型数 × 状态数)。
+
+    浏览量排行用惰性堆：浏览量变化时压入 (-浏览量, ID)，旧条目不删除，
+    查询时与 _views 中的当前值不符的条目直接丢弃；堆中失效条目过多时整体重建。
+    """
+
+    def __init__(self):
+        self._cells = {}  # (PropertyType, PropertyStatus) -> [数量, 价格和]
+        self._views = {}  # property_ID -> 浏览量（只记录大于 0 的）
+        self._heap = []
+
+    @classmethod
+    def from_properties(cls, properties):
+        stats = cls()
+        for prop in properties:
+            stats.add(prop)
+        return stats
+
+    def _cell(self, prop):
+        cell = self._cells.get((prop.property_type, prop.status))
+        if cell is None:
+            cell = self._cells[(prop.property_type, prop.status)] = [0, 0.0]
+        return cell
+
+    def add(self, prop):
+        cell = self._cell(prop)
+        cell[0] += 1
+        cell[1] += prop.price
+        self.views_changed(prop)
+
+    def remove(self, prop):
+        cell = self._cell(prop)
+        cell[0] -= 1
+        cell[1] -= prop.price
+        self._views.pop(prop.property_ID, None)
+
+    def status_changed(self, prop, old_status):
+        """prop.status 已从 old_status 改为当前值"""
+        if old_status == prop.status:
+            return
+        old = self._cells[(prop.property_type, old_status)]
+        old[0] -= 1
+        old[1] -= prop.price
+        cell = self._cell(prop)
+        cell[0] += 1
+        cell[1] += prop.price
+
+    def price_changed(self, prop, old_price):
+        """prop.price 已从 old_price 改为当前值"""
+        self._cells[(prop.property_type, prop.status)][1] += prop.price - old_price
+
+    def views_changed(self, prop):
+        if prop.views <= 0:
+            self._views.pop(prop.property_ID, None)
+            return
+        if self._views.get(prop.property_ID) == prop.views:
+            return
+        self._views[prop.property_ID] = prop.views
+        heapq.heappush(self._heap, (-prop.views, prop.property_ID))
+        if len(self._heap) > 2 * len(self._views) + 64:
+            self._heap = [(-views, property_id) for property_id, views in self._views.items()]
+            heapq.heapify(self._heap)
+
+    # 查询
+    def count(self, property_type=None, status=None):
+        return sum(cell[0] for (t, s), cell in self._cells.items()
+                   if (property_type is None or t == property_type) and (status is None or s == status))
+
+    def price_sum(self, property_type=None, status=None):
+        return sum(cell[1] for (t, s), cell in self._cells.items()
+                   if (property_type is None or t == property_type) and (status is None or s == status))
+
+    def by_type(self):
+        """{类型名: [数量, 价格和, 成交数]}，只含有房产的类型"""
+        summary = {}
+        for (property_type, status), (count, total) in self._cells.items():
+            if not count:
+                continue
+            entry = summary.setdefault(property_type.name, [0, 0.0, 0])
+            entry[0] += count
+            entry[1] += total
+            if status == PropertyStatus.SOLD:
+                entry[2] += count
+        return summary
+
+    def by_status(self):
+        """{状态名: 数量}"""
+        summary = {}
+        for (_, status), (count, _) in self._cells.items():
+            if count:
+                summary[status.name] = summary.get(status.name, 0) + count
+        return summary
+
+    def top_viewed_ids(self, k):
+        """浏览量最高的至多 k 个 (property_ID, 浏览量)，浏览量相同按 ID；只含浏览量大于 0 的房产"""
+        result = []
+        seen = set()
+        while self._heap and len(result) < k:
+            neg_views, property_id = heapq.heappop(self._heap)
+            if property_id in seen or self._views.get(property_id) != -neg_views:
+                continue  # 失效或重复的条目
+            seen.add(property_id)
+            result.append((property_id, -neg_views))
+        for property_id, views in result:
+            heapq.heappush(self._heap, (-views, property_id))
+        return result
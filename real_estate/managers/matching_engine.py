@@ -0,0 +1,50 @@
+from bisect import bisect_left, bisect_right
+from ..models import PropertyStatus
+
+
+class MatchingEngine:
+    """
+    客户-房产匹配引擎：可售房产按 PropertyType 分桶，桶内按价格升序。
+    匹配客户时只需在其类型桶内二分查找 price <= budget，
+    构建 O(P log P)，单个客户查询 O(log P + 匹配数)。
+    """
+
+    def __init__(self, properties=()):
+        self._prices = {}  # PropertyType -> 升序价格列表
+        self._properties = {}  # PropertyType -> 与价格一一对应的房产列表
+        available = [p for p in properties if p.status == PropertyStatus.AVAILABLE]
+        available.sort(key=lambda p: p.price)  # 稳定排序，同价保持输入顺序
+        for prop in available:
+            self._prices.setdefault(prop.property_type, []).append(prop.price)
+            self._properties.setdefault(prop.property_type, []).append(prop)
+
+    def match(self, client):
+        """返回该客户类型下价格不超过预算的可售房产（按价格升序）"""
+        prices = self._prices.get(client.property_type)
+        if not prices:
+            return []
+        return self._properties[client.property_type][:bisect_right(prices, client.budget)]
+
+    def match_clients(self, clients):
+        """批量匹配，返回 (client, matched) 列表，只包含有匹配结果的客户"""
+        matching = []
+        for client in clients:
+            matched = self.match(client)
+            if matched:
+                matching.append((client, matched))
+        return matching
+
+    def remove(self, property_obj):
+        """房产售出或下架后从桶中移除，返回是否移除成功"""
+        prices = self._prices.get(property_obj.property_type)
+        if not prices:
+            return False
+        bucket = self._properties[property_obj.property_type]
+        i = bisect_left(prices, property_obj.price)
+        while i < len(prices) and prices[i] == property_obj.price:
+            if bucket[i] is property_obj:
+                del prices[i]
+                del bucket[i]
+                return True
+            i += 1
+        return False
@@ -1,77 +1,312 @@
+from collections import Counter
+from operator import itemgetter
+
 from ..models import Property, PropertyStatus, PropertyType
 from ..structures.avl_tree import AVLTree
+from ..structures.column_store import ColumnStore
+from ..structures.token_index import TokenIndex
+from ..structures.trigram_index import TrigramIndex
+from ..utils.address import token_set
+from .events import EventEmitter
+from .market_stats import MarketStats
+from .repricing import plan_repricing
 
-class PropertyManager:
+class PropertyManager(EventEmitter):
     def __init__(self):
-        self.tree = AVLTree()  # 存储 Property，按价格排序
+        super().__init__()
+        self.tree = AVLTree()  # 存储 Property，按 (price, property_ID) 排序
+        self._id_index = {}  # property_ID -> (树中的 key, Property)，按 ID 查找 O(1)
+        self.stats = MarketStats()  # 按类型/状态的聚合与浏览量排行，随每次修改更新
+        # 两个地址索引都在首次使用时构建，之后随增删更新；不按地址查询时不占内存
+        self._location_index = None  # 地址 token -> property_ID 集合，见 utils.address
+        self._address_index = None  # 地址全文（三元组）索引
+        self._pending_views = Counter()  # property_ID -> 尚未计入的浏览次数
+        self._pending_total = 0
 
     def add_property(self, property_obj):
         if not isinstance(property_obj, Property):
             raise ValueError("Must be a Property instance")
-        self.tree.insert_key(property_obj.price, property_obj)
+        if property_obj.property_ID in self._id_index:
+            return False  # 相同 ID 已存在，不插入
+        key = self._make_key(property_obj)
+        self.tree.insert_key(key, property_obj)
+        self._id_index[property_obj.property_ID] = (key, property_obj)
+        self.stats.add(property_obj)
+        self._index_address(property_obj)
+        self._notify("property_added", property=property_obj)
+        return True
+
+    def add_properties(self, properties):
+        """批量添加房产：一次排序后整体构建/归并进树，返回实际新增数量"""
+        batch = {}
+        for property_obj in properties:
+            if not isinstance(property_obj, Property):
+                raise ValueError("Must be a Property instance")
+            property_id = property_obj.property_ID
+            if property_id in self._id_index or property_id in batch:
+                continue  # 相同 ID 已存在，保留先出现的
+            batch[property_id] = property_obj
+        items = [(self._make_key(p), p) for p in batch.values()]
+        self.tree.merge(items)
+        for key, property_obj in items:
+            self._id_index[property_obj.property_ID] = (key, property_obj)
+            self.stats.add(property_obj)
+            self._index_address(property_obj)
+        if items:
+            self._notify("properties_added", properties=[p for _, p in items])
+        return len(items)
+
+    @classmethod
+    def from_sorted(cls, properties):
+        """由已按 (price, property_ID) 升序且 ID 唯一的房产 O(n) 构建（如从快照恢复），不再排序去重"""
+        manager = cls()
+        items = [(cls._make_key(p), p) for p in properties]
+        manager.tree = AVLTree.from_sorted(items)
+        manager._id_index = {item[1].property_ID: item for item in items}
+        manager.stats = MarketStats.from_properties(p for _, p in items)
+        return manager
+
+    def _index_address(self, property_obj):
+        """新增房产写入已构建的地址索引"""
+        if self._location_index is not None:
+            self._location_index.add(property_obj.property_ID, token_set(property_obj.address))
+        if self._address_index is not None:
+            self._address_index.add(property_obj.property_ID, property_obj.address)
+
+    @staticmethod
+    def _make_key(property_obj):
+        # 复合键：价格相同的房产按 ID 区分，既不会被丢弃也不会误删
+        return (property_obj.price, property_obj.property_ID)
 
     def remove_property(self, property_id):
-        node = self.tree.find_by_id(property_id)
-        if node:
-            self.tree.delete_key(node.key)  # 按price删除
+        entry = self._id_index.pop(property_id, None)
+        if entry:
+            self.tree.delete_key(entry[0])  # 按插入时的 key 删除
+            self.stats.remove(entry[1])
+            if self._location_index is not None:
+                self._location_index.remove(property_id, token_set(entry[1].address))
+            if self._address_index is not None:
+                self._address_index.remove(property_id)
+            self._notify("property_removed", property=entry[1])
             return True
         return False
 
     def update_status(self, property_id, new_status):
-        node = self.tree.find_by_id(property_id)
-        if node:
-            property_obj = node.property
+        property_obj = self.find_property_by_id(property_id)
+        if property_obj:
             if new_status == PropertyStatus.SOLD and not property_obj.owner:
                 raise ValueError("A sold property must have an owner.")
             if new_status == PropertyStatus.AVAILABLE and property_obj.owner:
                 raise ValueError("An available property cannot have an owner.")
-            property_obj.status = new_status
+            old_status, property_obj.status = property_obj.status, new_status
+            self.stats.status_changed(property_obj, old_status)
+            self._notify("property_updated", property=property_obj)
             return True
         return False
 
-    def search_properties(self, price_range=None, property_type=None, location=None):
+    def mark_sold(self, property_id, owner):
+        """成交：状态置为 SOLD 并记录业主，返回该房产；不存在返回 None"""
+        property_obj = self.find_property_by_id(property_id)
+        if property_obj:
+            old_status, property_obj.status = property_obj.status, PropertyStatus.SOLD
+            property_obj.owner = owner
+            self.stats.status_changed(property_obj, old_status)
+            self._notify("property_updated", property=property_obj)
+        return property_obj
+
+    def iter_properties(self, price_range=None, property_type=None, location=None):
+        """
+        按价格升序惰性产出符合条件的房产，不统计浏览量。
+        location 按地址 token 匹配（见 utils.address）：查询词的 token 全部出现在地址中即命中，
+        候选集合由倒排索引求交得到；候选比价格区间内的房产少时直接对候选排序，否则扫描区间按 ID 过滤。
+        """
         min_price = price_range[0] if price_range else float('-inf')
         max_price = price_range[1] if price_range else float('inf')
+        if location is None:
+            for prop in self.tree.iter_range(min_price, max_price):
+                if property_type is None or prop.property_type == property_type:
+                    yield prop
+            return
+        ids = self.location_index().lookup(token_set(location))
+        if not ids:
+            return
+        if len(ids) < self.tree.count_in_range(min_price, max_price):
+            for prop in self.properties_by_ids(ids):
+                if min_price <= prop.price <= max_price and \
+                   (property_type is None or prop.property_type == property_type):
+                    yield prop
+            return
+        for prop in self.tree.iter_range(min_price, max_price):
+            if prop.property_ID in ids and (property_type is None or prop.property_type == property_type):
+                yield prop
+
+    def query_properties(self, price_range=None, property_type=None, location=None):
+        """与 search_properties 条件相同的纯查询，返回列表，不统计浏览量；内部扫描都应使用它或 iter_properties"""
+        return list(self.iter_properties(price_range, property_type, location))
 
-        results = []
-
-        def inorder(node):
-            if not node:
-                return
-            if node.key >= min_price:
-                inorder(node.left)
-            if min_price <= node.key <= max_price:
-                prop = node.property
-                if (property_type is None or prop.property_type == property_type) and \
-                   (location is None or prop.address == location):
-                    prop.add_view()  # 统计浏览量
-                    results.append(prop)
-            if node.key <= max_price:
-                inorder(node.right)
-
-        inorder(self.tree.root)
+    def search_properties(self, price_range=None, property_type=None, location=None):
+        """面向用户的搜索：返回结果并为每条结果记录一次浏览（批量缓冲，见 record_views）"""
+        results = self.query_properties(price_range, property_type, location)
+        self.record_views(results)
         return results
 
+    # 浏览量先累加到计数缓冲区，flush_views 时再一次性写回房产与排行，查询本身不写对象
+    VIEW_FLUSH_THRESHOLD = 100000
+
+    def record_views(self, properties):
+        """为一批房产（Property 或 property_ID）各记录一次浏览，缓冲满 VIEW_FLUSH_THRESHOLD 次时自动写回"""
+        pending = self._pending_views
+        count = 0
+        for item in properties:
+            pending[item if isinstance(item, int) else item.property_ID] += 1
+            count += 1
+        self._pending_total += count
+        if self._pending_total >= self.VIEW_FLUSH_THRESHOLD:
+            self.flush_views()
+
+    def flush_views(self):
+        """把缓冲的浏览次数写回房产并更新排行，返回涉及的房产数；已删除的房产忽略"""
+        pending, self._pending_views = self._pending_views, Counter()
+        self._pending_total = 0
+        for property_id, count in pending.items():
+            property_obj = self.find_property_by_id(property_id)
+            if property_obj:
+                property_obj.views += count
+                self.stats.views_changed(property_obj)
+        return len(pending)
+
     def find_property_by_id(self, property_id):
-        node = self.tree.find_by_id(property_id)
-        return node.property if node else None
+        entry = self._id_index.get(property_id)
+        return entry[1] if entry else None
+
+    def properties_by_ids(self, ids):
+        """一组 property_ID 对应的房产，按 (price, property_ID) 升序；不存在的 ID 忽略"""
+        return [entry[1] for entry in sorted(filter(None, map(self._id_index.get, ids)), key=itemgetter(0))]
+
+    def location_index(self):
+        """地址 token 倒排索引（TokenIndex），首次调用时构建；之后的增删即时同步"""
+        if self._location_index is None:
+            index = TokenIndex()
+            for property_id, (_, property_obj) in self._id_index.items():
+                index.add(property_id, token_set(property_obj.address))
+            self._location_index = index
+        return self._location_index
 
-    def adjust_prices(self, high_threshold=10, low_threshold=2, increase_rate=0.05, decrease_rate=0.03):
+    def address_index(self):
+        """地址三元组索引（TrigramIndex），首次调用时构建；之后的增删即时同步"""
+        if self._address_index is None:
+            index = TrigramIndex()
+            for property_id in sorted(self._id_index):  # 按 ID 升序添加，倒排表只需追加
+                index.add(property_id, self._id_index[property_id][1].address)
+            self._address_index = index
+        return self._address_index
+
+    def query_address(self, query, searcher=None, fuzzy_limit=20):
+        """
+        地址全文搜索（纯查询，不统计浏览量）：地址包含 query（忽略大小写）的房产按价格升序返回；
+        没有子串命中时按相似度返回至多 fuzzy_limit 套最接近的房产（容忍拼写错误），fuzzy_limit=0 关闭。
+        searcher 为基于 address_index() 的 IncrementalSearch 时复用上一次查询的结果，适合逐字输入。
+        """
+        index = self.address_index()
+        ids = searcher.search(query) if searcher is not None else index.search(query)
+        if ids or not fuzzy_limit:
+            return self.properties_by_ids(ids)
+        return [self._id_index[property_id][1] for _, property_id in index.fuzzy(query, fuzzy_limit)]
+
+    # 基于子树大小/价格和的统计查询，均为 O(log n)
+    def count_properties(self, price_range=None):
+        if price_range is None:
+            return self.tree.size()
+        return self.tree.count_in_range(*price_range)
+
+    def average_price(self, price_range=None):
+        count = self.count_properties(price_range)
+        if not count:
+            return None
+        total = self.tree.total_price() if price_range is None else self.tree.sum_in_range(*price_range)
+        return total / count
+
+    def kth_cheapest(self, k):
+        """第 k 便宜的房产（k 从 0 开始）"""
+        return self.tree.select(k).property
+
+    def price_percentile(self, p):
+        return self.tree.percentile(p)
+
+    def median_price(self):
+        return self.tree.median()
+
+    def top_viewed(self, k=10):
+        """浏览量最高的 k 套房产（同浏览量按 ID），不足 k 套时用价格最低的未浏览房产补足"""
+        self.flush_views()
+        top = [self.find_property_by_id(property_id) for property_id, _ in self.stats.top_viewed_ids(k)]
+        if len(top) < k:
+            chosen = {p.property_ID for p in top}
+            for prop in self.tree.iter_range():
+                if len(top) >= k:
+                    break
+                if prop.property_ID not in chosen:
+                    top.append(prop)
+        return top
+
+    def export_columns(self, path):
+        """导出为只读列式文件，可用 ColumnStore(path) 映射后直接查询，返回行数"""
+        self.flush_views()
+        return ColumnStore.write(path, self.tree.iter_range())
+
+    def set_prices(self, prices):
+        """
+        批量改价 [(property_ID, 新价格)]：同步更新 ID 索引与聚合，树的 key 一次性重新排布（AVLTree.rekey），
+        返回价格实际变化的房产；不存在的 ID 忽略，同一 ID 出现多次时以最后一次为准。
+        """
+        changes = []
+        changed = []
+        # 先按 ID 合并：同一 ID 的多次改价若逐条串联 key，rekey 的整体重排只会应用第一跳
+        for property_id, price in dict(prices).items():
+            entry = self._id_index.get(property_id)
+            if entry is None or entry[1].price == price:
+                continue
+            old_key, property_obj = entry
+            old_price, property_obj.price = property_obj.price, price
+            new_key = self._make_key(property_obj)
+            self._id_index[property_id] = (new_key, property_obj)
+            self.stats.price_changed(property_obj, old_price)
+            changes.append((old_key, new_key, property_obj))
+            changed.append(property_obj)
+        self.tree.rekey(changes)
+        if changed:
+            self._notify("prices_adjusted", properties=changed)
+        return changed
+
+    def adjust_prices(self, high_threshold=10, low_threshold=2, increase_rate=0.05, decrease_rate=0.03,
+                      dry_run=False, backend="auto"):
         """
         根据房产的浏览量和问询量动态调整价格。
         - 浏览量或问询量高于 high_threshold，涨价 increase_rate
         - 浏览量和问询量低于 low_threshold，降价 decrease_rate
+        新价格一次算出（见 repricing.plan_repricing，可用 numpy），再批量重新排布树并清零浏览量与问询量（reset_interest）。
+        返回按价格顺序的变化列表 [(property_ID, 旧价格, 新价格)]；dry_run=True 时只返回方案，不做任何修改。
         """
-        def inorder(node):
-            if not node:
-                return
-            inorder(node.left)
-            prop = node.property
-            if hasattr(prop, "views") and hasattr(prop, "inquiries"):
-                if prop.views >= high_threshold or prop.inquiries >= high_threshold:
-                    prop.price = round(prop.price * (1 + increase_rate), 2)
-                elif prop.views <= low_threshold and prop.inquiries <= low_threshold:
-                    prop.price = round(prop.price * (1 - decrease_rate), 2)
-                prop.reset_interest()
-            inorder(node.right)
-        inorder(self.tree.root)
\ No newline at end of file
+        self.flush_views()
+        changes, interested = plan_repricing(self.tree.iter_range(), high_threshold, low_threshold,
+                                             increase_rate, decrease_rate, backend)
+        diff = [(prop.property_ID, old_price, new_price) for prop, old_price, new_price in changes]
+        if dry_run:
+            return diff
+        self.set_prices((property_id, new_price) for property_id, _, new_price in diff)
+        self.reset_interest(interested)
+        return diff
+
+    def reset_interest(self, properties):
+        """清零一批房产（Property 或 property_ID）的浏览量与问询量，发出 interest_reset 以便日志回放"""
+        self.flush_views()
+        reset = []
+        for item in properties:
+            property_obj = self.find_property_by_id(item if isinstance(item, int) else item.property_ID)
+            if property_obj:
+                property_obj.reset_interest()
+                self.stats.views_changed(property_obj)
+                reset.append(property_obj)
+        if reset:
+            self._notify("interest_reset", properties=reset)
+        return reset
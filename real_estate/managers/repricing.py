@@ -0,0 +1,60 @@
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，未安装时使用逐个计算的纯 Python 版本
+    np = None
+
+
+def plan_repricing(properties, high_threshold=10, low_threshold=2, increase_rate=0.05, decrease_rate=0.03,
+                   backend="auto"):
+    """
+    计算调价方案，不修改任何房产。规则与 PropertyManager.adjust_prices 相同：
+    - 浏览量或问询量不低于 high_threshold，涨价 increase_rate
+    - 浏览量和问询量都不高于 low_threshold，降价 decrease_rate
+    新价格保留两位小数。返回 (变化列表 [(property, 旧价格, 新价格)], 有浏览或问询的房产列表)。
+    backend="numpy" 时在浏览量/问询量数组上一次性分类，"auto" 在安装了 numpy 时使用它。
+    """
+    properties = properties if isinstance(properties, list) else list(properties)
+    if backend == "auto":
+        backend = "numpy" if np is not None and properties else "python"
+    if backend == "numpy":
+        if np is None:
+            raise ImportError("numpy backend requires numpy")
+        return _plan_numpy(properties, high_threshold, low_threshold, increase_rate, decrease_rate)
+    if backend != "python":
+        raise ValueError(f"Unknown repricing backend: {backend}")
+
+    changes = []
+    interested = []
+    for prop in properties:
+        if prop.views >= high_threshold or prop.inquiries >= high_threshold:
+            new_price = round(prop.price * (1 + increase_rate), 2)
+        elif prop.views <= low_threshold and prop.inquiries <= low_threshold:
+            new_price = round(prop.price * (1 - decrease_rate), 2)
+        else:
+            new_price = prop.price
+        if new_price != prop.price:
+            changes.append((prop, prop.price, new_price))
+        if prop.views or prop.inquiries:
+            interested.append(prop)
+    return changes, interested
+
+
+def _plan_numpy(properties, high_threshold, low_threshold, increase_rate, decrease_rate):
+    n = len(properties)
+    views = np.fromiter((p.views for p in properties), dtype=np.int64, count=n)
+    inquiries = np.fromiter((p.inquiries for p in properties), dtype=np.int64, count=n)
+    raise_mask = (views >= high_threshold) | (inquiries >= high_threshold)
+    lower_mask = ~raise_mask & (views <= low_threshold) & (inquiries <= low_threshold)
+    adjusted = np.flatnonzero(raise_mask | lower_mask)
+    factors = np.where(raise_mask, 1 + increase_rate, 1 - decrease_rate)[adjusted]
+
+    changes = []
+    # 分类在数组上完成；舍入仍逐个使用 Python 的 round，保证与纯 Python 版本逐位一致
+    # （np.round 先乘 100 再取整，个别值会差一分）
+    for i, factor in zip(adjusted.tolist(), factors.tolist()):
+        prop = properties[i]
+        new_price = round(prop.price * factor, 2)
+        if new_price != prop.price:
+            changes.append((prop, prop.price, new_price))
+    interested = [properties[i] for i in np.flatnonzero((views != 0) | (inquiries != 0)).tolist()]
+    return changes, interested
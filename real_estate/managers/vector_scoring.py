@@ -0,0 +1,143 @@
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，未安装时仍可使用纯 Python 的 match_properties_advanced
+    np = None
+
+from ..models import PropertyStatus, PropertyType
+from ..structures.token_index import TokenIndex
+from ..utils.address import token_set
+
+_TYPE_CODES = {t: i for i, t in enumerate(PropertyType)}
+_STATUS_CODES = {s: i for i, s in enumerate(PropertyStatus)}
+_NO_CODE = 255  # 无类型 / 无状态
+_AVAILABLE_CODE = _STATUS_CODES[PropertyStatus.AVAILABLE]
+_BATCH_CELLS = 1 << 22  # 批量打分时每块 客户数×房产数 的上限，控制内存
+
+
+class VectorScorer:
+    """
+    match_properties_advanced 的 NumPy 列式后端，打分规则与纯 Python 版本一致：
+    预算内 +30，类型一致 +20，地址命中偏好区域 +20，每个命中的偏好特征 +10，可售 +10。
+    房产在构建时转换为列：价格 float64、类型/状态编码 uint8、地址 ID int32、特征位图 uint64，
+    之后对单个客户或一批客户只需少量向量运算，top-k 用 argpartition 代替全量排序。
+    """
+
+    def __init__(self, properties):
+        if np is None:
+            raise ImportError("VectorScorer requires numpy")
+        self.properties = list(properties)
+        n = len(self.properties)
+
+        self.prices = np.fromiter((p.price for p in self.properties), dtype=np.float64, count=n)
+        self.type_codes = np.fromiter(
+            (_TYPE_CODES.get(getattr(p, 'property_type', None), _NO_CODE) for p in self.properties),
+            dtype=np.uint8, count=n)
+        self.status_codes = np.fromiter(
+            (_STATUS_CODES.get(getattr(p, 'status', None), _NO_CODE) for p in self.properties),
+            dtype=np.uint8, count=n)
+
+        # 地址去重编号：区域匹配按不同地址计算一次，再按 ID 映射回每套房产
+        address_ids = {}
+        self.address_ids = np.fromiter(
+            (address_ids.setdefault(getattr(p, 'address', None), len(address_ids)) for p in self.properties),
+            dtype=np.int32, count=n)
+        self._addresses = list(address_ids)
+        # 不同地址的 token 倒排索引：区域词命中的地址由倒排表求交得到
+        self._address_tokens = TokenIndex()
+        for address_id, address in enumerate(self._addresses):
+            self._address_tokens.add(address_id, token_set(address))
+        self._neighborhood_hits = {}  # 区域词 -> 各地址是否命中该词（bool 数组）
+
+        # 特征位图：每 64 个特征占一个 uint64 字
+        self._feature_bits = {}
+        masks = []
+        for p in self.properties:
+            mask = 0
+            for feature in getattr(p, 'features', None) or ():
+                mask |= 1 << self._feature_bits.setdefault(feature, len(self._feature_bits))
+            masks.append(mask)
+        words = max(1, (len(self._feature_bits) + 63) // 64)
+        self.feature_words = np.empty((words, n), dtype=np.uint64)
+        for w in range(words):
+            self.feature_words[w] = np.fromiter(
+                ((m >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for m in masks), dtype=np.uint64, count=n)
+
+    def __len__(self):
+        return len(self.properties)
+
+    def _neighborhood_mask(self, neighborhoods):
+        hits = np.zeros(len(self._addresses), dtype=bool)
+        for term in neighborhoods:
+            term_hits = self._neighborhood_hits.get(term)
+            if term_hits is None:
+                term_hits = np.zeros(len(self._addresses), dtype=bool)
+                matched = self._address_tokens.lookup(token_set(term))
+                if matched:
+                    term_hits[np.fromiter(matched, dtype=np.int64, count=len(matched))] = True
+                self._neighborhood_hits[term] = term_hits
+            hits |= term_hits
+        return hits[self.address_ids]
+
+    def _feature_matches(self, features):
+        counts = np.zeros(len(self.properties), dtype=np.int32)
+        for feature in set(features):
+            bit = self._feature_bits.get(feature)
+            if bit is not None:
+                word = self.feature_words[bit // 64]
+                counts += ((word >> np.uint64(bit % 64)) & np.uint64(1)).astype(np.int32)
+        return counts
+
+    def _preference_scores(self, client):
+        # 与预算、类型无关的部分：可售、区域、特征
+        scores = np.where(self.status_codes == _AVAILABLE_CODE, 10, 0).astype(np.int32)
+        if client.preferred_neighborhoods:
+            scores += 20 * self._neighborhood_mask(client.preferred_neighborhoods)
+        if client.preferred_features:
+            scores += 10 * self._feature_matches(client.preferred_features)
+        return scores
+
+    def score(self, client):
+        """返回 (scores, eligible)：每套房产的分数和是否在预算内"""
+        eligible = self.prices <= client.budget
+        scores = self._preference_scores(client) + 30
+        scores += 20 * (self.type_codes == _TYPE_CODES.get(client.property_type, _NO_CODE))
+        return scores, eligible
+
+    def _rank(self, scores, eligible, limit):
+        idx = np.flatnonzero(eligible)
+        if idx.size == 0:
+            return []
+        n = len(self.properties)
+        # 分数相同按输入顺序，与纯 Python 版本的稳定排序一致
+        keys = scores[idx].astype(np.int64) * (n + 1) + (n - idx)
+        if limit is not None and limit < idx.size:
+            if limit <= 0:
+                return []
+            top = np.argpartition(-keys, limit - 1)[:limit]
+            order = top[np.argsort(-keys[top])]
+        else:
+            order = np.argsort(-keys)
+        return [(int(scores[idx[i]]), self.properties[idx[i]]) for i in order]
+
+    def match(self, client, limit=None):
+        """按分数降序返回 [(score, property)]，limit 为 top-k 数量"""
+        scores, eligible = self.score(client)
+        return self._rank(scores, eligible, limit)
+
+    def match_batch(self, clients, limit=None):
+        """批量打分：预算和类型部分对一块客户一次广播计算，返回与 clients 对齐的结果列表"""
+        clients = list(clients)
+        results = []
+        n = max(1, len(self.properties))
+        chunk = max(1, _BATCH_CELLS // n)
+        for start in range(0, len(clients), chunk):
+            block = clients[start:start + chunk]
+            budgets = np.fromiter((c.budget for c in block), dtype=np.float64, count=len(block))
+            codes = np.fromiter((_TYPE_CODES.get(c.property_type, _NO_CODE) for c in block),
+                                dtype=np.uint8, count=len(block))
+            eligible = self.prices[None, :] <= budgets[:, None]
+            base = 30 + 20 * (self.type_codes[None, :] == codes[:, None]).astype(np.int32)
+            for row, client in enumerate(block):
+                scores = base[row] + self._preference_scores(client)
+                results.append(self._rank(scores, eligible[row], limit))
+        return results
@@ -1,6 +1,9 @@
 from .property import PropertyType
 
 class Client:
+    __slots__ = ("client_ID", "name", "contact_info", "budget", "property_type",
+                 "preferred_neighborhoods", "preferred_features")
+
     def __init__(self, client_ID: int, name: str, contact_info: str, budget: float, property_type: PropertyType = None, preferred_neighborhoods=None, preferred_features=None):
         self.client_ID = client_ID
         self.name = name
@@ -15,9 +15,13 @@ class PropertyStatus(Enum):
 
 
 class Property:
+    # 固定字段，不为每个实例分配 __dict__，百万级房产时显著节省内存
+    __slots__ = ("property_ID", "address", "price", "property_type", "status", "owner",
+                 "views", "inquiries", "features")
+
     def __init__(self, property_ID: int, address: str, price: float,
                  property_type: PropertyType, status: PropertyStatus,
-                 owner: Optional[str] = None):
+                 owner: Optional[str] = None, features=None):
         self.property_ID = property_ID
         self.address = address
         self.price = price
@@ -26,6 +30,7 @@ class Property:
         self.owner = owner
         self.views = 0
         self.inquiries = 0
+        self.features = tuple(features) if features else ()  # 无特征时共享同一个空元组
 
     def add_view(self):
         self.views += 1
@@ -39,9 +44,7 @@ class Property:
 
     def __repr__(self):
         owner_str = self.owner if self.owner else "None"
-        features_str = '无'
-        if hasattr(self, 'features') and self.features:
-            features_str = ','.join(self.features)
+        features_str = ','.join(self.features) if self.features else '无'
         return (f"<Property {self.property_ID} | {self.address} | ${self.price:.2f} | "
                 f"{self.property_type.name} | {self.status.name} | Owner: {owner_str} | Features: {features_str}>")
 
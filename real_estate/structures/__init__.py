@@ -1,4 +1,6 @@
 from .avl_tree import AVLTree
 from .client_queue import ClientQueue
+from .client_scheduler import ClientScheduler
+from .column_store import ColumnStore
 
-__all__ = ["AVLTree", "ClientQueue"]
\ No newline at end of file
+__all__ = ["AVLTree", "ClientQueue", "ClientScheduler", "ColumnStore"]
\ No newline at end of file
@@ -1,10 +1,23 @@
+from heapq import merge as _heap_merge
+from operator import attrgetter, itemgetter
+
+
+def key_price(key):
+    """返回 key 中的价格部分，兼容 (price, property_id) 复合键和单独的价格键"""
+    return key[0] if isinstance(key, tuple) else key
+
+
 class AVLNode:
+    __slots__ = ("key", "property", "left", "right", "height", "size", "total")
+
     def __init__(self, key, property_obj):
         self.key = key  # (price, property_id)
         self.property = property_obj
         self.left = None
         self.right = None
         self.height = 1
+        self.size = 1  # 子树节点数
+        self.total = key_price(key)  # 子树价格总和
 
 class AVLTree:
     def __init__(self):
@@ -17,7 +30,11 @@ class AVLTree:
         return self.height(node.left) - self.height(node.right) if node else 0
 
     def update_height(self, node):
-        node.height = max(self.height(node.left), self.height(node.right)) + 1
+        # 旋转和重新平衡都会经过这里，顺带维护子树大小与价格总和
+        left, right = node.left, node.right
+        node.height = max(self.height(left), self.height(right)) + 1
+        node.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+        node.total = key_price(node.key) + (left.total if left else 0) + (right.total if right else 0)
 
     def right_rotate(self, y):
         x = y.left
@@ -37,42 +54,65 @@ class AVLTree:
         self.update_height(y)
         return y
 
-    def insert(self, node, key, property_obj):
-        if not node:
-            return AVLNode(key, property_obj)
-
-        if key < node.key:
-            node.left = self.insert(node.left, key, property_obj)
-        elif key > node.key:
-            node.right = self.insert(node.right, key, property_obj)
-        else:
-            # 已有完全相同key，不允许插入，或者根据需求处理
-            return node
-
+    def _rebalance(self, node):
         self.update_height(node)
-
         balance = self.balance_factor(node)
 
-        # 左左
-        if balance > 1 and key < node.left.key:
-            return self.right_rotate(node)
-
-        # 右右
-        if balance < -1 and key > node.right.key:
-            return self.left_rotate(node)
-
-        # 左右
-        if balance > 1 and key > node.left.key:
+        # 左子树过高：左左 / 左右
+        if balance > 1:
+            if self.balance_factor(node.left) >= 0:
+                return self.right_rotate(node)
             node.left = self.left_rotate(node.left)
             return self.right_rotate(node)
 
-        # 右左
-        if balance < -1 and key < node.right.key:
+        # 右子树过高：右右 / 右左
+        if balance < -1:
+            if self.balance_factor(node.right) <= 0:
+                return self.left_rotate(node)
             node.right = self.right_rotate(node.right)
             return self.left_rotate(node)
 
         return node
 
+    def _rebalance_path(self, path):
+        # 自底向上沿查找路径重新平衡，返回路径顶端（子树根）平衡后的节点
+        subtree = None
+        for i in range(len(path) - 1, -1, -1):
+            current = path[i]
+            subtree = self._rebalance(current)
+            if subtree is not current and i > 0:
+                parent = path[i - 1]
+                if parent.left is current:
+                    parent.left = subtree
+                else:
+                    parent.right = subtree
+        return subtree
+
+    def insert(self, node, key, property_obj):
+        # 显式栈记录查找路径，避免递归调用开销
+        path = []
+        current = node
+        while current:
+            if key < current.key:
+                path.append(current)
+                current = current.left
+            elif key > current.key:
+                path.append(current)
+                current = current.right
+            else:
+                # 已有完全相同key，不允许插入，或者根据需求处理
+                return node
+
+        new_node = AVLNode(key, property_obj)
+        if not path:
+            return new_node
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        return self._rebalance_path(path)
+
     def insert_key(self, key, property_obj):
         self.root = self.insert(self.root, key, property_obj)
 
@@ -82,80 +122,199 @@ class AVLTree:
             current = current.left
         return current
 
-    def delete(self, node, key):
-        if not node:
-            return node
+    @classmethod
+    def from_sorted(cls, items):
+        """由按 key 升序且无重复的 (key, property) 序列 O(n) 构建完全平衡的树"""
+        tree = cls()
+        tree.root = tree._build_balanced(items, 0, len(items))
+        return tree
 
-        if key < node.key:
-            node.left = self.delete(node.left, key)
-        elif key > node.key:
-            node.right = self.delete(node.right, key)
+    @classmethod
+    def bulk_load(cls, items):
+        """由任意顺序的 (key, property) 批量构建：排序一次后 O(n) 建树，重复 key 保留第一个"""
+        return cls.from_sorted(cls._sorted_unique(items))
+
+    @staticmethod
+    def _sorted_unique(items):
+        ordered = sorted(items, key=itemgetter(0))  # 稳定排序，重复 key 保留先出现的
+        unique = []
+        for item in ordered:
+            if not unique or unique[-1][0] != item[0]:
+                unique.append(item)
+        return unique
+
+    def _build_balanced(self, items, lo, hi):
+        nodes = [AVLNode(key, property_obj) for key, property_obj in items[lo:hi]]
+        return self._link_balanced(nodes, 0, len(nodes))
+
+    def _link_balanced(self, nodes, lo, hi):
+        # 把按 key 有序的节点连接成完全平衡的树：取中点作根，递归深度只有 O(log n)
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        left = node.left = self._link_balanced(nodes, lo, mid)
+        right = node.right = self._link_balanced(nodes, mid + 1, hi)
+        # 内联维护高度/大小/价格和，省去批量建树时的方法调用开销
+        height, size, total = 1, 1, key_price(node.key)
+        if left:
+            height = left.height + 1
+            size += left.size
+            total += left.total
+        if right:
+            if right.height >= height:
+                height = right.height + 1
+            size += right.size
+            total += right.total
+        node.height, node.size, node.total = height, size, total
+        return node
+
+    def merge(self, items):
+        """
+        批量并入 (key, property)，已存在的 key 保持不变，返回新增节点数。
+        批次相对树较小时逐个插入 O(k log n)，否则与中序序列线性归并后 O(n + k) 重建。
+        """
+        batch = self._sorted_unique(items)
+        if not batch:
+            return 0
+        before = self.size()
+        if before == 0:
+            self.root = self._build_balanced(batch, 0, len(batch))
+        elif len(batch) * max(1, before.bit_length()) < before:
+            for key, property_obj in batch:
+                self.insert_key(key, property_obj)
         else:
-            # 找到节点，删除
-            if not node.left:
-                return node.right
-            elif not node.right:
-                return node.left
-            else:
-                successor = self._get_min_value_node(node.right)
-                node.key = successor.key
-                node.property = successor.property
-                node.right = self.delete(node.right, successor.key)
+            existing = [(node.key, node.property) for node in self.iter_nodes()]
+            merged = []
+            for item in _heap_merge(existing, batch, key=itemgetter(0)):
+                # 相同 key 时归并保证树中原有的在前
+                if not merged or merged[-1][0] != item[0]:
+                    merged.append(item)
+            self.root = self._build_balanced(merged, 0, len(merged))
+        return self.size() - before
 
-        self.update_height(node)
-        balance = self.balance_factor(node)
+    def rekey(self, changes):
+        """
+        批量修改 key：changes 为 [(旧 key, 新 key, property)]，旧 key 必须在树中且新 key 互不重复。
+        改动相对树较小时逐个删除再插入 O(k log n)，否则改写节点的 key 后重新排序、
+        连接成平衡树，O(n + k log n)。
+        """
+        if not changes:
+            return
+        size = self.size()
+        if len(changes) * max(1, size.bit_length()) < size:
+            for old_key, new_key, property_obj in changes:
+                self.delete_key(old_key)
+                self.insert_key(new_key, property_obj)
+            return
+        # 复用原有节点：改写 key 后整体重新排序并连接成平衡树，不分配新节点
+        new_keys = {old_key: new_key for old_key, new_key, _ in changes}
+        nodes = list(self.iter_nodes())
+        for node in nodes:
+            new_key = new_keys.get(node.key)
+            if new_key is not None:
+                node.key = new_key
+        nodes.sort(key=attrgetter("key"))  # 大部分仍有序，Timsort 按有序段归并
+        self.root = self._link_balanced(nodes, 0, len(nodes))
 
-        # 平衡调整
-        if balance > 1:
-            if self.balance_factor(node.left) >= 0:
-                return self.right_rotate(node)
+    def delete(self, node, key):
+        path = []
+        current = node
+        while current:
+            if key < current.key:
+                path.append(current)
+                current = current.left
+            elif key > current.key:
+                path.append(current)
+                current = current.right
             else:
-                node.left = self.left_rotate(node.left)
-                return self.right_rotate(node)
+                break
+        if not current:
+            return node
 
-        if balance < -1:
-            if self.balance_factor(node.right) <= 0:
-                return self.left_rotate(node)
-            else:
-                node.right = self.right_rotate(node.right)
-                return self.left_rotate(node)
+        # 找到节点，删除
+        if current.left and current.right:
+            # 有两个孩子：用后继节点的数据替换，再摘除后继
+            path.append(current)
+            successor = current.right
+            while successor.left:
+                path.append(successor)
+                successor = successor.left
+            current.key = successor.key
+            current.property = successor.property
+            target, replacement = successor, successor.right
+        else:
+            target, replacement = current, current.left or current.right
 
-        return node
+        if not path:
+            return replacement
+        parent = path[-1]
+        if parent.left is target:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+        return self._rebalance_path(path)
 
     def delete_key(self, key):
         self.root = self.delete(self.root, key)
 
-    # 按 property_id 查找节点 (递归遍历)
+    # 按 key 查找节点 O(log n)
+    def find_key(self, key):
+        node = self.root
+        while node:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    # 按 property_id 查找节点 (显式栈遍历)
     def find_by_id(self, property_id):
         return self._find_by_id(self.root, property_id)
 
     def _find_by_id(self, node, property_id):
-        if not node:
-            return None
-        if node.property.property_ID == property_id:
-            return node
-        left_res = self._find_by_id(node.left, property_id)
-        if left_res:
-            return left_res
-        return self._find_by_id(node.right, property_id)
+        stack = [node] if node else []
+        while stack:
+            current = stack.pop()
+            if current.property.property_ID == property_id:
+                return current
+            if current.right:
+                stack.append(current.right)
+            if current.left:
+                stack.append(current.left)
+        return None
+
+    def iter_nodes(self, min_price=float('-inf'), max_price=float('inf')):
+        """按 key 升序惰性产出价格在 [min_price, max_price] 内的节点（显式栈中序遍历）"""
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                if key_price(node.key) >= min_price:
+                    stack.append(node)
+                    node = node.left
+                else:
+                    # 当前节点及其左子树都低于下限，直接跳到右子树
+                    node = node.right
+            if not stack:
+                return
+            node = stack.pop()
+            if key_price(node.key) > max_price:
+                return
+            yield node
+            node = node.right
+
+    def iter_range(self, min_price=float('-inf'), max_price=float('inf')):
+        """按价格升序惰性产出区间内的房产，不预先构建列表"""
+        for node in self.iter_nodes(min_price, max_price):
+            yield node.property
 
     # 根据 price 范围搜索
     def search_by_price_range(self, min_price, max_price):
-        results = []
-        self._search_inorder(self.root, min_price, max_price, results)
-        return results
+        return list(self.iter_range(min_price, max_price))
 
-    def _search_inorder(self, node, min_price, max_price, results):
-        if not node:
-            return
-        price = node.key
-        if price >= min_price:
-            self._search_inorder(node.left, min_price, max_price, results)
-        if min_price <= price <= max_price:
-            results.append(node.property)
-        if price <= max_price:
-            self._search_inorder(node.right, min_price, max_price, results)
-    
     def display_horizontal(self, node=None, level=0):
         if node is None:
             node = self.root
@@ -172,8 +331,83 @@ class AVLTree:
             self.display_horizontal(node.left, level + 1)
     
     def size(self):
-        def count_nodes(node):
-            if not node:
-                return 0
-            return 1 + count_nodes(node.left) + count_nodes(node.right)
-        return count_nodes(self.root)
+        return self.root.size if self.root else 0
+
+    def total_price(self):
+        return self.root.total if self.root else 0
+
+    def select(self, k):
+        """返回第 k 小（从 0 开始）的节点，O(log n)"""
+        if not 0 <= k < self.size():
+            raise IndexError("AVLTree index out of range")
+        node = self.root
+        while node:
+            left_size = node.left.size if node.left else 0
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def _prefix(self, price, inclusive):
+        # 统计价格小于（或不大于）price 的节点数与价格和
+        count, total = 0, 0
+        node = self.root
+        while node:
+            node_price = key_price(node.key)
+            if node_price < price or (inclusive and node_price == price):
+                if node.left:
+                    count += node.left.size
+                    total += node.left.total
+                count += 1
+                total += node_price
+                node = node.right
+            else:
+                node = node.left
+        return count, total
+
+    def rank(self, price):
+        """价格严格低于 price 的节点数"""
+        return self._prefix(price, inclusive=False)[0]
+
+    def index_of(self, key):
+        """key 小于给定 key 的节点数，即该 key 在中序序列中的位置（不要求 key 存在），O(log n)"""
+        index = 0
+        node = self.root
+        while node:
+            if node.key < key:
+                index += (node.left.size if node.left else 0) + 1
+                node = node.right
+            else:
+                node = node.left
+        return index
+
+    def count_in_range(self, min_price, max_price):
+        if min_price > max_price:
+            return 0
+        return self._prefix(max_price, True)[0] - self._prefix(min_price, False)[0]
+
+    def sum_in_range(self, min_price, max_price):
+        if min_price > max_price:
+            return 0
+        return self._prefix(max_price, True)[1] - self._prefix(min_price, False)[1]
+
+    def percentile(self, p):
+        """第 p 百分位价格（0-100，相邻名次线性插值），空树返回 None"""
+        if not 0 <= p <= 100:
+            raise ValueError("Percentile must be between 0 and 100.")
+        n = self.size()
+        if n == 0:
+            return None
+        pos = (n - 1) * p / 100
+        lower = int(pos)
+        low_price = key_price(self.select(lower).key)
+        if lower == pos:
+            return low_price
+        high_price = key_price(self.select(lower + 1).key)
+        return low_price + (high_price - low_price) * (pos - lower)
+
+    def median(self):
+        return self.percentile(50)
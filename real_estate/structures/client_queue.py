@@ -1,6 +1,9 @@
 class Node:
+    __slots__ = ("data", "prev", "next")
+
     def __init__(self, data):
         self.data = data
+        self.prev = None
         self.next = None
 
 class ClientQueue:
@@ -8,21 +11,21 @@ class ClientQueue:
         self.front = None
         self.rear = None
         self._size = 0
+        self._index = {}  # client_ID -> Node，去重、查找和任意删除均为 O(1)
 
     def enqueue(self, client):
         # 检查队列中是否已经存在相同的客户端
-        current = self.front
-        while current:
-            if current.data.client_ID == client.client_ID:
-                return  # 如果存在相同的客户端，不添加
-            current = current.next
+        if client.client_ID in self._index:
+            return  # 如果存在相同的客户端，不添加
 
         new_node = Node(client)
         if not self.rear:
             self.front = self.rear = new_node
         else:
+            new_node.prev = self.rear
             self.rear.next = new_node
             self.rear = new_node
+        self._index[client.client_ID] = new_node
         self._size += 1
 
     def size(self):
@@ -35,38 +38,58 @@ class ClientQueue:
         if self.is_empty():
             return None
         data = self.front.data
-        self.front = self.front.next
-        if not self.front:
-            self.rear = None
-        self._size -= 1
+        self._unlink(self.front)
         return data
 
+    def _unlink(self, node):
+        # 双向链表摘除节点，同时维护索引和大小
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.front = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.rear = node.prev
+        node.prev = node.next = None
+        del self._index[node.data.client_ID]
+        self._size -= 1
+
+    def get(self, client_id):
+        """按 client_ID 查找客户，不存在返回 None"""
+        node = self._index.get(client_id)
+        return node.data if node else None
+
+    def remove(self, client_id):
+        """按 client_ID 从队列任意位置移除客户，返回是否移除成功"""
+        node = self._index.get(client_id)
+        if not node:
+            return False
+        self._unlink(node)
+        return True
+
     def __contains__(self, client):
+        return client.client_ID in self._index
+
+    def __iter__(self):
         current = self.front
         while current:
-            if current.data.client_ID == client.client_ID:
-                return True
+            yield current.data
             current = current.next
-        return False
-    
+
     def move_front_to_rear(self):
         if self.is_empty():
             return
         node = self.dequeue()
         self.enqueue(node)
 
-    
+
     def peek(self):
         if not self.is_empty():
             return self.front.data
         return None
-    
+
     def to_list(self):
         """将队列中的所有客户转换为列表"""
-        clients = []
-        current = self.front
-        while current:
-            clients.append(current.data)
-            current = current.next
-        return clients
-    
\ No newline at end of file
+        return list(self)
+
@@ -0,0 +1,123 @@
+import heapq
+import itertools
+
+
+class ClientScheduler:
+    """
+    堆实现的客户调度队列，接口与 ClientQueue 兼容（enqueue/dequeue/peek/move_front_to_rear 等）。
+    - 就绪客户按 (key(client), 入队顺序) 出队；key 默认恒为 0，即按等待时间先来先服务，
+      例如 key=lambda c: -c.budget 表示预算高者优先
+    - 匹配失败的客户通过 defer()/move_front_to_rear() 按指数退避暂时移出就绪堆，
+      不再反复占据队首，使可匹配的客户不被饿死
+    入队、出队、推迟均为 O(log n)；按 ID 查找、成员判断、删除为 O(1)（删除为惰性标记）。
+    """
+
+    def __init__(self, key=None, backoff_base=2, max_backoff=1024):
+        self._key = key or (lambda client: 0)
+        self._backoff_base = backoff_base
+        self._max_backoff = max_backoff
+        self._ready = []    # 就绪堆：[priority, seq, client]
+        self._waiting = []  # 退避堆：(ready_at, seq, entry)
+        self._entries = {}  # client_ID -> entry
+        self._failures = {}  # client_ID -> 连续匹配失败次数
+        self._counter = itertools.count()
+        self._clock = 0  # 逻辑时钟：每次出队或推迟前进一步
+        self._size = 0
+
+    def enqueue(self, client):
+        if client.client_ID in self._entries:
+            return  # 如果存在相同的客户端，不添加
+        entry = [self._key(client), next(self._counter), client]
+        self._entries[client.client_ID] = entry
+        heapq.heappush(self._ready, entry)
+        self._size += 1
+
+    def size(self):
+        return self._size
+
+    def is_empty(self):
+        return self._size == 0
+
+    def _promote(self):
+        # 退避到期的客户回到就绪堆；若没有就绪客户，直接快进到最早到期的时刻
+        waiting = self._waiting
+        while waiting and waiting[0][0] <= self._clock:
+            _, _, entry = heapq.heappop(waiting)
+            if entry[2] is not None:
+                heapq.heappush(self._ready, entry)
+        while waiting and not self._has_ready():
+            ready_at, _, entry = heapq.heappop(waiting)
+            self._clock = max(self._clock, ready_at)
+            if entry[2] is not None:
+                heapq.heappush(self._ready, entry)
+
+    def _has_ready(self):
+        ready = self._ready
+        while ready and ready[0][2] is None:
+            heapq.heappop(ready)  # 清理已删除的条目
+        return bool(ready)
+
+    def peek(self):
+        if self.is_empty():
+            return None
+        self._promote()
+        self._has_ready()
+        return self._ready[0][2]
+
+    def dequeue(self):
+        client = self.peek()
+        if client is None:
+            return None
+        heapq.heappop(self._ready)
+        del self._entries[client.client_ID]
+        self._failures.pop(client.client_ID, None)
+        self._size -= 1
+        self._clock += 1
+        return client
+
+    def defer(self, client=None):
+        """匹配失败：把客户（默认队首）按指数退避推迟，返回推迟的步数"""
+        client = client or self.peek()
+        if client is None or client.client_ID not in self._entries:
+            return 0
+        old = self._entries[client.client_ID]
+        old[2] = None  # 原位置惰性删除
+        entry = [old[0], next(self._counter), client]
+        self._entries[client.client_ID] = entry
+        failures = self._failures.get(client.client_ID, 0) + 1
+        self._failures[client.client_ID] = failures
+        delay = min(self._backoff_base ** failures, self._max_backoff)
+        heapq.heappush(self._waiting, (self._clock + delay, entry[1], entry))
+        self._clock += 1
+        return delay
+
+    def move_front_to_rear(self):
+        self.defer()
+
+    def get(self, client_id):
+        entry = self._entries.get(client_id)
+        return entry[2] if entry else None
+
+    def remove(self, client_id):
+        entry = self._entries.pop(client_id, None)
+        if not entry:
+            return False
+        entry[2] = None
+        self._failures.pop(client_id, None)
+        self._size -= 1
+        return True
+
+    def __contains__(self, client):
+        return client.client_ID in self._entries
+
+    def __iter__(self):
+        """按预计出队顺序遍历（不修改堆）：先就绪客户，再按到期时刻排列的退避客户"""
+        ready = sorted(e for e in self._ready if e[2] is not None)
+        waiting = sorted((t, s) + (e[2],) for t, s, e in self._waiting if e[2] is not None)
+        for entry in ready:
+            yield entry[2]
+        for item in waiting:
+            yield item[2]
+
+    def to_list(self):
+        return list(self)
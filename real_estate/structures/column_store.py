@@ -0,0 +1,263 @@
+"""
+只读的列式房产存储，数据文件通过 mmap 映射，查询时不为每行创建 Property 对象。
+
+文件布局（小端序，各列按 8 字节对齐）：
+    头部   magic "RECS" | 版本 u16 | 保留 u16 | 行数 u64 | 字符串数据长度 u64
+    列     价格 d[n]（按 (price, property_ID) 升序）| 价格前缀和 d[n+1] | ID q[n] | 浏览量 q[n]
+           类型 B[n] | 状态 B[n] | 地址偏移 Q[n+1] | 业主偏移 Q[n+1]
+           升序 ID q[n] | 对应行号 Q[n]（按 ID 二分查找）| UTF-8 字符串数据
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, namedtuple
+import mmap
+import os
+import struct
+import sys
+
+from ..models import Property, PropertyType, PropertyStatus
+from ..utils.address import token_set
+
+MAGIC = b"RECS"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHQQ")
+_TYPES = list(PropertyType)
+_STATUSES = list(PropertyStatus)
+_TYPE_CODES = {t: i for i, t in enumerate(_TYPES)}
+_STATUS_CODES = {s: i for i, s in enumerate(_STATUSES)}
+
+
+class PropertyRow(namedtuple("PropertyRow", "property_ID address price property_type status owner views")):
+    """列存储中的一行，只在需要返回结果时才构造"""
+    __slots__ = ()
+
+    def to_property(self):
+        prop = Property(self.property_ID, self.address, self.price, self.property_type, self.status, self.owner)
+        prop.views = self.views
+        return prop
+
+
+def _pad(size):
+    return -size % 8
+
+
+class ColumnStore:
+    """
+    与 PropertyManager 查询接口同名的只读视图：search_properties / iter_properties /
+    count_properties / average_price / kth_cheapest / price_percentile / median_price /
+    find_property_by_id，另有按类型、状态计数的 type_counts / status_counts。
+    价格列有序，区间定位为二分查找；数量、均价、分位数均为 O(log n)，
+    类型/状态过滤直接扫描 uint8 列，地址只在命中时解码。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件无法映射
+            self._file.close()
+            raise ValueError("Not a column store file: empty")
+        self._views = []
+        try:
+            self._open_columns()
+        except Exception:
+            self.close()
+            raise
+
+    def _open_columns(self):
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError("Not a column store file: too short")
+        magic, version, _, n, blob_size = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError("Not a column store file: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported column store version: {version}")
+        if sys.byteorder != "little":
+            raise ValueError("Column store files can only be mapped on little-endian hosts")
+        self._n = n
+        self._pos = _HEADER.size + _pad(_HEADER.size)
+        self.prices = self._column("d", n)
+        self._prefix = self._column("d", n + 1)
+        self.ids = self._column("q", n)
+        self.views = self._column("q", n)
+        self.types = self._column("B", n)
+        self.statuses = self._column("B", n)
+        self._address_offsets = self._column("Q", n + 1)
+        self._owner_offsets = self._column("Q", n + 1)
+        self._sorted_ids = self._column("q", n)
+        self._id_rows = self._column("Q", n)
+        self._blob = self._column("B", blob_size)
+
+    def _column(self, typecode, count):
+        size = struct.calcsize(typecode) * count
+        end = self._pos + size
+        if end > len(self._mmap):
+            raise ValueError("Column store file is truncated")
+        view = memoryview(self._mmap)[self._pos:end].cast(typecode)
+        self._views.append(view)
+        self._pos = end + _pad(size)
+        return view
+
+    def close(self):
+        # 先释放所有 memoryview，mmap 才能关闭
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._n
+
+    @classmethod
+    def write(cls, path, properties):
+        """把房产（Property 或 PropertyRow）写成列式文件，返回写入行数"""
+        rows = sorted(properties, key=lambda p: (p.price, p.property_ID))
+        n = len(rows)
+        prices = array("d", [p.price for p in rows])
+        prefix = array("d", [0.0])
+        total = 0.0
+        for price in prices:
+            total += price
+            prefix.append(total)
+
+        blob = bytearray()
+        address_offsets = array("Q", [0])
+        owner_offsets = array("Q", [0])
+        for p in rows:
+            blob += p.address.encode("utf-8")
+            address_offsets.append(len(blob))
+        for p in rows:
+            if p.owner:
+                blob += p.owner.encode("utf-8")
+            owner_offsets.append(len(blob))
+
+        id_rows = sorted(range(n), key=lambda i: rows[i].property_ID)
+        columns = [
+            prices, prefix,
+            array("q", [p.property_ID for p in rows]),
+            array("q", [getattr(p, "views", 0) for p in rows]),
+            bytes(_TYPE_CODES[p.property_type] for p in rows),
+            bytes(_STATUS_CODES[p.status] for p in rows),
+            address_offsets, owner_offsets,
+            array("q", [rows[i].property_ID for i in id_rows]),
+            array("Q", id_rows),
+            bytes(blob),
+        ]
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, n, len(blob)))
+            f.write(bytes(_pad(_HEADER.size)))
+            for column in columns:
+                if isinstance(column, array):
+                    if sys.byteorder == "big":
+                        column.byteswap()
+                    column = column.tobytes()
+                f.write(column)
+                f.write(bytes(_pad(len(column))))
+        os.replace(tmp_path, path)
+        return n
+
+    # 行访问
+    def _string(self, offsets, i):
+        start, end = offsets[i], offsets[i + 1]
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def address(self, i):
+        return self._string(self._address_offsets, i)
+
+    def row(self, i):
+        owner = self._string(self._owner_offsets, i) or None
+        return PropertyRow(self.ids[i], self.address(i), self.prices[i], _TYPES[self.types[i]],
+                           _STATUSES[self.statuses[i]], owner, self.views[i])
+
+    def _bounds(self, price_range):
+        if price_range is None:
+            return 0, self._n
+        return bisect_left(self.prices, price_range[0]), bisect_right(self.prices, price_range[1])
+
+    # 查询
+    def iter_rows(self, price_range=None, property_type=None, location=None):
+        """按价格升序产出满足条件的行号"""
+        lo, hi = self._bounds(price_range)
+        if property_type is None:
+            candidates = range(lo, hi)
+        else:
+            code = _TYPE_CODES[property_type]
+            candidates = (i for i, c in enumerate(self.types[lo:hi], lo) if c == code)
+        if location is None:
+            yield from candidates
+            return
+        # 与 PropertyManager 相同的地址 token 匹配；同一地址的 token 集合有缓存
+        target = token_set(location)
+        if not target:
+            return
+        for i in candidates:
+            if target <= token_set(self.address(i)):
+                yield i
+
+    def iter_properties(self, price_range=None, property_type=None, location=None):
+        for i in self.iter_rows(price_range, property_type, location):
+            yield self.row(i)
+
+    def search_properties(self, price_range=None, property_type=None, location=None):
+        """与 PropertyManager.search_properties 条件相同，返回 PropertyRow 列表；只读，不统计浏览量"""
+        return list(self.iter_properties(price_range, property_type, location))
+
+    def find_property_by_id(self, property_id):
+        i = bisect_left(self._sorted_ids, property_id)
+        if i < self._n and self._sorted_ids[i] == property_id:
+            return self.row(self._id_rows[i])
+        return None
+
+    def count_properties(self, price_range=None):
+        lo, hi = self._bounds(price_range)
+        return max(0, hi - lo)
+
+    def average_price(self, price_range=None):
+        lo, hi = self._bounds(price_range)
+        if hi <= lo:
+            return None
+        return (self._prefix[hi] - self._prefix[lo]) / (hi - lo)
+
+    def kth_cheapest(self, k):
+        """第 k 便宜的房产（k 从 0 开始）"""
+        if not 0 <= k < self._n:
+            raise IndexError("k out of range")
+        return self.row(k)
+
+    def price_percentile(self, p):
+        """第 p 百分位价格（0-100，相邻名次线性插值），与 AVLTree.percentile 一致"""
+        if not 0 <= p <= 100:
+            raise ValueError("Percentile must be between 0 and 100.")
+        if self._n == 0:
+            return None
+        pos = (self._n - 1) * p / 100
+        lower = int(pos)
+        if lower == pos:
+            return self.prices[lower]
+        return self.prices[lower] + (self.prices[lower + 1] - self.prices[lower]) * (pos - lower)
+
+    def median_price(self):
+        return self.price_percentile(50)
+
+    def type_counts(self, price_range=None):
+        """各 PropertyType 的房产数，bytes.count 在 C 层扫描 uint8 列"""
+        lo, hi = self._bounds(price_range)
+        codes = self.types[lo:hi].tobytes()
+        counts = {t: codes.count(code) for t, code in _TYPE_CODES.items()}
+        return Counter({k: v for k, v in counts.items() if v})
+
+    def status_counts(self, price_range=None):
+        lo, hi = self._bounds(price_range)
+        codes = self.statuses[lo:hi].tobytes()
+        counts = {s: codes.count(code) for s, code in _STATUS_CODES.items()}
+        return Counter({k: v for k, v in counts.items() if v})
@@ -0,0 +1,46 @@
+class TokenIndex:
+    """
+    倒排索引：token -> 含该 token 的 ID 集合。
+    多个 token 的查询从最短的倒排表开始求交集，代价与结果规模相当，与总条目数无关。
+    """
+
+    def __init__(self):
+        self._postings = {}
+
+    def add(self, item_id, tokens):
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+            posting.add(item_id)
+
+    def remove(self, item_id, tokens):
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.discard(item_id)
+                if not posting:
+                    del self._postings[token]
+
+    def posting(self, token):
+        """含某个 token 的 ID 集合（只读，不要修改）"""
+        return self._postings.get(token, frozenset())
+
+    def lookup(self, tokens):
+        """同时含有全部 tokens 的 ID 集合；tokens 为空时返回空集"""
+        postings = sorted((self.posting(token) for token in set(tokens)), key=len)
+        if not postings:
+            return set()
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return result
+
+    def __contains__(self, token):
+        return token in self._postings
+
+    def __len__(self):
+        """不同 token 的数量"""
+        return len(self._postings)
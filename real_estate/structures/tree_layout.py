@@ -0,0 +1,74 @@
+"""
+AVL 树的按需布局，用于可视化大树。
+
+横坐标取节点的中序名次（x = (rank + 0.5) * unit），纵坐标取深度，
+名次可以在下降时由子树大小直接算出，因此无需预先遍历整棵树。
+layout_window 只产出与可见窗口相交的部分：
+- 子树的横向范围与窗口不相交，或深度超出窗口时整棵跳过；
+- 子树的像素宽度小于 collapse_width 时不再展开，折叠为一个摘要（放大后宽度变大即自动展开）。
+每次绘制的代价只与可见节点数和树高有关。
+"""
+from typing import NamedTuple, Optional
+
+NODE = "node"
+SUMMARY = "summary"
+
+
+class TreeCell(NamedTuple):
+    kind: str  # NODE 或 SUMMARY
+    node: object  # 节点本身；摘要时为被折叠子树的根（size / total 即子树统计）
+    depth: int
+    x: float  # 节点中心；摘要时为子树根所在位置
+    x_start: float  # 子树覆盖的横向范围 [x_start, x_end)
+    x_end: float
+    left_x: Optional[float]  # 左右孩子（或其摘要）的位置，用于画连线；没有孩子时为 None
+    right_x: Optional[float]
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+def layout_window(root, unit, x_lo=float('-inf'), x_hi=float('inf'), depth_lo=0, depth_hi=None,
+                  collapse_width=0.0):
+    """
+    按名次布局 root 子树中落在窗口内的部分，按先序产出 TreeCell。
+    unit: 每个名次的像素宽度；[x_lo, x_hi] 与 [depth_lo, depth_hi]: 可见窗口。
+    """
+    if root is None:
+        return
+    stack = [(root, 0, 0)]  # (子树根, 子树第一个名次, 深度)
+    while stack:
+        node, first, depth = stack.pop()
+        x_start = first * unit
+        x_end = (first + node.size) * unit
+        if x_end < x_lo or x_start > x_hi or (depth_hi is not None and depth > depth_hi):
+            continue
+        rank = first + _size(node.left)
+        x = (rank + 0.5) * unit
+        if node.size > 1 and x_end - x_start < collapse_width:
+            if depth >= depth_lo:
+                yield TreeCell(SUMMARY, node, depth, x, x_start, x_end, None, None)
+            continue
+        left_x = right_x = None
+        if node.left:
+            left_x = (first + _size(node.left.left) + 0.5) * unit
+        if node.right:
+            right_x = (rank + 1 + _size(node.right.left) + 0.5) * unit
+        if depth >= depth_lo:
+            yield TreeCell(NODE, node, depth, x, x_start, x_end, left_x, right_x)
+        # 先压右子树，保证先序从左到右产出
+        if node.right:
+            stack.append((node.right, rank + 1, depth + 1))
+        if node.left:
+            stack.append((node.left, first, depth + 1))
+
+
+def subtree_bounds(node):
+    """子树中最便宜与最贵的节点，O(树高)"""
+    low = high = node
+    while low.left:
+        low = low.left
+    while high.right:
+        high = high.right
+    return low, high
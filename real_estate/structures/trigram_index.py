@@ -0,0 +1,143 @@
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+import heapq
+
+
+def normalize_text(text):
+    """统一大小写并压缩空白，索引与查询使用同一规则"""
+    return " ".join(text.casefold().split()) if text else ""
+
+
+def trigrams(text):
+    """规范化文本首尾各补一个空格后的三元组集合（补位使词首词尾也能参与模糊匹配）"""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    文本三元组倒排索引：trigram -> 含该三元组的 ID 升序数组（array('q')，比 set 省内存）。
+    倒排表保持有序，增删都是二分定位加一次内存移动，常见三元组（如 " st"）几乎含全部 ID 时也不必逐个比较；
+    按 ID 升序添加时只需追加。
+    子串查询取查询串中倒排表最短的三元组作为候选，再逐个核对是否包含查询串，代价与该倒排表长度相当；
+    不足三个字符的查询退化为扫描。模糊查询按查询三元组在文本中出现的比例打分，容忍拼写错误。
+    增删即时更新倒排表；每次修改 version 加一，供 IncrementalSearch 判断缓存的结果是否仍然有效。
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._texts = {}  # ID -> 规范化文本
+        self.version = 0
+
+    def add(self, item_id, text):
+        if item_id in self._texts:
+            self.remove(item_id)
+        text = normalize_text(text)
+        self._texts[item_id] = text
+        postings = self._postings
+        for gram in trigrams(text):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = array("q", (item_id,))
+            elif posting[-1] < item_id:
+                posting.append(item_id)
+            else:
+                insort(posting, item_id)
+        self.version += 1
+
+    def remove(self, item_id):
+        text = self._texts.pop(item_id, None)
+        if text is None:
+            return False
+        for gram in trigrams(text):
+            posting = self._postings[gram]
+            del posting[bisect_left(posting, item_id)]
+            if not posting:
+                del self._postings[gram]
+        self.version += 1
+        return True
+
+    def text(self, item_id):
+        return self._texts.get(item_id)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def search(self, query, candidates=None):
+        """规范化文本包含 query 的 ID 集合；空查询返回全部。candidates 给定时只在其中查找"""
+        query = normalize_text(query)
+        texts = self._texts
+        if candidates is None:
+            if not query:
+                return set(texts)
+            if len(query) < 3:
+                return {item_id for item_id, text in texts.items() if query in text}
+            grams = {query[i:i + 3] for i in range(len(query) - 2)}
+            rarest = min(grams, key=lambda gram: len(self._postings.get(gram, ())))
+            candidates = self._postings.get(rarest, ())
+        result = set()
+        for item_id in candidates:
+            text = texts.get(item_id)
+            if text is not None and query in text:
+                result.add(item_id)
+        return result
+
+    # 模糊查询只从倒排表不超过该长度的三元组收集候选，" st" 这类几乎每个地址都有的三元组不参与扫描
+    FUZZY_MAX_POSTING = 5000
+
+    def fuzzy(self, query, limit=10, min_score=0.3):
+        """
+        按相似度返回至多 limit 个 (score, ID)：score 为查询三元组在文本中出现的比例（0-1），
+        不低于 min_score 才返回；同分时文本越短越靠前。
+        候选只来自倒排表不超过 FUZZY_MAX_POSTING 的三元组（全部过长时只用最短的一个，此时扫描量是它的倒排表长度），
+        扫描量因此与索引规模无关；常见三元组只在候选上用子串判断补计分数。
+        限制：只和查询共享常见三元组的文本不会成为候选。
+        """
+        grams = trigrams(normalize_text(query))
+        # 索引中不存在的三元组不产生候选，也不可能命中
+        postings = sorted(((gram, self._postings[gram]) for gram in grams if gram in self._postings),
+                          key=lambda item: len(item[1]))
+        rare = [item for item in postings if len(item[1]) <= self.FUZZY_MAX_POSTING] or postings[:1]
+        common = [gram for gram, _ in postings[len(rare):]]
+        counts = Counter()
+        for _, posting in rare:
+            counts.update(posting)  # Counter 对可迭代对象的计数在 C 层完成
+        needed = min_score * len(grams)
+        texts = self._texts
+        scored = []
+        for item_id, shared in counts.items():
+            if common:
+                padded = f" {texts[item_id]} "
+                shared += sum(1 for gram in common if gram in padded)
+            if shared >= needed:
+                scored.append((shared / len(grams), -len(texts[item_id]), -item_id))
+        return [(score, -neg_id) for score, _, neg_id in heapq.nlargest(limit, scored)]
+
+
+class IncrementalSearch:
+    """
+    逐字输入时的子串搜索：新查询包含上一次的查询时（在末尾继续输入），
+    结果必然是上一次结果的子集，直接在上一次结果中核对，不再访问倒排表。
+    索引有增删（version 变化）或查询被改短时重新查询。
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self._query = None
+        self._result = None
+        self._version = None
+
+    def search(self, query):
+        query = normalize_text(query)
+        reusable = (self._result is not None and self._version == self.index.version
+                    and self._query and self._query in query)
+        if reusable:
+            result = self._result if query == self._query else self.index.search(query, self._result)
+        else:
+            result = self.index.search(query)
+        self._query, self._result, self._version = query, result, self.index.version
+        return result
+
+    def reset(self):
+        self._query = self._result = self._version = None
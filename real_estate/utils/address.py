@@ -0,0 +1,43 @@
+"""
+地址规范化：大小写、标点与常见缩写统一后切分为 token（门牌号、街道名、街道类型、方位、单元号、邮编等）。
+房产入库时计算一次 token 并写入倒排索引，之后的区域筛选与偏好打分都是集合查询，不再逐行做子串扫描。
+查询词命中地址的条件是：查询词的所有 token 都出现在地址的 token 中，
+例如 "Main Street" 命中 "123 Main St."，"Main" 命中 "123 Main St"，但不再命中 "Mainland Ave"。
+"""
+from functools import lru_cache
+import re
+
+_WORD = re.compile(r"\w+")
+
+# 街道类型、方位与单元标记统一为 USPS 常用缩写
+_CANONICAL = {
+    "street": "st", "str": "st", "avenue": "ave", "av": "ave", "road": "rd", "drive": "dr",
+    "boulevard": "blvd", "lane": "ln", "court": "ct", "place": "pl", "terrace": "ter",
+    "highway": "hwy", "parkway": "pkwy", "square": "sq", "circle": "cir",
+    "north": "n", "south": "s", "east": "e", "west": "w",
+    "northeast": "ne", "northwest": "nw", "southeast": "se", "southwest": "sw",
+    "apartment": "apt", "suite": "ste",
+}
+
+
+def address_tokens(address):
+    """按出现顺序返回规范化后的 token 元组"""
+    if not address:
+        return ()
+    return tuple(_CANONICAL.get(word, word) for word in _WORD.findall(address.casefold()))
+
+
+def normalize_address(address):
+    """规范化的地址文本，写法不同的同一地址得到相同结果"""
+    return " ".join(address_tokens(address))
+
+
+@lru_cache(maxsize=65536)
+def token_set(address):
+    """地址的 token 集合（带缓存，真实数据中同一街道的地址大量重复）"""
+    return frozenset(address_tokens(address))
+
+
+def location_matches(query_tokens, address):
+    """query_tokens（token 集合）是否全部出现在地址中；空查询不命中任何地址"""
+    return bool(query_tokens) and query_tokens <= token_set(address)
@@ -0,0 +1,17 @@
+"""
+市场分析的派生指标：按类型汇总（由 MarketStats.by_type 增量维护）换算出的分布、均价与成交率。
+"""
+
+
+# 以下 summary 均为 MarketStats.by_type() 的结果 {类型名: [数量, 价格和, 成交数]}
+def type_distribution(summary):
+    return {t: entry[0] for t, entry in summary.items()}
+
+
+def average_price_by_type(summary):
+    return {t: entry[1] / entry[0] for t, entry in summary.items() if entry[0]}
+
+
+def transaction_rate_by_type(summary):
+    """各类型成交率（百分比）"""
+    return {t: entry[2] / entry[0] * 100 for t, entry in summary.items() if entry[0]}
@@ -0,0 +1,270 @@
+"""
+房产与客户变更的追加式日志（write-ahead journal）。
+
+每条记录一行："<crc32 十六进制> <json>\\n"，json 为 {"seq": 序号, "event": 事件名, "data": {...}}。
+Journal 订阅两个管理器的变更事件，记录先进入内存缓冲，攒满 batch_size 条、
+后台线程每隔 flush_interval 秒或显式 flush() 时一次写入并 fsync（组提交），不必每次点击都落盘整个数据集。
+compact() 把当前状态写成快照（头部记录已包含的序号）后清空日志；
+recover() 读取快照并只回放序号更大的日志尾部，遇到崩溃写了一半的行即停止。
+"""
+import json
+import logging
+import os
+import threading
+import zlib
+
+from ..models import Client, Property, PropertyType, PropertyStatus
+from ..managers.client_manager import ClientManager
+from ..managers.property_manager import PropertyManager
+from .snapshot import load_snapshot, save_snapshot, snapshot_sequence
+
+logger = logging.getLogger(__name__)
+
+
+def _property_record(p):
+    return {"property_ID": p.property_ID, "address": p.address, "price": p.price,
+            "property_type": p.property_type.name, "status": p.status.name, "owner": p.owner,
+            "features": list(p.features)}
+
+
+def _property_from_record(r):
+    return Property(r["property_ID"], r["address"], r["price"], PropertyType[r["property_type"]],
+                    PropertyStatus[r["status"]], owner=r["owner"], features=r["features"])
+
+
+def _client_record(c):
+    return {"client_ID": c.client_ID, "name": c.name, "contact_info": c.contact_info, "budget": c.budget,
+            "property_type": c.property_type.name if c.property_type else None,
+            "preferred_neighborhoods": list(c.preferred_neighborhoods),
+            "preferred_features": list(c.preferred_features)}
+
+
+def _client_from_record(r):
+    return Client(r["client_ID"], r["name"], r["contact_info"], r["budget"],
+                  PropertyType[r["property_type"]] if r["property_type"] else None,
+                  preferred_neighborhoods=r["preferred_neighborhoods"], preferred_features=r["preferred_features"])
+
+
+# 事件 -> 可 JSON 序列化的记录内容
+_ENCODERS = {
+    "property_added": lambda e: {"property": _property_record(e["property"])},
+    "properties_added": lambda e: {"properties": [_property_record(p) for p in e["properties"]]},
+    "property_removed": lambda e: {"property_ID": e["property"].property_ID},
+    "property_updated": lambda e: {"property_ID": e["property"].property_ID,
+                                   "status": e["property"].status.name, "owner": e["property"].owner},
+    "prices_adjusted": lambda e: {"prices": [[p.property_ID, p.price] for p in e["properties"]]},
+    "interest_reset": lambda e: {"property_IDs": [p.property_ID for p in e["properties"]]},
+    "client_added": lambda e: {"client": _client_record(e["client"])},
+    "client_removed": lambda e: {"client_ID": e["client"].client_ID},
+    "client_dequeued": lambda e: {"client_ID": e["client"].client_ID},
+    "client_deferred": lambda e: {"client_ID": e["client"].client_ID},
+    "client_updated": lambda e: {"client_ID": e["client"].client_ID, "budget": e["client"].budget},
+}
+
+
+def _set_status(client_manager, property_manager, data):
+    # 经管理器修改状态，聚合统计随之更新
+    status = PropertyStatus[data["status"]]
+    if status == PropertyStatus.SOLD:
+        property_manager.mark_sold(data["property_ID"], data["owner"])
+        return
+    prop = property_manager.find_property_by_id(data["property_ID"])
+    if prop:
+        prop.owner = data["owner"]
+        property_manager.update_status(prop.property_ID, status)
+
+
+def _set_prices(client_manager, property_manager, data):
+    # 价格是树的 key 的一部分，由 set_prices 一并重新排布
+    property_manager.set_prices(data["prices"])
+
+
+def _defer(client_manager, property_manager, data):
+    client = client_manager.find_client_by_id(data["client_ID"])
+    if client:
+        client_manager.defer_client(client)
+
+
+def _set_budget(client_manager, property_manager, data):
+    client = client_manager.find_client_by_id(data["client_ID"])
+    if client:
+        client.budget = data["budget"]
+
+
+_APPLIERS = {
+    "property_added": lambda cm, pm, d: pm.add_property(_property_from_record(d["property"])),
+    "properties_added": lambda cm, pm, d: pm.add_properties(_property_from_record(r) for r in d["properties"]),
+    "property_removed": lambda cm, pm, d: pm.remove_property(d["property_ID"]),
+    "property_updated": _set_status,
+    "prices_adjusted": _set_prices,
+    "interest_reset": lambda cm, pm, d: pm.reset_interest(d["property_IDs"]),
+    "client_added": lambda cm, pm, d: cm.add_client(_client_from_record(d["client"])),
+    "client_removed": lambda cm, pm, d: cm.remove_client(d["client_ID"]),
+    "client_dequeued": lambda cm, pm, d: cm.remove_client(d["client_ID"]),
+    "client_deferred": _defer,
+    "client_updated": _set_budget,
+}
+
+
+def apply_record(client_manager, property_manager, event, data):
+    """把一条日志记录重新作用到管理器上"""
+    _APPLIERS[event](client_manager, property_manager, data)
+
+
+def _encode(seq, event, data):
+    body = json.dumps({"seq": seq, "event": event, "data": data}, ensure_ascii=False, separators=(",", ":"))
+    return f"{zlib.crc32(body.encode('utf-8')):08x} {body}\n".encode("utf-8")
+
+
+def read_journal(path):
+    """
+    读取日志中的有效记录，返回 ([(seq, event, data)], 有效字节数)。
+    校验失败或不完整的行视为崩溃时未写完的尾部，其后内容全部忽略。
+    """
+    records = []
+    valid = 0
+    if not os.path.exists(path):
+        return records, valid
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            crc, _, body = line.rstrip(b"\n").partition(b" ")
+            try:
+                if int(crc, 16) != zlib.crc32(body):
+                    break
+                record = json.loads(body)
+            except ValueError:
+                break
+            records.append((record["seq"], record["event"], record["data"]))
+            valid += len(line)
+    return records, valid
+
+
+def recover(snapshot_path, journal_path, fallback=None):
+    """
+    崩溃恢复：读取快照（不存在时调用 fallback() 构建初始管理器，如从 CSV 加载），
+    再回放日志中序号大于快照序号的记录，返回 (client_manager, property_manager, 最后序号)。
+    """
+    if os.path.exists(snapshot_path):
+        client_manager, property_manager = load_snapshot(snapshot_path)
+        sequence = snapshot_sequence(snapshot_path)
+    else:
+        client_manager, property_manager = fallback() if fallback else (ClientManager(), PropertyManager())
+        sequence = 0
+    records, _ = read_journal(journal_path)
+    replayed = 0
+    for seq, event, data in records:
+        if seq > sequence:
+            apply_record(client_manager, property_manager, event, data)
+            sequence = seq
+            replayed += 1
+    logger.info("Recovered state at sequence %d (%d journal records replayed)", sequence, replayed)
+    return client_manager, property_manager, sequence
+
+
+class Journal:
+    def __init__(self, path, start_sequence=0, batch_size=256, flush_interval=0.2, fsync=True,
+                 compact_threshold=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.compact_threshold = compact_threshold
+        self._fsync = fsync
+        self._lock = threading.Lock()  # 保护缓冲区与序号
+        self._write_lock = threading.Lock()  # 同一时刻只有一个线程写文件
+        self._buffer = []
+        self.syncs = 0  # fsync 次数
+
+        # 截掉崩溃时写了一半的尾部，序号从已有记录之后继续
+        records, valid = read_journal(path)
+        if os.path.exists(path) and os.path.getsize(path) > valid:
+            logger.warning("Truncating torn journal tail at byte %d of %s", valid, path)
+            with open(path, "r+b") as f:
+                f.truncate(valid)
+        self.sequence = max([start_sequence] + [seq for seq, _, _ in records])
+        self._since_compaction = len(records)
+        self._file = open(path, "ab")
+
+        self._stop = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_loop, args=(flush_interval,), daemon=True)
+            self._flusher.start()
+
+    def attach(self, client_manager, property_manager):
+        """订阅两个管理器的变更事件"""
+        client_manager.add_listener(self.record)
+        property_manager.add_listener(self.record)
+
+    def detach(self, client_manager, property_manager):
+        client_manager.remove_listener(self.record)
+        property_manager.remove_listener(self.record)
+
+    def record(self, event, payload):
+        """管理器事件回调：编码后放入缓冲区，攒满一批时立即落盘"""
+        encoder = _ENCODERS.get(event)
+        if encoder is None:
+            return
+        data = encoder(payload)
+        with self._lock:
+            self.sequence += 1
+            self._buffer.append(_encode(self.sequence, event, data))
+            self._since_compaction += 1
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """把缓冲区中的记录一次写入并 fsync，之前产生的所有变更都已持久化"""
+        with self._write_lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+        if not pending:
+            return
+        self._file.write(b"".join(pending))
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+            self.syncs += 1
+
+    def _flush_loop(self, interval):
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def compact(self, snapshot_path, client_manager, property_manager):
+        """
+        写入带当前序号的快照后清空日志；快照是原子替换的，中途崩溃时回放会跳过已包含的记录。
+        快照（含目录项）fsync 之后才截断日志，掉电时不会出现快照未落盘而日志已清空的情况。
+        """
+        with self._write_lock:
+            self._flush_locked()
+            save_snapshot(snapshot_path, client_manager, property_manager, sequence=self.sequence,
+                          fsync=self._fsync)
+            self._file.truncate(0)
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+            self._since_compaction = 0
+
+    def maybe_compact(self, snapshot_path, client_manager, property_manager):
+        """自上次压缩以来的记录数达到 compact_threshold 时压缩，返回是否压缩"""
+        if self._since_compaction < self.compact_threshold:
+            return False
+        self.compact(snapshot_path, client_manager, property_manager)
+        return True
+
+    def close(self):
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,61 +1,255 @@
 from ..models import Client, Property, PropertyType, PropertyStatus
-from ..structures.client_queue import ClientQueue
 from ..managers.client_manager import ClientManager
 from ..managers.property_manager import PropertyManager
 import csv
+import glob
+import itertools
+import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from typing import Tuple
 
-def load_dataset(data_dir: str, client_filename: str, property_filename: str) -> Tuple[ClientManager, PropertyManager]:
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+CLIENT_COLUMNS = ("client_ID", "name", "contact_info", "property_type", "budget")
+PROPERTY_COLUMNS = ("property_ID", "address", "price", "property_type", "status")
+
+
+class LoadReport:
+    """一次加载的结果：成功加载的数量，以及被拒绝的行 (文件, 行号, 原始行, 错误信息)"""
+
+    def __init__(self):
+        self.clients_loaded = 0
+        self.properties_loaded = 0
+        self.rejected = []
+
+    def reject(self, filename, line_number, row, error):
+        self.rejected.append((filename, line_number, row, str(error)))
+
+    def __repr__(self):
+        return (f"<LoadReport clients={self.clients_loaded} properties={self.properties_loaded} "
+                f"rejected={len(self.rejected)}>")
+
+
+def client_fields(row):
+    """校验并转换一行客户数据为紧凑元组 (client_ID, name, contact_info, budget, property_type 名称)"""
+    property_type = row["property_type"]
+    property_type = PropertyType[property_type].name if property_type and property_type != "None" else None
+    return int(row["client_ID"]), row["name"], row["contact_info"], float(row["budget"].strip()), property_type
+
+
+def property_fields(row):
+    """校验并转换一行房产数据为紧凑元组 (property_ID, address, price, type 名称, status 名称, owner)"""
+    owner = (row.get("owner") or "").strip() or None
+    return (int(row["property_ID"]), row["address"], float(row["price"]),
+            PropertyType[row["property_type"]].name, PropertyStatus[row["status"]].name, owner)
+
+
+def client_from_fields(fields) -> Client:
+    client_ID, name, contact_info, budget, property_type = fields
+    return Client(client_ID=client_ID, name=name, contact_info=contact_info, budget=budget,
+                  property_type=PropertyType[property_type] if property_type else None)
+
+
+def property_from_fields(fields) -> Property:
+    property_ID, address, price, property_type, status, owner = fields
+    return Property(property_ID=property_ID, address=address, price=price,
+                    property_type=PropertyType[property_type], status=PropertyStatus[status], owner=owner)
+
+
+def parse_client(row) -> Client:
+    return client_from_fields(client_fields(row))
+
+
+def parse_property(row) -> Property:
+    return property_from_fields(property_fields(row))
+
+
+def _check_file(path):
+    logger.info("Checking dataset file: %s", path)
+    if not os.path.exists(path):
+        logger.error("Dataset file not found: %s", path)
+        raise FileNotFoundError(f"Dataset file not found: {path}")
+
+
+def iter_batches(path, parse_row, required_columns, label, chunk_size=DEFAULT_CHUNK_SIZE,
+                 report=None, strict=False, verbose=False, progress=None):
+    """
+    逐块流式读取 CSV，每次产出最多 chunk_size 个解析好的对象。
+    表头缺列直接抛 ValueError；单行解析失败时 strict=True 抛 ValueError，
+    否则记入 report 并跳过该行继续加载。
+    progress(已读字节数, 文件字节数) 在每块产出前回调，可在回调中抛异常以取消加载。
+    """
+    total_bytes = os.path.getsize(path)
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        missing = [c for c in required_columns if c not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"Error parsing {label} file: missing columns {missing}")
+        batch = []
+        for row in reader:
+            try:
+                obj = parse_row(row)
+            except (KeyError, ValueError, TypeError, AttributeError) as e:
+                if strict:
+                    raise ValueError(f"Error parsing {label} file at line {reader.line_num}: {e!r}")
+                # 逐行细节只记 DEBUG，汇总警告由调用方按 report 输出一次
+                logger.debug("Rejected %s row at %s:%d: %r", label, path, reader.line_num, e)
+                if report is not None:
+                    report.reject(path, reader.line_num, row, repr(e))
+                continue
+            if verbose:
+                logger.info("Parsed %s row %d: %r", label, reader.line_num, obj)
+            batch.append(obj)
+            if len(batch) >= chunk_size:
+                if progress is not None:
+                    # 文本层按块预读，底层字节位置是近似的已读进度
+                    progress(min(csvfile.buffer.tell(), total_bytes), total_bytes)
+                yield batch
+                batch = []
+        if progress is not None:
+            progress(total_bytes, total_bytes)
+        if batch:
+            yield batch
+
+
+def _unique(objects, id_of, path, kind, report, seen):
+    """丢弃 ID 已在 seen 中的对象（同一文件保留先出现的行），与分片加载一样记入 report"""
+    for obj in objects:
+        object_id = id_of(obj)
+        if object_id in seen:
+            report.reject(path, None, obj, f"duplicate {kind} ID {object_id}")
+            continue
+        seen.add(object_id)
+        yield obj
+
+
+def load_dataset(data_dir: str, client_filename: str, property_filename: str, verbose: bool = False,
+                 strict: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 report: LoadReport = None, progress=None) -> Tuple[ClientManager, PropertyManager]:
+    """
+    流式加载客户与房产 CSV：不逐行打印，坏行与重复 ID 的行收集到 report（strict=True 时遇到坏行即失败），
+    客户分块入队，房产全部解析后一次性批量建树。
+    progress(已读字节数, 两个文件总字节数) 按块回调，用于显示进度或取消。
+    """
     client_manager = ClientManager()
     property_manager = PropertyManager()
+    report = report if report is not None else LoadReport()
+    rejected_before = len(report.rejected)
 
-    # 加载客户端数据
     clients_file = os.path.join(data_dir, client_filename)
-    print(f"Checking clients file: {clients_file}")
-    if not os.path.exists(clients_file):
-        print(f"Clients file not found: {clients_file}")
-        raise FileNotFoundError(f"Dataset file not found: {clients_file}")
-    try:
-        with open(clients_file, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                print(f"Processing client: client_ID={row['client_ID']}, name={row['name']}, contact_info={row['contact_info']}, property_type={row['property_type']}, budget={row['budget'].strip()}")
-                client = Client(
-                    client_ID=int(row["client_ID"]),
-                    name=row["name"],
-                    contact_info=row["contact_info"],
-                    budget=float(row["budget"].strip()),
-                    property_type=PropertyType[row["property_type"]] if row["property_type"] and row["property_type"] != "None" else None
-                )
-                client_manager.add_client(client)
-                print(f"Added client with ID: {client.client_ID}")
-    except (KeyError, ValueError) as e:
-        raise ValueError(f"Error parsing clients file: {e}")
-
-    # 加载房产数据
     properties_file = os.path.join(data_dir, property_filename)
-    print(f"Checking properties file: {properties_file}")
-    if not os.path.exists(properties_file):
-        print(f"Properties file not found: {properties_file}")
-        raise FileNotFoundError(f"Dataset file not found: {properties_file}")
-    try:
-        with open(properties_file, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                print(f"Processing property: property_ID={row['property_ID']}, address={row['address']}, price={row['price']}, property_type={row['property_type']}, status={row['status']}, owner={row.get('owner', '')}")
-                owner = None if not row.get('owner', '').strip() else row['owner']
-                property_obj = Property(
-                    property_ID=int(row["property_ID"]),
-                    address=row["address"],
-                    price=float(row["price"]),
-                    property_type=PropertyType[row["property_type"]],
-                    status=PropertyStatus[row["status"]],
-                    owner=owner
-                )
-                property_manager.add_property(property_obj)
-                print(f"Added property with ID: {property_obj.property_ID}")
-    except (KeyError, ValueError) as e:
-        raise ValueError(f"Error parsing properties file: {e}")
-
-    return client_manager, property_manager
\ No newline at end of file
+    _check_file(clients_file)
+    _check_file(properties_file)
+    client_bytes = os.path.getsize(clients_file)
+    total_bytes = client_bytes + os.path.getsize(properties_file)
+    client_progress = property_progress = None
+    if progress is not None:
+        client_progress = lambda done, _: progress(done, total_bytes)
+        property_progress = lambda done, _: progress(client_bytes + done, total_bytes)
+
+    # 加载客户端数据；重复 ID 的行记入 report，保留先出现的
+    batches = iter_batches(clients_file, parse_client, CLIENT_COLUMNS, "clients",
+                           chunk_size, report, strict, verbose, client_progress)
+    seen = set()
+    for batch in batches:
+        report.clients_loaded += client_manager.add_clients(
+            _unique(batch, attrgetter("client_ID"), clients_file, "clients", report, seen))
+
+    # 加载房产数据：生成器串联各块，add_properties 内部只排序建树一次
+    batches = iter_batches(properties_file, parse_property, PROPERTY_COLUMNS, "properties",
+                           chunk_size, report, strict, verbose, property_progress)
+    report.properties_loaded = property_manager.add_properties(
+        _unique(itertools.chain.from_iterable(batches), attrgetter("property_ID"), properties_file, "properties",
+                report, set()))
+
+    logger.info("Loaded %d clients and %d properties, rejected %d rows",
+                report.clients_loaded, report.properties_loaded, len(report.rejected))
+    _warn_rejected(report, rejected_before, data_dir)
+    return client_manager, property_manager
+
+
+def _warn_rejected(report, rejected_before, source):
+    """整次加载只输出一条汇总警告，逐行原因见 LoadReport.rejected"""
+    rejected = len(report.rejected) - rejected_before
+    if rejected:
+        logger.warning("Rejected %d rows while loading %s; see LoadReport.rejected for details", rejected, source)
+
+
+_SHARD_KINDS = {
+    "clients": (client_fields, CLIENT_COLUMNS),
+    "properties": (property_fields, PROPERTY_COLUMNS),
+}
+
+
+def _parse_shard(task):
+    """进程池任务：把一个分片解析为紧凑元组批次（便于跨进程传输），坏行单独返回"""
+    path, kind, strict = task
+    parse_row, columns = _SHARD_KINDS[kind]
+    report = LoadReport()
+    rows = []
+    for batch in iter_batches(path, parse_row, columns, kind, report=report, strict=strict):
+        rows.extend(batch)
+    return rows, report.rejected
+
+
+def resolve_shards(source):
+    """目录则取其中所有 *.csv，否则按 glob 模式匹配；按路径排序保证合并顺序确定"""
+    pattern = os.path.join(source, "*.csv") if os.path.isdir(source) else source
+    shards = sorted(glob.glob(pattern))
+    if not shards:
+        raise FileNotFoundError(f"No dataset shards found: {source}")
+    return shards
+
+
+def load_sharded_dataset(client_source: str, property_source: str, max_workers: int = None,
+                         strict: bool = False, report: LoadReport = None,
+                         progress=None) -> Tuple[ClientManager, PropertyManager]:
+    """
+    并行加载多个区域分片：client_source / property_source 为目录或 glob 模式。
+    各分片在进程池中解析为元组批次，再按分片路径顺序合并进同一对 Manager。
+    ID 冲突时保留路径排序靠前的分片（同一分片内保留先出现的行），其余记入 report。
+    progress(已解析分片数, 分片总数) 每解析完一个分片回调一次。
+    """
+    report = report if report is not None else LoadReport()
+    rejected_before = len(report.rejected)
+    tasks = [(path, "clients", strict) for path in resolve_shards(client_source)]
+    tasks += [(path, "properties", strict) for path in resolve_shards(property_source)]
+
+    results = []
+    if max_workers == 1 or len(tasks) == 1:
+        parsed = map(_parse_shard, tasks)
+        for result in parsed:
+            results.append(result)
+            if progress is not None:
+                progress(len(results), len(tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for result in executor.map(_parse_shard, tasks):  # map 保持任务顺序
+                results.append(result)
+                if progress is not None:
+                    progress(len(results), len(tasks))
+
+    client_manager = ClientManager()
+    property_manager = PropertyManager()
+    seen = {"clients": set(), "properties": set()}
+    clients, properties = [], []
+    for (path, kind, _), (rows, rejected) in zip(tasks, results):
+        report.rejected.extend(rejected)
+        ids = seen[kind]
+        build, target = (client_from_fields, clients) if kind == "clients" else (property_from_fields, properties)
+        for fields in rows:
+            if fields[0] in ids:
+                report.reject(path, None, fields, f"duplicate {kind} ID {fields[0]}")
+                continue
+            ids.add(fields[0])
+            target.append(build(fields))
+
+    report.clients_loaded = client_manager.add_clients(clients)
+    report.properties_loaded = property_manager.add_properties(properties)
+    logger.info("Loaded %d clients and %d properties from %d shards, rejected %d rows",
+                report.clients_loaded, report.properties_loaded, len(tasks), len(report.rejected))
+    _warn_rejected(report, rejected_before, f"{client_source} and {property_source}")
+    return client_manager, property_manager
@@ -0,0 +1,233 @@
+"""
+管理器状态的二进制快照。
+
+文件布局（整数均为小端序）：
+    头部   magic "REST" | 版本 u16 | 保留 u16 | sequence u64 | 房产数 u32 | 客户数 u32 | 字符串数 u32 | 正文 CRC32 u32
+    正文   字符串表（偏移 u32 × (字符串数+1) + UTF-8 数据）
+           房产列：ID q | 价格 d | 类型 B | 状态 B | 地址 I | 业主 i | 浏览 q | 咨询 q | 特征数 I | 特征 I
+           客户列：ID q | 姓名 I | 联系方式 I | 预算 d | 类型 B | 区域数 I | 区域 I | 特征数 I | 特征 I
+字符串列保存的是字符串表下标，-1 表示 None；列表型字段拆成"每行个数 + 扁平下标"两列。
+房产按树的中序 (price, property_ID) 保存，恢复时无需重新排序即可 O(n) 建树；客户按队列顺序保存。
+"""
+from array import array
+import os
+import struct
+import sys
+import zlib
+
+from ..models import Client, Property, PropertyType, PropertyStatus
+from ..managers.client_manager import ClientManager
+from ..managers.property_manager import PropertyManager
+
+MAGIC = b"REST"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHQIIII")
+_TYPES = list(PropertyType)
+_STATUSES = list(PropertyStatus)
+_TYPE_CODES = {t: i for i, t in enumerate(_TYPES)}
+_STATUS_CODES = {s: i for i, s in enumerate(_STATUSES)}
+_NO_TYPE = 255
+
+
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+
+    def add(self, value):
+        if value is None:
+            return -1
+        return self.index.setdefault(value, len(self.index))
+
+    def encode(self):
+        data = [s.encode("utf-8") for s in self.index]
+        offsets = array("I", [0])
+        total = 0
+        for chunk in data:
+            total += len(chunk)
+            offsets.append(total)
+        return [offsets, b"".join(data)]
+
+
+def _to_bytes(column):
+    if isinstance(column, bytes):
+        return column
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+class _Reader:
+    """按顺序从正文中切出各列"""
+
+    def __init__(self, body):
+        self.body = memoryview(body)
+        self.pos = 0
+
+    def column(self, typecode, count):
+        column = array(typecode)
+        end = self.pos + column.itemsize * count
+        if end > len(self.body):
+            raise ValueError("Snapshot is truncated")
+        column.frombytes(self.body[self.pos:end])
+        if sys.byteorder == "big":
+            column.byteswap()
+        self.pos = end
+        return column
+
+    def raw(self, size):
+        end = self.pos + size
+        if end > len(self.body):
+            raise ValueError("Snapshot is truncated")
+        data = bytes(self.body[self.pos:end])
+        self.pos = end
+        return data
+
+
+def _list_columns(rows, strings):
+    counts = array("I")
+    flat = array("I")
+    for values in rows:
+        values = values or ()
+        counts.append(len(values))
+        flat.extend(strings.add(v) for v in values)
+    return [counts, flat]
+
+
+def _fsync_directory(path):
+    """目录项（如 os.replace 的结果）落盘；Windows 不支持打开目录，跳过"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def save_snapshot(path, client_manager, property_manager, sequence=0, fsync=True):
+    """
+    把两个管理器的完整状态写入 path（先写临时文件再原子替换），返回写入的房产数与客户数。
+    fsync=True 时临时文件与所在目录都落盘后才返回，调用方随后可以安全地清空日志。
+    """
+    strings = _StringTable()
+    property_manager.flush_views()  # 缓冲中的浏览次数一并保存
+    props = list(property_manager.tree.iter_range())
+    clients = list(client_manager.clients)
+
+    prop_columns = [
+        array("q", [p.property_ID for p in props]),
+        array("d", [p.price for p in props]),
+        bytes(_TYPE_CODES[p.property_type] for p in props),
+        bytes(_STATUS_CODES[p.status] for p in props),
+        array("I", [strings.add(p.address) for p in props]),
+        array("i", [strings.add(p.owner) for p in props]),
+        array("q", [p.views for p in props]),
+        array("q", [p.inquiries for p in props]),
+    ] + _list_columns((p.features for p in props), strings)
+
+    client_columns = [
+        array("q", [c.client_ID for c in clients]),
+        array("I", [strings.add(c.name) for c in clients]),
+        array("I", [strings.add(c.contact_info) for c in clients]),
+        array("d", [c.budget for c in clients]),
+        bytes(_TYPE_CODES.get(c.property_type, _NO_TYPE) for c in clients),
+    ] + _list_columns((c.preferred_neighborhoods for c in clients), strings) \
+      + _list_columns((c.preferred_features for c in clients), strings)
+
+    string_columns = strings.encode()
+    body = b"".join(_to_bytes(c) for c in string_columns + prop_columns + client_columns)
+    header = _HEADER.pack(MAGIC, VERSION, 0, sequence, len(props), len(clients),
+                          len(strings.index), zlib.crc32(body))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if fsync:
+        _fsync_directory(path)
+    return len(props), len(clients)
+
+
+def _read_header(data):
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a snapshot file: too short")
+    magic, version, _, sequence, n_props, n_clients, n_strings, crc = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a snapshot file: bad magic")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    return sequence, n_props, n_clients, n_strings, crc
+
+
+def snapshot_sequence(path):
+    """只读头部，返回保存时记录的 sequence"""
+    with open(path, "rb") as f:
+        return _read_header(f.read(_HEADER.size))[0]
+
+
+def _split_lists(counts, flat, strings):
+    rows = []
+    pos = 0
+    for count in counts:
+        rows.append([strings[i] for i in flat[pos:pos + count]] if count else [])
+        pos += count
+    return rows
+
+
+def load_snapshot(path):
+    """读取快照，返回 (ClientManager, PropertyManager)；文件损坏或版本不符时抛 ValueError"""
+    with open(path, "rb") as f:
+        data = f.read()
+    _, n_props, n_clients, n_strings, crc = _read_header(data)
+    body = data[_HEADER.size:]
+    if zlib.crc32(body) != crc:
+        raise ValueError("Snapshot checksum mismatch")
+    reader = _Reader(body)
+
+    offsets = reader.column("I", n_strings + 1)
+    blob = reader.raw(offsets[-1] if n_strings else 0)
+    strings = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n_strings)]
+
+    ids = reader.column("q", n_props)
+    prices = reader.column("d", n_props)
+    types = reader.raw(n_props)
+    statuses = reader.raw(n_props)
+    addresses = reader.column("I", n_props)
+    owners = reader.column("i", n_props)
+    views = reader.column("q", n_props)
+    inquiries = reader.column("q", n_props)
+    features = reader.column("I", n_props)
+    features = _split_lists(features, reader.column("I", sum(features)), strings)
+
+    properties = []
+    for i in range(n_props):
+        prop = Property(ids[i], strings[addresses[i]], prices[i], _TYPES[types[i]], _STATUSES[statuses[i]],
+                        owner=strings[owners[i]] if owners[i] >= 0 else None, features=features[i])
+        prop.views = views[i]
+        prop.inquiries = inquiries[i]
+        properties.append(prop)
+
+    client_ids = reader.column("q", n_clients)
+    names = reader.column("I", n_clients)
+    contacts = reader.column("I", n_clients)
+    budgets = reader.column("d", n_clients)
+    client_types = reader.raw(n_clients)
+    neighborhoods = reader.column("I", n_clients)
+    neighborhoods = _split_lists(neighborhoods, reader.column("I", sum(neighborhoods)), strings)
+    preferred = reader.column("I", n_clients)
+    preferred = _split_lists(preferred, reader.column("I", sum(preferred)), strings)
+
+    client_manager = ClientManager()
+    client_manager.add_clients(
+        Client(client_ids[i], strings[names[i]], strings[contacts[i]], budgets[i],
+               _TYPES[client_types[i]] if client_types[i] != _NO_TYPE else None,
+               preferred_neighborhoods=neighborhoods[i], preferred_features=preferred[i])
+        for i in range(n_clients))
+
+    # 房产已按树的 key 顺序保存，直接线性建树
+    return client_manager, PropertyManager.from_sorted(properties)
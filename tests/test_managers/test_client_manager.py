@@ -149,6 +149,22 @@ class TestClientManager(unittest.TestCase):
 
 
 
+    def test_match_properties_advanced_limit(self):
+        """测试limit=k的top-k结果与全量排序的前k个一致（同分保持输入顺序）"""
+        client = Client(11, "TopK", "topk@test.com", 600000, PropertyType.HOUSE, preferred_neighborhoods=["Pine"])
+        props = [self.property1, self.property2, self.property3, self.property4]
+        full = self.client_manager.match_properties_advanced(props, client)
+        for k in range(len(props) + 2):
+            self.assertEqual(self.client_manager.match_properties_advanced(props, client, limit=k), full[:k])
+
+    def test_iter_matches_advanced(self):
+        """测试迭代器版本按输入顺序惰性产出打分结果"""
+        client = Client(12, "Iter", "iter@test.com", 350000, PropertyType.APARTMENT)
+        it = self.client_manager.iter_matches_advanced(iter([self.property4, self.property2, self.property3]), client)
+        self.assertEqual(next(it), (60, self.property2))  # property4 超预算被跳过
+        self.assertEqual(next(it), (50, self.property3))  # 已售，不加可售分
+        self.assertEqual(list(it), [])
+
     def test_buy_property(self):
         """测试客户端购买房产"""
         # 正常购买
@@ -177,6 +193,8 @@ class TestClientManager(unittest.TestCase):
         self.assertLessEqual(property_obj.price, 400000)
         self.assertEqual(property_obj.status, PropertyStatus.SOLD)
         self.assertEqual(property_obj.owner, client.name)
+        # 自动选房是纯查询，不给候选房产增加浏览量
+        self.assertTrue(all(p.views == 0 for p in self.property_manager.iter_properties()))
 
     def test_buy_property_no_client(self):
         with self.assertRaises(ValueError):
@@ -189,6 +207,26 @@ class TestClientManager(unittest.TestCase):
 
 
 
+    def test_mutation_events(self):
+        """测试成交、出队、推迟等操作通过监听器通知"""
+        events = []
+        listener = lambda event, payload: events.append((event, payload))
+        self.client_manager.add_listener(listener)
+        self.property_manager.add_listener(listener)
+        self.client_manager.buy_property(self.client1, 1, self.property_manager)
+        self.assertEqual([e for e, _ in events], ["property_updated", "client_updated"])
+        self.assertIs(events[0][1]["property"], self.property1)
+
+        events.clear()
+        self.assertIs(self.client_manager.dequeue(), self.client1)
+        self.assertIs(self.client_manager.defer_client(), self.client2)
+        self.assertEqual([c.client_ID for c in self.client_manager.clients], [3, 2])
+        self.client_manager.add_client(self.client3)  # 重复客户不通知
+        self.client_manager.remove_client(99)
+        self.client_manager.remove_listener(listener)
+        self.client_manager.remove_client(3)
+        self.assertEqual([e for e, _ in events], ["client_dequeued", "client_deferred"])
+
     def test_peek(self):
         """测试peek方法"""
         first_client = self.client_manager.peek()
@@ -239,13 +277,13 @@ class TestClientManager(unittest.TestCase):
         removed = self.property_manager.remove_property(9999)
         self.assertFalse(removed)
 
-    # 新增：测试 PropertyManager 添加重复价格的房产，实际行为应为不插入，断言查找不到新ID
+    # 新增：测试 PropertyManager 添加重复价格的房产，两者都应保留
     def test_add_duplicate_price_property(self):
-        """测试添加价格相同但ID不同的房产（应不插入）"""
+        """测试添加价格相同但ID不同的房产（复合键，两者都保留）"""
         prop_dup = Property(99, "999 Dup St", 250000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE)
         self.property_manager.add_property(prop_dup)
-        found = self.property_manager.find_property_by_id(99)
-        self.assertIsNone(found)  # 实际行为：不插入
+        self.assertIs(self.property_manager.find_property_by_id(99), prop_dup)
+        self.assertIs(self.property_manager.find_property_by_id(1), self.property1)
 
     # 新增：测试更新不存在房产状态
     def test_update_status_nonexistent(self):
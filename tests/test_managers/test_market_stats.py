@@ -0,0 +1,100 @@
+import unittest
+import random
+from real_estate.managers import PropertyManager
+from real_estate.models import Property, PropertyType, PropertyStatus
+
+
+def summarize_by_type(properties):
+    """辅助函数，全量扫描统计各类型的 [数量, 价格和, 成交数]"""
+    summary = {}
+    for prop in properties:
+        entry = summary.setdefault(prop.property_type.name, [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += prop.price
+        if prop.status == PropertyStatus.SOLD:
+            entry[2] += 1
+    return summary
+
+
+def assert_stats_match(test, property_manager):
+    """辅助函数，聚合结果与全量扫描一致"""
+    expected = summarize_by_type(property_manager.iter_properties())
+    actual = property_manager.stats.by_type()
+    test.assertEqual(sorted(actual), sorted(expected))
+    for name, (count, total, sold) in expected.items():
+        test.assertEqual(actual[name][0], count)
+        test.assertAlmostEqual(actual[name][1], total, places=4)
+        test.assertEqual(actual[name][2], sold)
+
+
+class TestMarketStats(unittest.TestCase):
+    def setUp(self):
+        self.property_manager = PropertyManager()
+        self.property_manager.add_properties([
+            Property(1, "123 Main St", 250000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+            Property(2, "456 Elm St", 300000.0, PropertyType.APARTMENT, PropertyStatus.AVAILABLE),
+            Property(3, "789 Oak St", 150000.0, PropertyType.APARTMENT, PropertyStatus.SOLD, owner="John Doe"),
+        ])
+
+    def test_aggregates_follow_mutations(self):
+        """测试增删、改状态、成交与调价后聚合与全量扫描一致"""
+        pm = self.property_manager
+        stats = pm.stats
+        self.assertEqual(stats.by_type(), {"HOUSE": [1, 250000.0, 0], "APARTMENT": [2, 450000.0, 1]})
+        self.assertEqual(stats.count(status=PropertyStatus.SOLD), 1)
+        self.assertEqual(stats.price_sum(PropertyType.APARTMENT), 450000.0)
+
+        pm.add_property(Property(4, "1 Bay Rd", 90000.0, PropertyType.LAND, PropertyStatus.AVAILABLE))
+        pm.mark_sold(1, "Alice")
+        pm.remove_property(2)
+        self.assertEqual(stats.by_status(), {"AVAILABLE": 1, "SOLD": 2})
+        assert_stats_match(self, pm)
+
+        pm.find_property_by_id(4).views = 20
+        pm.adjust_prices()
+        assert_stats_match(self, pm)
+
+        rng = random.Random(7)
+        types = list(PropertyType)
+        for i in range(10, 300):
+            pm.add_property(Property(i, f"{i} Rd", float(rng.randrange(1000, 9000)), rng.choice(types),
+                                     PropertyStatus.AVAILABLE))
+        for i in rng.sample(range(10, 300), 100):
+            if rng.random() < 0.5:
+                pm.remove_property(i)
+            else:
+                pm.mark_sold(i, "Owner")
+        assert_stats_match(self, pm)
+
+    def test_from_sorted(self):
+        """测试整体构建时一并建立聚合"""
+        rebuilt = PropertyManager.from_sorted(self.property_manager.iter_properties())
+        self.assertEqual(rebuilt.stats.by_type(), self.property_manager.stats.by_type())
+
+    def test_top_viewed(self):
+        """测试浏览量排行随浏览与重置更新，失效条目被惰性丢弃"""
+        pm = self.property_manager
+        pm.record_views([2, 2, 2, 1])
+        pm.search_properties(price_range=(0, 260000))  # 1 与 3 各加一次浏览
+        self.assertEqual([(p.property_ID, p.views) for p in pm.top_viewed(2)], [(2, 3), (1, 2)])
+        self.assertEqual(pm.stats.top_viewed_ids(10), [(2, 3), (1, 2), (3, 1)])
+
+        pm.remove_property(2)
+        self.assertEqual([p.property_ID for p in pm.top_viewed(2)], [1, 3])
+        pm.adjust_prices(high_threshold=100, low_threshold=0)  # 重置浏览量
+        self.assertEqual(pm.stats.top_viewed_ids(10), [])
+        # 没有浏览记录时按价格补足
+        self.assertEqual([p.property_ID for p in pm.top_viewed(2)], [3, 1])
+
+    def test_view_heap_stays_bounded(self):
+        """测试反复浏览时堆会被重建，不随浏览次数无限增长"""
+        pm = self.property_manager
+        for _ in range(1000):
+            pm.record_views([1])
+            pm.flush_views()
+        self.assertLess(len(pm.stats._heap), 100)
+        self.assertEqual(pm.stats.top_viewed_ids(1), [(1, 1000)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import random
+from real_estate.managers import ClientManager, MatchingEngine
+from real_estate.models import Client, Property, PropertyType, PropertyStatus
+
+
+class TestMatchingEngine(unittest.TestCase):
+    def setUp(self):
+        self.properties = [
+            Property(1, "123 Main St", 250000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+            Property(2, "456 Elm St", 300000.0, PropertyType.APARTMENT, PropertyStatus.AVAILABLE),
+            Property(3, "789 Oak St", 150000.0, PropertyType.APARTMENT, PropertyStatus.SOLD, owner="John Doe"),
+            Property(4, "321 Pine St", 500000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+            Property(5, "9 Cedar St", 200000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+        ]
+        self.engine = MatchingEngine(self.properties)
+
+    def test_match_by_type_and_budget(self):
+        """测试按类型桶二分查找预算内的可售房产"""
+        client = Client(1, "Alice", "a@x.com", 350000.0, PropertyType.HOUSE)
+        self.assertEqual(self.engine.match(client), [self.properties[4], self.properties[0]])
+        # 预算恰好等于价格也算匹配
+        client.budget = 500000.0
+        self.assertEqual([p.property_ID for p in self.engine.match(client)], [5, 1, 4])
+        # 已售房产不参与匹配，无类型偏好的客户没有匹配
+        self.assertEqual(self.engine.match(Client(2, "Bob", "b@x.com", 200000.0, PropertyType.APARTMENT)), [])
+        self.assertEqual(self.engine.match(Client(3, "Cy", "c@x.com", 900000.0)), [])
+
+    def test_remove(self):
+        """测试售出后从桶中移除"""
+        self.assertTrue(self.engine.remove(self.properties[0]))
+        self.assertFalse(self.engine.remove(self.properties[0]))
+        client = Client(1, "Alice", "a@x.com", 350000.0, PropertyType.HOUSE)
+        self.assertEqual(self.engine.match(client), [self.properties[4]])
+
+    def test_same_result_as_linear_scan(self):
+        """测试与逐个过滤的线性匹配结果一致"""
+        rng = random.Random(3)
+        types = list(PropertyType)
+        props = [
+            Property(i, f"{i} St", float(rng.randrange(50, 150)) * 1000, rng.choice(types),
+                     rng.choice([PropertyStatus.AVAILABLE, PropertyStatus.SOLD]))
+            for i in range(300)
+        ]
+        props.sort(key=lambda p: p.price)
+        manager = ClientManager()
+        for i in range(40):
+            manager.add_client(Client(i, f"C{i}", "", float(rng.randrange(40, 160)) * 1000, rng.choice(types + [None])))
+        expected = []
+        for client in manager.clients:
+            matched = [p for p in props if p.price <= client.budget
+                       and p.status == PropertyStatus.AVAILABLE and p.property_type == client.property_type]
+            if matched:
+                expected.append((client, matched))
+        self.assertEqual(manager.match_properties(props), expected)
+
+        client = manager.peek()
+        self.assertEqual(manager.match_properties(props, client), [pair for pair in expected if pair[0] is client])
+
+    def test_reuse_engine(self):
+        """测试传入已构建的引擎反复匹配，成交移除后不再匹配到已售房产"""
+        manager = ClientManager()
+        client = Client(1, "Alice", "a@x.com", 350000.0, PropertyType.HOUSE)
+        self.assertEqual(manager.match_properties(self.engine, client),
+                         [(client, [self.properties[4], self.properties[0]])])
+        self.engine.remove(self.properties[4])
+        self.assertEqual(manager.match_properties(self.engine, client), [(client, [self.properties[0]])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -88,13 +88,112 @@ class TestPropertyManager(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].property_ID, 2)
 
-    # 新增：测试添加重复价格但不同ID的房产，实际行为应为不插入，断言查找不到新ID
+    def test_location_search(self):
+        """测试地址按规范化 token 匹配，倒排索引随增删更新，与价格/类型条件组合"""
+        self.property_manager.add_property(Property(4, "12 Main Street", 100000.0, PropertyType.LAND,
+                                                    PropertyStatus.AVAILABLE))
+        ids = lambda results: [p.property_ID for p in results]
+        self.assertEqual(ids(self.property_manager.query_properties(location="main st")), [4, 1])
+        self.assertEqual(ids(self.property_manager.query_properties(location="MAIN")), [4, 1])
+        self.assertEqual(ids(self.property_manager.query_properties(location="Elm Street")), [2])
+        self.assertEqual(ids(self.property_manager.query_properties(
+            price_range=(200000, 500000), location="Main")), [1])
+        self.assertEqual(ids(self.property_manager.query_properties(
+            property_type=PropertyType.LAND, location="st")), [4])
+        self.assertEqual(self.property_manager.query_properties(location="Mai"), [])
+
+        self.property_manager.remove_property(4)
+        self.assertEqual(ids(self.property_manager.query_properties(location="main st")), [1])
+        restored = PropertyManager.from_sorted(self.property_manager.tree.iter_range())
+        self.assertEqual(ids(restored.query_properties(location="oak")), [3])
+
+    def test_query_address(self):
+        """测试地址全文搜索：子串命中按价格升序，无命中时模糊匹配，索引随增删更新且不记录浏览"""
+        ids = lambda results: [p.property_ID for p in results]
+        self.assertEqual(ids(self.property_manager.query_address("st")), [3, 1, 2])
+        self.assertEqual(ids(self.property_manager.query_address("ELM")), [2])
+        self.assertEqual(ids(self.property_manager.query_address("456 Elm Sx", fuzzy_limit=1)), [2])
+        self.assertEqual(self.property_manager.query_address("456 Elm Sx", fuzzy_limit=0), [])
+
+        self.property_manager.add_property(Property(4, "9 Elmwood Ave", 90000.0, PropertyType.LAND,
+                                                    PropertyStatus.AVAILABLE))
+        self.assertEqual(ids(self.property_manager.query_address("elm")), [4, 2])
+        self.property_manager.remove_property(2)
+        self.assertEqual(ids(self.property_manager.query_address("elm")), [4])
+        self.assertEqual(self.property_manager.flush_views(), 0)
+
+    def test_query_is_side_effect_free(self):
+        """测试纯查询不写浏览量，搜索的浏览记录先缓冲、写回后才生效"""
+        self.assertEqual(self.property_manager.query_properties(price_range=(100000, 260000)),
+                         [self.property3, self.property1])
+        self.assertEqual((self.property1.views, self.property3.views), (0, 0))
+
+        self.property_manager.search_properties(price_range=(100000, 260000))
+        self.property_manager.record_views([1, self.property2])
+        self.assertEqual(self.property1.views, 0)
+        self.assertEqual(self.property_manager.flush_views(), 3)
+        self.assertEqual([p.views for p in (self.property1, self.property2, self.property3)], [2, 1, 1])
+        self.assertEqual(self.property_manager.flush_views(), 0)
+
+        # 已删除房产的缓冲浏览被忽略；缓冲满阈值时自动写回
+        self.property_manager.record_views([2])
+        self.property_manager.remove_property(2)
+        self.property_manager.flush_views()
+        self.property_manager.VIEW_FLUSH_THRESHOLD = 4
+        self.property_manager.record_views([3, 3, 3, 3])
+        self.assertEqual(self.property3.views, 5)
+
+    # 新增：测试添加重复价格但不同ID的房产，两者都应保留
     def test_add_duplicate_price_property(self):
-        """测试添加价格相同但ID不同的房产（应不插入）"""
+        """测试添加价格相同但ID不同的房产（复合键，两者都保留）"""
+        prop_dup = Property(99, "999 Dup St", 250000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE)
+        self.property_manager.add_property(prop_dup)
+        self.assertIs(self.property_manager.find_property_by_id(99), prop_dup)
+        self.assertIs(self.property_manager.find_property_by_id(1), self.property1)
+
+    def test_add_properties_bulk(self):
+        """测试批量添加房产（跳过已存在及批内重复的ID）"""
+        batch = [
+            Property(10, "10 Bulk St", 120000.0, PropertyType.LAND, PropertyStatus.AVAILABLE),
+            Property(11, "11 Bulk St", 250000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+            Property(1, "Existing ID", 1.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+            Property(10, "Dup In Batch", 2.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+        ]
+        self.assertEqual(self.property_manager.add_properties(batch), 2)
+        self.assertIs(self.property_manager.find_property_by_id(10), batch[0])
+        self.assertIs(self.property_manager.find_property_by_id(1), self.property1)
+        prices = [p.price for p in self.property_manager.search_properties()]
+        self.assertEqual(prices, sorted(prices))
+        self.assertEqual(len(prices), 5)
+        self.assertTrue(self.property_manager.remove_property(11))
+        with self.assertRaises(ValueError):
+            self.property_manager.add_properties(["not a property"])
+
+    def test_remove_duplicate_price_property(self):
+        """测试删除价格相同的房产之一，另一套不受影响"""
         prop_dup = Property(99, "999 Dup St", 250000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE)
         self.property_manager.add_property(prop_dup)
-        found = self.property_manager.find_property_by_id(99)
-        self.assertIsNone(found)  # 实际行为：不插入
+        self.assertTrue(self.property_manager.remove_property(99))
+        results = self.property_manager.search_properties(price_range=(250000, 250000))
+        self.assertEqual(results, [self.property1])
+        self.assertIsNone(self.property_manager.tree.find_by_id(99))
+
+    def test_add_duplicate_id_property(self):
+        """测试添加ID重复的房产（应不插入，原对象不变）"""
+        prop_dup = Property(1, "Dup Address", 123456.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE)
+        self.assertFalse(self.property_manager.add_property(prop_dup))
+        self.assertIs(self.property_manager.find_property_by_id(1), self.property1)
+        self.assertEqual(self.property_manager.tree.size(), 3)
+
+    def test_id_index_consistent_after_adjust_prices(self):
+        """测试调价后按ID查找和删除仍然正确"""
+        self.property1.views = 15
+        self.property_manager.adjust_prices()
+        self.assertIs(self.property_manager.find_property_by_id(1), self.property1)
+        self.assertTrue(self.property_manager.remove_property(1))
+        self.assertIsNone(self.property_manager.find_property_by_id(1))
+        self.assertIsNone(self.property_manager.tree.find_by_id(1))
+        self.assertEqual(self.property_manager.tree.size(), 2)
 
     # 新增：测试添加非Property对象
     def test_add_invalid_property(self):
@@ -126,6 +225,17 @@ class TestPropertyManager(unittest.TestCase):
         results = pm.search_properties()
         self.assertEqual(results, [])
 
+    def test_price_statistics(self):
+        """测试基于子树统计的数量、均价、中位数与第k便宜查询"""
+        self.assertEqual(self.property_manager.count_properties(), 3)
+        self.assertEqual(self.property_manager.count_properties((200000, 300000)), 2)
+        self.assertAlmostEqual(self.property_manager.average_price(), 700000.0 / 3)
+        self.assertEqual(self.property_manager.average_price((200000, 300000)), 275000.0)
+        self.assertEqual(self.property_manager.median_price(), 250000.0)
+        self.assertEqual(self.property_manager.price_percentile(100), 300000.0)
+        self.assertIs(self.property_manager.kth_cheapest(0), self.property3)
+        self.assertIsNone(PropertyManager().average_price())
+
     def test_adjust_prices(self):
         """测试房产动态调价 adjust_prices"""
         # 设置不同浏览量和问询量
@@ -150,6 +260,70 @@ class TestPropertyManager(unittest.TestCase):
         self.assertEqual(self.property1.views, 0)
         self.assertEqual(self.property2.inquiries, 0)
 
+    def test_adjust_prices_rekeys_tree(self):
+        """测试调价后树按新价格重新排序，区间查询与按 ID 删除仍然正确"""
+        self.property3.views = 15  # 150000 -> 157500
+        self.property_manager.record_views([1] * 20)  # 缓冲中的浏览同样计入：250000 -> 262500
+        diff = self.property_manager.adjust_prices()
+        self.assertEqual(diff, [(3, 150000.0, 157500.0), (1, 250000.0, 262500.0), (2, 300000.0, 291000.0)])
+        self.assertEqual([n.key for n in self.property_manager.tree.iter_nodes()],
+                         [(157500.0, 3), (262500.0, 1), (291000.0, 2)])
+        self.assertEqual(self.property_manager.query_properties(price_range=(260000, 295000)),
+                         [self.property1, self.property2])
+        self.assertEqual(self.property_manager.stats.price_sum(), 157500.0 + 262500.0 + 291000.0)
+        self.assertTrue(self.property_manager.remove_property(1))
+        self.assertEqual(self.property_manager.count_properties(), 2)
+
+    def test_set_prices_repeated_ids(self):
+        """测试同一 ID 多次改价以最后一次为准，逐个重插与整体重排两条路径的 ID 索引都与树一致"""
+        pm = self.property_manager
+        # 1 处改动：逐个删除再插入
+        self.assertEqual(pm.set_prices([(1, 1.0), (1, 5.0)]), [self.property1])
+        # 2 处改动：改写 key 后整体重排
+        self.assertEqual(pm.set_prices([(2, 1.0), (3, 9.0), (2, 7.0)]), [self.property2, self.property3])
+        self.assertEqual([n.key for n in pm.tree.iter_nodes()], [(5.0, 1), (7.0, 2), (9.0, 3)])
+        for property_id in (1, 2, 3):
+            key = pm._id_index[property_id][0]
+            self.assertIs(pm.tree.find_key(key).property, pm.find_property_by_id(property_id))
+        self.assertEqual(pm.stats.price_sum(), 21.0)
+        self.assertEqual(pm.set_prices([(3, 1.0), (3, 9.0)]), [])  # 最终价格未变
+        self.assertTrue(pm.remove_property(2))
+        self.assertEqual([n.key for n in pm.tree.iter_nodes()], [(5.0, 1), (9.0, 3)])
+        self.assertEqual(pm.stats.price_sum(), 14.0)
+
+    def test_adjust_prices_dry_run(self):
+        """测试 dry_run 只返回变化列表，不修改价格与浏览量"""
+        self.property1.views = 15
+        diff = self.property_manager.adjust_prices(dry_run=True)
+        self.assertEqual(diff, [(3, 150000.0, 145500.0), (1, 250000.0, 262500.0), (2, 300000.0, 291000.0)])
+        self.assertEqual((self.property1.price, self.property1.views), (250000.0, 15))
+        self.assertEqual(self.property_manager.adjust_prices(), diff)
+
+    def test_adjust_prices_backends_agree(self):
+        """测试大批量调价时 numpy 与纯 Python 方案逐位一致，整体重建的树保持有序平衡"""
+        import random
+        from real_estate.managers.repricing import plan_repricing, np
+        rng = random.Random(3)
+        pm = PropertyManager()
+        pm.add_properties(Property(i, f"{i} Rd", round(rng.uniform(1000, 900000), 2), PropertyType.HOUSE,
+                                   PropertyStatus.AVAILABLE) for i in range(2000))
+        for prop in pm.iter_properties():
+            prop.views = rng.randrange(0, 15)
+            prop.inquiries = rng.randrange(0, 4)
+        python_plan = plan_repricing(pm.iter_properties(), backend="python")
+        if np is not None:
+            self.assertEqual(plan_repricing(pm.iter_properties(), backend="numpy"), python_plan)
+        with self.assertRaises(ValueError):
+            plan_repricing([], backend="gpu")
+
+        diff = pm.adjust_prices(backend="python")
+        self.assertEqual(diff, [(p.property_ID, old, new) for p, old, new in python_plan[0]])
+        keys = [n.key for n in pm.tree.iter_nodes()]
+        self.assertEqual(keys, sorted((p.price, p.property_ID) for p in pm.iter_properties()))
+        self.assertEqual(len(keys), 2000)
+        self.assertLessEqual(pm.tree.root.height, 12)
+        self.assertTrue(all(p.views == 0 and p.inquiries == 0 for p in pm.iter_properties()))
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+import unittest
+import random
+from real_estate.managers import ClientManager, VectorScorer
+from real_estate.managers.vector_scoring import np
+from real_estate.models import Client, Property, PropertyType, PropertyStatus
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestVectorScorer(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        self.manager = ClientManager()
+        streets = ["Main St", "Elm St", "Oak Ave", "Pine Rd", "Lake Dr"]
+        features = ["balcony", "garage", "pool", "garden", "gym"] + [f"f{i}" for i in range(70)]
+        self.properties = []
+        for i in range(400):
+            prop = Property(i, f"{rng.randrange(1, 999)} {rng.choice(streets)}",
+                            float(rng.randrange(50, 500)) * 1000, rng.choice(list(PropertyType)),
+                            rng.choice([PropertyStatus.AVAILABLE, PropertyStatus.SOLD]))
+            prop.features = rng.sample(features, rng.randrange(0, 4))
+            self.properties.append(prop)
+        self.clients = [
+            Client(i, f"C{i}", "", float(rng.randrange(50, 500)) * 1000,
+                   rng.choice(list(PropertyType) + [None]),
+                   preferred_neighborhoods=rng.sample(["Main", "Elm", "Lake", "Nowhere"], rng.randrange(0, 3)),
+                   preferred_features=rng.sample(features[:10], rng.randrange(0, 3)))
+            for i in range(25)
+        ]
+        self.scorer = VectorScorer(self.properties)
+
+    def test_same_ranking_as_python_backend(self):
+        """测试向量化打分与纯Python版本的分数和排序完全一致"""
+        for client in self.clients:
+            expected = self.manager.match_properties_advanced(self.properties, client)
+            self.assertEqual(self.scorer.match(client), expected)
+            self.assertEqual(self.manager.match_properties_advanced(self.properties, client, backend="numpy"), expected)
+            self.assertEqual(self.manager.match_properties_advanced(self.scorer, client), expected)
+
+    def test_top_k(self):
+        """测试argpartition取top-k与全量排序的前k个一致"""
+        for client in self.clients:
+            full = self.scorer.match(client)
+            self.assertEqual(self.scorer.match(client, limit=5), full[:5])
+            self.assertEqual(self.scorer.match(client, limit=0), [])
+
+    def test_match_batch(self):
+        """测试批量打分结果与逐个客户打分一致"""
+        batch = self.scorer.match_batch(self.clients, limit=7)
+        self.assertEqual(batch, [self.scorer.match(c, limit=7) for c in self.clients])
+
+    def test_empty_and_unknown_backend(self):
+        scorer = VectorScorer([])
+        self.assertEqual(scorer.match(self.clients[0]), [])
+        self.assertEqual(scorer.match_batch(self.clients[:2]), [[], []])
+        with self.assertRaises(ValueError):
+            self.manager.match_properties_advanced(self.properties, self.clients[0], backend="gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -51,6 +51,17 @@ class TestProperty(unittest.TestCase):
         expected_repr2 = "<Property 3 | 789 Oak St | $150000.00 | APARTMENT | SOLD | Owner: John Doe | Features: 无>"
         self.assertEqual(repr(self.property1), expected_repr1)
         self.assertEqual(repr(self.property2), expected_repr2)
+        with_features = Property(5, "1 Bay Rd", 100000.0, PropertyType.LAND, PropertyStatus.AVAILABLE,
+                                 features=["garden", "pool"])
+        self.assertEqual(repr(with_features),
+                         "<Property 5 | 1 Bay Rd | $100000.00 | LAND | AVAILABLE | Owner: None | Features: garden,pool>")
+
+    def test_property_slots(self):
+        """测试 Property 使用 __slots__，不再有实例 __dict__，features 为声明字段"""
+        self.assertFalse(hasattr(self.property1, "__dict__"))
+        self.assertEqual(self.property1.features, ())
+        with self.assertRaises(AttributeError):
+            self.property1.undeclared = 1
 
     def test_property_eq(self):
         """测试 Property 类的 __eq__ 方法"""
@@ -91,6 +91,14 @@ class TestAVLTree(unittest.TestCase):
         not_found = tree._find_by_id(tree.root, 999)
         self.assertIsNone(not_found)
 
+    def test_find_key(self):
+        tree = AVLTree()
+        for key in [50, 30, 70, 20, 40]:
+            tree.insert_key(key, str(key))
+        self.assertEqual(tree.find_key(40).property, "40")
+        self.assertIsNone(tree.find_key(45))
+        self.assertIsNone(AVLTree().find_key(1))
+
     def test_search_by_price_range(self):
         tree = AVLTree()
         node1 = Property(1, "a", 100, PropertyType.HOUSE, PropertyStatus.AVAILABLE)
@@ -101,6 +109,38 @@ class TestAVLTree(unittest.TestCase):
         self.assertIn(node1, results)
         self.assertNotIn(node2, results)
 
+    def test_iter_range_is_lazy_and_ordered(self):
+        tree = AVLTree()
+        for pid, price in enumerate([50, 10, 40, 20, 30, 60, 70]):
+            tree.insert_key((price, pid), self.create_fake_property(pid, price))
+        it = tree.iter_range(20, 50)
+        self.assertIs(iter(it), it)  # 生成器，按需产出
+        self.assertEqual([p.price for p in it], [20, 30, 40, 50])
+        self.assertEqual([p.price for p in tree.iter_range()], [10, 20, 30, 40, 50, 60, 70])
+        self.assertEqual(list(tree.iter_range(80, 90)), [])
+
+    def test_many_inserts_and_deletes_stay_balanced(self):
+        import random
+        rng = random.Random(7)
+        tree = AVLTree()
+        keys = list(range(3000))
+        rng.shuffle(keys)
+        for k in keys:
+            tree.insert_key((k, k), k)
+        for k in keys[:1500]:
+            tree.delete_key((k, k))
+        remaining = sorted(keys[1500:])
+        self.assertEqual([n.key[0] for n in tree.iter_nodes()], remaining)
+
+        # 显式栈检查平衡因子与高度
+        stack = [tree.root]
+        while stack:
+            node = stack.pop()
+            self.assertLessEqual(abs(tree.balance_factor(node)), 1)
+            self.assertEqual(node.height, max(tree.height(node.left), tree.height(node.right)) + 1)
+            stack.extend(child for child in (node.left, node.right) if child)
+        self.assertEqual(tree.size(), 1500)
+
     def test_insert_duplicate_key(self):
         tree = AVLTree()
         prop1 = self.create_fake_property(101, 10)
@@ -132,6 +172,92 @@ class TestAVLTree(unittest.TestCase):
         q = ClientQueue()
         self.assertIsNone(q.peek())
 
+    def test_subtree_size_and_total_through_rotations(self):
+        tree = AVLTree()
+        prices = [10, 20, 30, 40, 50, 25, 35, 5]
+        for pid, price in enumerate(prices):
+            tree.insert_key((price, pid), self.create_fake_property(pid, price))
+        tree.delete_key((30, 2))
+        tree.delete_key((10, 0))
+        stack = [tree.root]
+        while stack:
+            node = stack.pop()
+            children = [c for c in (node.left, node.right) if c]
+            self.assertEqual(node.size, 1 + sum(c.size for c in children))
+            self.assertEqual(node.total, node.key[0] + sum(c.total for c in children))
+            stack.extend(children)
+        self.assertEqual(tree.size(), 6)
+        self.assertEqual(tree.total_price(), sum(prices) - 40)
+
+    def test_select_rank_and_range_counts(self):
+        tree = AVLTree()
+        prices = [300, 100, 200, 200, 500, 400]
+        for pid, price in enumerate(prices):
+            tree.insert_key((price, pid), self.create_fake_property(pid, price))
+        ordered = sorted(prices)
+        self.assertEqual([tree.select(i).key[0] for i in range(len(prices))], ordered)
+        with self.assertRaises(IndexError):
+            tree.select(len(prices))
+        self.assertEqual(tree.rank(200), 1)
+        self.assertEqual(tree.rank(250), 3)
+        self.assertEqual(tree.count_in_range(200, 400), 4)
+        self.assertEqual(tree.sum_in_range(200, 400), 1100)
+        self.assertEqual(tree.count_in_range(600, 700), 0)
+        self.assertEqual(tree.count_in_range(400, 200), 0)
+        # 复合键的中序位置：同价按 ID 区分，不存在的 key 返回插入位置
+        keys = sorted((price, pid) for pid, price in enumerate(prices))
+        for i, key in enumerate(keys):
+            self.assertEqual(tree.index_of(key), i)
+            self.assertIs(tree.select(tree.index_of(key)).key, tree.find_key(key).key)
+        self.assertEqual(tree.index_of((200, 99)), 3)
+        self.assertEqual(tree.index_of((0, 0)), 0)
+
+    def test_percentile_and_median(self):
+        tree = AVLTree()
+        self.assertIsNone(tree.median())
+        for pid, price in enumerate([40, 10, 30, 20]):
+            tree.insert_key((price, pid), self.create_fake_property(pid, price))
+        self.assertEqual(tree.median(), 25)
+        self.assertEqual(tree.percentile(0), 10)
+        self.assertEqual(tree.percentile(100), 40)
+        self.assertAlmostEqual(tree.percentile(25), 17.5)
+        with self.assertRaises(ValueError):
+            tree.percentile(101)
+
+    def assert_valid_avl(self, tree):
+        stack = [tree.root] if tree.root else []
+        while stack:
+            node = stack.pop()
+            self.assertLessEqual(abs(tree.balance_factor(node)), 1)
+            children = [c for c in (node.left, node.right) if c]
+            self.assertEqual(node.size, 1 + sum(c.size for c in children))
+            stack.extend(children)
+
+    def test_bulk_load_unsorted_with_duplicates(self):
+        items = [((p, p), self.create_fake_property(p, p)) for p in [9, 3, 7, 1, 5, 3]]
+        tree = AVLTree.bulk_load(items)
+        self.assertEqual([n.key for n in tree.iter_nodes()], [(1, 1), (3, 3), (5, 5), (7, 7), (9, 9)])
+        self.assertIs(tree.find_key((3, 3)).property, items[1][1])  # 重复key保留先出现的
+        self.assert_valid_avl(tree)
+        self.assertIsNone(AVLTree.from_sorted([]).root)
+
+    def test_from_sorted_is_perfectly_balanced(self):
+        tree = AVLTree.from_sorted([((i, i), i) for i in range(1023)])
+        self.assertEqual(tree.root.height, 10)
+        self.assertEqual(tree.size(), 1023)
+        self.assert_valid_avl(tree)
+
+    def test_merge_small_and_large_batches(self):
+        tree = AVLTree.from_sorted([((i, i), i) for i in range(0, 200, 2)])
+        # 小批次：逐个插入
+        self.assertEqual(tree.merge([((1, 1), 1), ((0, 0), "dup")]), 1)
+        self.assertEqual(tree.find_key((0, 0)).property, 0)
+        # 大批次：线性归并后重建
+        self.assertEqual(tree.merge([((i, i), i) for i in range(1, 400, 2)]), 199)
+        self.assertEqual([n.key[0] for n in tree.iter_nodes()], list(range(0, 200)) + list(range(201, 400, 2)))
+        self.assert_valid_avl(tree)
+        self.assertEqual(tree.merge([]), 0)
+
     def test_tree_size(self):
         tree = AVLTree()
         self.assertEqual(tree.size(), 0)
@@ -209,6 +335,38 @@ class TestClientQueue(unittest.TestCase):
         self.queue.enqueue(self.client2)
         self.assertEqual(self.queue.to_list(), [self.client1, self.client2])
 
+    def test_get_and_remove_by_id(self):
+        """测试按ID查找与任意位置删除，FIFO顺序保持不变"""
+        client3 = Client(client_ID=3, name="Cara", contact_info="cara@example.com", budget=1.0)
+        for c in (self.client1, self.client2, client3):
+            self.queue.enqueue(c)
+        self.assertIs(self.queue.get(2), self.client2)
+        self.assertIsNone(self.queue.get(99))
+
+        self.assertTrue(self.queue.remove(2))  # 中间节点
+        self.assertFalse(self.queue.remove(2))
+        self.assertNotIn(self.client2, self.queue)
+        self.assertEqual(self.queue.to_list(), [self.client1, client3])
+
+        self.assertTrue(self.queue.remove(3))  # 尾节点
+        self.assertIs(self.queue.rear.data, self.client1)
+        self.assertTrue(self.queue.remove(1))  # 唯一节点
+        self.assertIsNone(self.queue.front)
+        self.assertIsNone(self.queue.rear)
+        self.assertEqual(self.queue.size(), 0)
+
+        # 删除后可以重新入队
+        self.queue.enqueue(self.client2)
+        self.assertEqual(self.queue.to_list(), [self.client2])
+
+    def test_dequeue_releases_id(self):
+        """测试出队后同一ID可再次入队（move_front_to_rear依赖此行为）"""
+        self.queue.enqueue(self.client1)
+        self.queue.enqueue(self.client2)
+        self.queue.move_front_to_rear()
+        self.assertEqual(self.queue.to_list(), [self.client2, self.client1])
+        self.assertEqual(self.queue.size(), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import unittest
+from real_estate.models import Client
+from real_estate.managers import ClientManager
+from real_estate.structures import ClientScheduler, ClientQueue
+
+
+class TestClientScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clients = [
+            Client(client_ID=i, name=f"Client {i}", contact_info=f"c{i}@example.com", budget=budget)
+            for i, budget in enumerate([100.0, 300.0, 200.0, 400.0], start=1)
+        ]
+
+    def test_default_is_fifo(self):
+        """测试默认key时按入队顺序出队"""
+        scheduler = ClientScheduler()
+        for c in self.clients:
+            scheduler.enqueue(c)
+        scheduler.enqueue(self.clients[0])  # 重复ID不添加
+        self.assertEqual(scheduler.size(), 4)
+        self.assertEqual([scheduler.dequeue() for _ in range(4)], self.clients)
+        self.assertIsNone(scheduler.dequeue())
+        self.assertTrue(scheduler.is_empty())
+
+    def test_priority_key(self):
+        """测试按预算从高到低调度"""
+        scheduler = ClientScheduler(key=lambda c: -c.budget)
+        for c in self.clients:
+            scheduler.enqueue(c)
+        self.assertEqual(scheduler.to_list(), [self.clients[3], self.clients[1], self.clients[2], self.clients[0]])
+        self.assertIs(scheduler.peek(), self.clients[3])
+        self.assertEqual([scheduler.dequeue().client_ID for _ in range(4)], [4, 2, 3, 1])
+
+    def test_defer_with_backoff(self):
+        """测试匹配失败的客户被退避推迟，不会反复占据队首"""
+        scheduler = ClientScheduler()
+        for c in self.clients[:3]:
+            scheduler.enqueue(c)
+        self.assertEqual(scheduler.defer(), 2)  # 队首 client1 第一次失败，推迟2步
+        self.assertIs(scheduler.peek(), self.clients[1])
+        self.assertEqual(scheduler.to_list()[-1], self.clients[0])
+        self.assertIs(scheduler.dequeue(), self.clients[1])
+        self.assertIs(scheduler.dequeue(), self.clients[2])
+        self.assertIs(scheduler.peek(), self.clients[0])  # 退避到期后回到就绪队列末尾
+        scheduler.move_front_to_rear()  # 只剩 client1：推迟后仍能被取出
+        self.assertIs(scheduler.dequeue(), self.clients[0])
+        self.assertTrue(scheduler.is_empty())
+
+    def test_repeated_failures_back_off_exponentially(self):
+        scheduler = ClientScheduler(max_backoff=8)
+        scheduler.enqueue(self.clients[0])
+        delays = [scheduler.defer(self.clients[0]) for _ in range(4)]
+        self.assertEqual(delays, [2, 4, 8, 8])
+        self.assertIs(scheduler.peek(), self.clients[0])
+
+    def test_get_remove_contains(self):
+        scheduler = ClientScheduler()
+        for c in self.clients:
+            scheduler.enqueue(c)
+        scheduler.defer(self.clients[1])
+        self.assertIs(scheduler.get(2), self.clients[1])
+        self.assertTrue(scheduler.remove(2))
+        self.assertFalse(scheduler.remove(2))
+        self.assertNotIn(self.clients[1], scheduler)
+        self.assertTrue(scheduler.remove(1))
+        self.assertEqual(scheduler.size(), 2)
+        self.assertEqual([scheduler.dequeue().client_ID for _ in range(2)], [3, 4])
+
+    def test_client_manager_use_scheduler(self):
+        """测试ClientManager切换调度器后保留客户并支持查找和删除"""
+        manager = ClientManager()
+        for c in self.clients:
+            manager.add_client(c)
+        manager.use_scheduler(ClientScheduler(key=lambda c: -c.budget))
+        self.assertIsInstance(manager.clients, ClientScheduler)
+        self.assertIs(manager.peek(), self.clients[3])
+        self.assertIs(manager.find_client_by_id(1), self.clients[0])
+        self.assertTrue(manager.remove_client(4))
+        self.assertIs(manager.peek(), self.clients[1])
+        self.assertIsInstance(ClientManager().clients, ClientQueue)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import os
+import random
+import shutil
+import tempfile
+from real_estate.structures import ColumnStore
+from real_estate.managers.property_manager import PropertyManager
+from real_estate.models import Property, PropertyType, PropertyStatus
+
+
+class TestColumnStore(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "properties.cols")
+        self.manager = PropertyManager()
+        self.manager.add_property(Property(1, "123 Main St", 250000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE))
+        self.manager.add_property(Property(2, "456 Elm St", 300000.0, PropertyType.APARTMENT,
+                                           PropertyStatus.SOLD, owner="李四"))
+        self.manager.add_property(Property(3, "路 789 号", 150000.0, PropertyType.APARTMENT, PropertyStatus.AVAILABLE))
+        self.manager.add_property(Property(4, "123 Main St", 250000.0, PropertyType.LAND, PropertyStatus.AVAILABLE))
+        self.assertEqual(self.manager.export_columns(self.path), 4)
+        self.store = ColumnStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_rows(self):
+        """测试按 (price, property_ID) 排列，按 ID 查找返回完整行"""
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(list(self.store.ids), [3, 1, 4, 2])
+        row = self.store.find_property_by_id(2)
+        self.assertEqual((row.address, row.price, row.property_type, row.status, row.owner),
+                         ("456 Elm St", 300000.0, PropertyType.APARTMENT, PropertyStatus.SOLD, "李四"))
+        self.assertEqual(self.store.find_property_by_id(3).address, "路 789 号")
+        self.assertIsNone(self.store.find_property_by_id(1).owner)
+        self.assertIsNone(self.store.find_property_by_id(99))
+        self.assertEqual(row.to_property(), self.manager.find_property_by_id(2))
+
+    def test_search(self):
+        """测试价格区间、类型与地址过滤"""
+        ids = lambda rows: [r.property_ID for r in rows]
+        self.assertEqual(ids(self.store.search_properties(price_range=(200000, 300000))), [1, 4, 2])
+        self.assertEqual(ids(self.store.search_properties(property_type=PropertyType.APARTMENT)), [3, 2])
+        self.assertEqual(ids(self.store.search_properties(location="123 Main St")), [1, 4])
+        self.assertEqual(ids(self.store.search_properties((0, 260000), PropertyType.LAND, "123 Main St")), [4])
+        self.assertEqual(self.store.search_properties(price_range=(1, 2)), [])
+
+    def test_analytics(self):
+        """测试统计查询与 PropertyManager 一致"""
+        for price_range in (None, (200000, 300000), (0, 100)):
+            self.assertEqual(self.store.count_properties(price_range), self.manager.count_properties(price_range))
+            self.assertEqual(self.store.average_price(price_range), self.manager.average_price(price_range))
+        for p in (0, 25, 50, 90, 100):
+            self.assertAlmostEqual(self.store.price_percentile(p), self.manager.price_percentile(p))
+        self.assertEqual(self.store.median_price(), self.manager.median_price())
+        self.assertEqual(self.store.kth_cheapest(1).property_ID, self.manager.kth_cheapest(1).property_ID)
+        with self.assertRaises(IndexError):
+            self.store.kth_cheapest(4)
+        self.assertEqual(self.store.type_counts(), {PropertyType.APARTMENT: 2, PropertyType.HOUSE: 1, PropertyType.LAND: 1})
+        self.assertEqual(self.store.status_counts((0, 260000)), {PropertyStatus.AVAILABLE: 3})
+
+    def test_random_against_manager(self):
+        """测试随机数据下区间查询与 PropertyManager 结果一致"""
+        rng = random.Random(11)
+        manager = PropertyManager()
+        manager.add_properties(
+            Property(i, f"{rng.randrange(20)} St", float(rng.randrange(1, 200)) * 1000, rng.choice(list(PropertyType)),
+                     PropertyStatus.AVAILABLE)
+            for i in range(500))
+        path = os.path.join(self.test_dir, "random.cols")
+        manager.export_columns(path)
+        with ColumnStore(path) as store:
+            for _ in range(30):
+                low = rng.randrange(0, 200000)
+                price_range = (low, low + rng.randrange(0, 80000))
+                property_type = rng.choice(list(PropertyType) + [None])
+                expected = [p.property_ID for p in manager.iter_properties(price_range, property_type)]
+                self.assertEqual([r.property_ID for r in store.iter_properties(price_range, property_type)], expected)
+                self.assertAlmostEqual(store.average_price(price_range) or 0, manager.average_price(price_range) or 0)
+
+    def test_empty_and_invalid_files(self):
+        """测试空库与非列式文件"""
+        path = os.path.join(self.test_dir, "empty.cols")
+        PropertyManager().export_columns(path)
+        with ColumnStore(path) as store:
+            self.assertEqual(store.count_properties(), 0)
+            self.assertIsNone(store.median_price())
+            self.assertEqual(store.search_properties(), [])
+        with open(path, "wb") as f:
+            f.write(b"property_ID,address\n1,x\n")
+        with self.assertRaises(ValueError):
+            ColumnStore(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
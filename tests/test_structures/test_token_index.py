@@ -0,0 +1,24 @@
+import unittest
+from real_estate.structures.token_index import TokenIndex
+
+
+class TestTokenIndex(unittest.TestCase):
+    def test_lookup(self):
+        """测试多 token 求交、删除后倒排表收缩"""
+        index = TokenIndex()
+        index.add(1, {"123", "main", "st"})
+        index.add(2, {"456", "main", "ave"})
+        index.add(3, {"7", "elm", "st"})
+        self.assertEqual(index.lookup(["main"]), {1, 2})
+        self.assertEqual(index.lookup(["main", "st"]), {1})
+        self.assertEqual(index.lookup(["main", "oak"]), set())
+        self.assertEqual(index.lookup([]), set())
+
+        index.remove(1, {"123", "main", "st"})
+        self.assertEqual(index.lookup(["st"]), {3})
+        self.assertNotIn("123", index)
+        self.assertEqual(len(index), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
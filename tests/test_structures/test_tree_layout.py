@@ -0,0 +1,55 @@
+import unittest
+from real_estate.structures import AVLTree
+from real_estate.structures.tree_layout import layout_window, subtree_bounds, NODE, SUMMARY
+from real_estate.models.property import Property, PropertyType, PropertyStatus
+
+
+class TestTreeLayout(unittest.TestCase):
+    def setUp(self):
+        """1023 个节点的满二叉树，高度 10"""
+        items = [((float(i), i), Property(i, f"Address {i}", float(i), PropertyType.HOUSE, PropertyStatus.AVAILABLE))
+                 for i in range(1023)]
+        self.tree = AVLTree.from_sorted(items)
+
+    def test_full_layout(self):
+        """测试不裁剪时每个节点按中序名次排布，连线指向孩子"""
+        cells = list(layout_window(self.tree.root, 10.0))
+        self.assertEqual(len(cells), 1023)
+        self.assertTrue(all(c.kind == NODE for c in cells))
+        by_id = {c.node.property.property_ID: c for c in cells}
+        for c in cells:
+            self.assertEqual(c.x, (c.node.property.property_ID + 0.5) * 10.0)
+            if c.node.left:
+                self.assertEqual(c.left_x, by_id[c.node.left.property.property_ID].x)
+            else:
+                self.assertIsNone(c.left_x)
+        self.assertEqual(max(c.depth for c in cells), 9)
+
+    def test_viewport_culling(self):
+        """测试只产出与窗口相交的子树，遍历量与可见节点数相当"""
+        cells = list(layout_window(self.tree.root, 10.0, x_lo=2000.0, x_hi=2100.0, depth_lo=2, depth_hi=6))
+        self.assertTrue(cells)
+        for c in cells:
+            self.assertTrue(2 <= c.depth <= 6)
+            self.assertTrue(c.x_end >= 2000.0 and c.x_start <= 2100.0)
+        self.assertLess(len(cells), 20)
+
+    def test_collapse_and_expand(self):
+        """测试窄子树折叠为摘要，放大后展开"""
+        cells = list(layout_window(self.tree.root, 0.5, collapse_width=40.0))
+        summaries = [c for c in cells if c.kind == SUMMARY]
+        self.assertTrue(summaries)
+        # 摘要覆盖的名次与展开的节点恰好组成全部节点
+        covered = sum(c.node.size for c in summaries) + sum(1 for c in cells if c.kind == NODE)
+        self.assertEqual(covered, 1023)
+        self.assertTrue(all(c.x_end - c.x_start < 40.0 for c in summaries))
+        zoomed = list(layout_window(self.tree.root, 50.0, collapse_width=40.0))
+        self.assertTrue(all(c.kind == NODE for c in zoomed))
+
+    def test_subtree_bounds(self):
+        low, high = subtree_bounds(self.tree.root.left)
+        self.assertEqual((low.key, high.key), ((0.0, 0), (510.0, 510)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from real_estate.structures.trigram_index import TrigramIndex, IncrementalSearch, normalize_text
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TrigramIndex()
+        self.index.add(1, "123 Main St")
+        self.index.add(2, "456 Elm St")
+        self.index.add(3, "12 Mainland  Ave")
+        self.index.add(4, "路 789 号")
+
+    def test_substring(self):
+        """测试子串查询忽略大小写与多余空白，短查询与非 ASCII 同样可用"""
+        self.assertEqual(normalize_text("  12 Mainland  Ave "), "12 mainland ave")
+        self.assertEqual(self.index.search("MAIN"), {1, 3})
+        self.assertEqual(self.index.search("land ave"), {3})
+        self.assertEqual(self.index.search("st"), {1, 2})
+        self.assertEqual(self.index.search("789 号"), {4})
+        self.assertEqual(self.index.search("main ave"), set())
+        self.assertEqual(self.index.search(""), {1, 2, 3, 4})
+
+    def test_incremental_updates(self):
+        """测试增删与改写后倒排表同步"""
+        self.index.remove(1)
+        self.assertEqual(self.index.search("main"), {3})
+        self.assertFalse(self.index.remove(1))
+        self.index.add(3, "9 Oak Rd")
+        self.assertEqual(self.index.search("main"), set())
+        self.assertEqual(self.index.search("oak"), {3})
+        self.assertEqual(len(self.index), 3)
+        # 乱序添加的 ID 插入有序倒排表，删除时按二分定位
+        self.index.add(0, "5 Elm St")
+        self.assertEqual(self.index.search("elm st"), {0, 2})
+        self.assertTrue(self.index.remove(2))
+        self.assertEqual(self.index.search("elm st"), {0})
+        self.assertEqual(self.index.search(" st"), {0})
+
+    def test_fuzzy(self):
+        """测试拼写错误时按相似度返回，低于阈值的不返回，同分时较短的地址优先"""
+        self.assertEqual(self.index.search("mian st"), set())
+        self.assertEqual([item_id for _, item_id in self.index.fuzzy("mian st")], [1])
+        self.assertEqual([item_id for _, item_id in self.index.fuzzy("mian st", min_score=0.2)], [1, 2])
+        self.index.add(5, "123 Main St Apt 4")
+        self.assertEqual([item_id for _, item_id in self.index.fuzzy("123 main st", limit=2)], [1, 5])
+        score, item_id = self.index.fuzzy("123 Main St", limit=1)[0]
+        self.assertEqual((score, item_id), (1.0, 1))
+        self.assertEqual(self.index.fuzzy("zzzz"), [])
+
+    def test_fuzzy_skips_common_trigrams(self):
+        """测试常见三元组不参与候选收集，但仍计入候选的分数"""
+        for item_id in range(10, 30):
+            self.index.add(item_id, f"{item_id} Elm St")
+        expected = self.index.fuzzy("mian st", limit=3)
+        self.index.FUZZY_MAX_POSTING = 3  # " st"、"st " 等三元组的倒排表超过上限
+        self.assertEqual(self.index.fuzzy("mian st", limit=3), expected)
+        self.assertEqual(expected[0], (3 / 7, 1))
+
+    def test_incremental_search(self):
+        """测试逐字输入时在上一次结果中筛选，索引变化或查询改短后重新查询"""
+        searcher = IncrementalSearch(self.index)
+        self.assertEqual(searcher.search("ma"), {1, 3})
+        postings, self.index._postings = self.index._postings, {}  # 继续输入时不应再访问倒排表
+        self.assertEqual(searcher.search("main s"), {1})
+        self.assertEqual(searcher.search("main st"), {1})
+        self.index._postings = postings
+
+        self.assertEqual(searcher.search("main"), {1, 3})
+        self.index.add(5, "7 Main St")
+        self.assertEqual(searcher.search("main st"), {1, 5})
+
+
+if __name__ == '__main__':
+    unittest.main()
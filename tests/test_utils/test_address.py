@@ -0,0 +1,25 @@
+import unittest
+from real_estate.utils.address import address_tokens, normalize_address, location_matches, token_set
+
+
+class TestAddress(unittest.TestCase):
+    def test_normalize(self):
+        """测试大小写、标点与街道类型/方位缩写统一"""
+        self.assertEqual(address_tokens("123 North Main Street, Apt. 4B, 10001"),
+                         ("123", "n", "main", "st", "apt", "4b", "10001"))
+        self.assertEqual(normalize_address("456 ELM st."), normalize_address("456 Elm Street"))
+        self.assertEqual(address_tokens("路 789 号"), ("路", "789", "号"))
+        self.assertEqual(address_tokens(""), ())
+        self.assertEqual(token_set(None), frozenset())
+
+    def test_location_matches(self):
+        """测试查询词的 token 全部出现在地址中才命中，不再做子串匹配"""
+        self.assertTrue(location_matches(token_set("main street"), "123 Main St"))
+        self.assertTrue(location_matches(token_set("Main"), "123 Main St"))
+        self.assertFalse(location_matches(token_set("Main"), "12 Mainland Ave"))
+        self.assertFalse(location_matches(token_set("Main Ave"), "123 Main St"))
+        self.assertFalse(location_matches(token_set(""), "123 Main St"))
+
+
+if __name__ == '__main__':
+    unittest.main()
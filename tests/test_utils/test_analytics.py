@@ -0,0 +1,26 @@
+import unittest
+from real_estate.utils.analytics import type_distribution, average_price_by_type, transaction_rate_by_type
+from real_estate.managers.property_manager import PropertyManager
+from real_estate.models import Property, PropertyType, PropertyStatus
+
+
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.property_manager = PropertyManager()
+        self.property_manager.add_properties([
+            Property(1, "123 Main St", 250000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+            Property(2, "456 Elm St", 300000.0, PropertyType.APARTMENT, PropertyStatus.SOLD),
+            Property(3, "789 Oak St", 150000.0, PropertyType.HOUSE, PropertyStatus.SOLD),
+            Property(4, "1 Bay Rd", 100000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+        ])
+
+    def test_summary(self):
+        """测试由聚合得到分布、均价与成交率"""
+        summary = self.property_manager.stats.by_type()
+        self.assertEqual(type_distribution(summary), {"HOUSE": 3, "APARTMENT": 1})
+        self.assertEqual(average_price_by_type(summary), {"HOUSE": 500000.0 / 3, "APARTMENT": 300000.0})
+        self.assertEqual(transaction_rate_by_type(summary), {"HOUSE": 1 / 3 * 100, "APARTMENT": 100.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
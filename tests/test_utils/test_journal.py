@@ -0,0 +1,188 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+from real_estate.utils.journal import Journal, recover, read_journal
+from real_estate.managers.client_manager import ClientManager
+from real_estate.managers.property_manager import PropertyManager
+from real_estate.models import Client, Property, PropertyType, PropertyStatus
+
+
+def state(client_manager, property_manager):
+    """辅助函数，提取可比较的完整状态"""
+    props = [(p.property_ID, p.price, p.status, p.owner, p.address, p.views, p.inquiries)
+             for p in property_manager.iter_properties()]
+    clients = [(c.client_ID, c.name, c.budget, c.property_type) for c in client_manager.clients]
+    return sorted(props), clients
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.journal_path = os.path.join(self.test_dir, "state.journal")
+        self.snapshot_path = os.path.join(self.test_dir, "state.snapshot")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def baseline(self):
+        client_manager = ClientManager()
+        property_manager = PropertyManager()
+        property_manager.add_properties([
+            Property(1, "123 Main St", 250000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+            Property(2, "456 Elm St", 300000.0, PropertyType.APARTMENT, PropertyStatus.AVAILABLE),
+            Property(3, "789 Oak St", 150000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE),
+        ])
+        client_manager.add_clients([
+            Client(1, "Alice", "alice@example.com", 350000.0, PropertyType.HOUSE),
+            Client(2, "Bob", "bob@example.com", 100000.0, PropertyType.APARTMENT),
+            Client(3, "Charlie", "charlie@example.com", 500000.0, PropertyType.LAND),
+        ])
+        return client_manager, property_manager
+
+    def mutate(self, client_manager, property_manager):
+        property_manager.add_property(Property(4, "1 Bay Rd", 200000.0, PropertyType.LAND, PropertyStatus.AVAILABLE,
+                                               features=["garden"]))
+        client = client_manager.peek()
+        client_manager.buy_property(client, None, property_manager)  # Alice 买下 3 号
+        client_manager.dequeue()
+        client_manager.defer_client()  # Bob 推迟到队尾
+        client_manager.add_client(Client(4, "Dana", "dana@example.com", 260000.0, PropertyType.HOUSE))
+        client_manager.remove_client(3)
+        property_manager.find_property_by_id(2).views = 20
+        property_manager.adjust_prices()
+        property_manager.remove_property(1)
+
+    def test_recover_replays_journal(self):
+        """测试从 CSV 基线 + 日志恢复出与内存中一致的状态"""
+        client_manager, property_manager = self.baseline()
+        journal = Journal(self.journal_path, flush_interval=None)
+        journal.attach(client_manager, property_manager)
+        self.mutate(client_manager, property_manager)
+        journal.close()
+
+        recovered = recover(self.snapshot_path, self.journal_path, fallback=self.baseline)
+        self.assertEqual(state(*recovered[:2]), state(client_manager, property_manager))
+        self.assertEqual(recovered[2], journal.sequence)
+        self.assertEqual([c.client_ID for c in recovered[0].clients], [2, 4])
+        self.assertEqual(recovered[1].find_property_by_id(3).owner, "Alice")
+        self.assertEqual(recovered[1].find_property_by_id(4).features, ("garden",))
+        self.assertEqual(recovered[1].find_property_by_id(2).price, 315000.0)
+        self.assertEqual(recovered[1].stats.by_status(), {"AVAILABLE": 2, "SOLD": 1})
+        # 调价与回放都按新价格重新排布树
+        self.assertEqual([n.key for n in recovered[1].tree.iter_nodes()], [(145500.0, 3), (194000.0, 4), (315000.0, 2)])
+        self.assertEqual([n.key for n in property_manager.tree.iter_nodes()],
+                         [n.key for n in recovered[1].tree.iter_nodes()])
+
+    def test_group_commit(self):
+        """测试记录先缓冲，攒满一批或 flush 时一次写入并 fsync"""
+        client_manager, property_manager = self.baseline()
+        journal = Journal(self.journal_path, batch_size=4, flush_interval=None)
+        journal.attach(client_manager, property_manager)
+        for i in range(10, 13):
+            client_manager.add_client(Client(i, f"C{i}", "", 1000.0))
+        self.assertEqual(read_journal(self.journal_path)[0], [])
+        client_manager.add_client(Client(13, "C13", "", 1000.0))
+        self.assertEqual(len(read_journal(self.journal_path)[0]), 4)
+        client_manager.add_client(Client(14, "C14", "", 1000.0))
+        journal.flush()
+        self.assertEqual([r[0] for r in read_journal(self.journal_path)[0]], [1, 2, 3, 4, 5])
+        self.assertEqual(journal.syncs, 2)
+        journal.detach(client_manager, property_manager)
+        client_manager.add_client(Client(15, "C15", "", 1000.0))
+        journal.close()
+        self.assertEqual(len(read_journal(self.journal_path)[0]), 5)
+
+    def test_torn_tail_is_ignored(self):
+        """测试崩溃时写了一半的尾部在恢复时被忽略，重新打开后被截掉"""
+        client_manager, property_manager = self.baseline()
+        with Journal(self.journal_path, flush_interval=None) as journal:
+            journal.attach(client_manager, property_manager)
+            client_manager.remove_client(2)
+            client_manager.remove_client(3)
+        with open(self.journal_path, "ab") as f:
+            f.write(b'0badc0de {"seq":3,"event":"client_removed","da')
+
+        recovered_cm, _, sequence = recover(self.snapshot_path, self.journal_path, fallback=self.baseline)
+        self.assertEqual(sequence, 2)
+        self.assertEqual([c.client_ID for c in recovered_cm.clients], [1])
+        with Journal(self.journal_path, flush_interval=None) as journal:
+            self.assertEqual(journal.sequence, 2)
+        self.assertEqual(os.path.getsize(self.journal_path), read_journal(self.journal_path)[1])
+
+    def test_compaction(self):
+        """测试压缩为快照后清空日志，恢复时只回放压缩之后的记录"""
+        client_manager, property_manager = self.baseline()
+        journal = Journal(self.journal_path, flush_interval=None, compact_threshold=2)
+        journal.attach(client_manager, property_manager)
+        client_manager.remove_client(3)
+        self.assertFalse(journal.maybe_compact(self.snapshot_path, client_manager, property_manager))
+        property_manager.remove_property(2)
+        self.assertTrue(journal.maybe_compact(self.snapshot_path, client_manager, property_manager))
+        self.assertEqual(os.path.getsize(self.journal_path), 0)
+        property_manager.update_status(1, PropertyStatus.AVAILABLE)
+        client_manager.remove_client(1)
+        journal.close()
+
+        recovered_cm, recovered_pm, sequence = recover(self.snapshot_path, self.journal_path)
+        self.assertEqual(sequence, 4)
+        self.assertEqual(state(recovered_cm, recovered_pm), state(client_manager, property_manager))
+        # 重新打开日志时从快照序号之后继续编号
+        with Journal(self.journal_path, start_sequence=sequence, flush_interval=None) as journal:
+            self.assertEqual(journal.sequence, 4)
+
+    def test_compaction_syncs_snapshot_first(self):
+        """测试快照文件与目录 fsync 之后才截断日志"""
+        client_manager, property_manager = self.baseline()
+        journal = Journal(self.journal_path, flush_interval=None)
+        journal.attach(client_manager, property_manager)
+        client_manager.remove_client(3)
+        journal.flush()
+        journal_sizes = []
+        real_fsync = os.fsync
+
+        def fsync(fd):
+            journal_sizes.append(os.path.getsize(self.journal_path))
+            real_fsync(fd)
+
+        with mock.patch("os.fsync", fsync):
+            journal.compact(self.snapshot_path, client_manager, property_manager)
+        journal.close()
+        self.assertGreaterEqual(len(journal_sizes), 2)
+        self.assertTrue(all(journal_sizes[:-1]))  # 快照落盘时日志仍完整
+        self.assertEqual(journal_sizes[-1], 0)
+
+    def test_adjust_prices_after_compaction(self):
+        """测试调价清零的浏览量也写入日志：快照中的浏览量在回放后同样被清零"""
+        client_manager, property_manager = self.baseline()
+        journal = Journal(self.journal_path, flush_interval=None)
+        journal.attach(client_manager, property_manager)
+        property_manager.record_views([2] * 20)
+        journal.compact(self.snapshot_path, client_manager, property_manager)
+        property_manager.adjust_prices()
+        journal.close()
+
+        recovered_cm, recovered_pm, _ = recover(self.snapshot_path, self.journal_path)
+        self.assertEqual(recovered_pm.find_property_by_id(2).views, 0)
+        self.assertEqual(state(recovered_cm, recovered_pm), state(client_manager, property_manager))
+        self.assertEqual(recovered_pm.top_viewed(1), property_manager.top_viewed(1))
+        # 下一轮调价两边一致
+        self.assertEqual(recovered_pm.adjust_prices(), property_manager.adjust_prices())
+
+    def test_background_flush(self):
+        """测试后台线程定期落盘"""
+        client_manager, property_manager = self.baseline()
+        journal = Journal(self.journal_path, flush_interval=0.01)
+        journal.attach(client_manager, property_manager)
+        client_manager.remove_client(3)
+        for _ in range(200):
+            if read_journal(self.journal_path)[0]:
+                break
+            journal._stop.wait(0.01)
+        journal.close()
+        self.assertEqual(len(read_journal(self.journal_path)[0]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
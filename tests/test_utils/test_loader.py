@@ -2,13 +2,16 @@ import unittest
 import os
 import shutil
 import tempfile
-from real_estate.utils.loader import load_dataset
+from real_estate.utils.loader import (load_dataset, load_sharded_dataset, LoadReport, iter_batches,
+                                     parse_property, PROPERTY_COLUMNS)
 from real_estate.managers.client_manager import ClientManager
 from real_estate.managers.property_manager import PropertyManager
 from real_estate.models.property import PropertyStatus, PropertyType, Property
 from real_estate.models.client import Client
 from typing import Tuple
 import csv
+import contextlib
+import io
 
 
 def count_properties(tree) -> int:
@@ -84,10 +87,10 @@ class TestLoader(unittest.TestCase):
         # 验证房产数量
         self.assertEqual(count_properties(prop_mgr.tree), 4)
 
-        # 验证是否包含正确的price作为key
+        # 验证是否包含正确的 (price, property_ID) 作为key
         keys = get_all_keys(prop_mgr.tree)
-        self.assertIn(250000.0, keys)
-        self.assertIn(500000.0, keys)
+        self.assertIn((250000.0, 1), keys)
+        self.assertIn((500000.0, 4), keys)
 
     def test_clients_file_not_found(self):
         """测试找不到客户端文件抛异常"""
@@ -118,6 +121,135 @@ class TestLoader(unittest.TestCase):
         with self.assertRaises(ValueError):
             load_dataset(self.test_dir, "test_client.csv", "test_property.csv")
 
+    def test_bad_rows_are_reported_not_fatal(self):
+        """测试坏行被记录到报告中，其余行照常加载"""
+        with open(self.properties_file, "a", encoding='utf-8') as f:
+            f.write("x,Bad Id St,1.0,HOUSE,AVAILABLE\n")
+            f.write("6,Bad Type St,1.0,CASTLE,AVAILABLE\n")
+            f.write("7,Short Row St\n")
+            f.write("8,Good St,123.0,LAND,AVAILABLE\n")
+        report = LoadReport()
+        with self.assertLogs("real_estate.utils.loader", level="WARNING") as logs:
+            client_mgr, prop_mgr = load_dataset(self.test_dir, "test_client.csv", "test_property.csv",
+                                                chunk_size=2, report=report)
+        # 坏行只汇总为一条警告，逐行原因在 report 中
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Rejected 3 rows", logs.output[0])
+        self.assertEqual(report.clients_loaded, 3)
+        self.assertEqual(report.properties_loaded, 5)
+        self.assertEqual([r[1] for r in report.rejected], [6, 7, 8])
+        self.assertIsNotNone(prop_mgr.find_property_by_id(8))
+        self.assertEqual(count_properties(prop_mgr.tree), 5)
+
+    def test_duplicate_ids_are_reported(self):
+        """测试同一文件中重复 ID 的行记入报告（保留先出现的），与分片加载一致"""
+        with open(self.properties_file, "a", encoding='utf-8') as f:
+            f.write("1,Duplicate St,1.0,LAND,AVAILABLE\n")
+        with open(self.clients_file, "a", encoding='utf-8') as f:
+            f.write("2,Bobby,bobby@example.com,HOUSE,1000\n")
+        report = LoadReport()
+        client_mgr, prop_mgr = load_dataset(self.test_dir, "test_client.csv", "test_property.csv",
+                                            chunk_size=2, report=report)
+        self.assertEqual((report.clients_loaded, report.properties_loaded), (3, 4))
+        self.assertEqual([r[3] for r in report.rejected], ["duplicate clients ID 2", "duplicate properties ID 1"])
+        self.assertEqual(client_mgr.find_client_by_id(2).name, "Bob")
+        self.assertNotEqual(prop_mgr.find_property_by_id(1).address, "Duplicate St")
+
+    def test_strict_mode_raises_on_bad_row(self):
+        """测试strict模式下遇到坏行抛异常"""
+        with open(self.clients_file, "a", encoding='utf-8') as f:
+            f.write("4,Dan,dan@example.com,HOUSE,not-a-number\n")
+        with self.assertRaises(ValueError):
+            load_dataset(self.test_dir, "test_client.csv", "test_property.csv", strict=True)
+
+    def test_load_is_quiet(self):
+        """测试加载过程不再逐行打印到标准输出"""
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            load_dataset(self.test_dir, "test_client.csv", "test_property.csv")
+        self.assertEqual(buffer.getvalue(), "")
+
+    def test_iter_batches_chunks(self):
+        """测试按块流式产出解析结果"""
+        batches = list(iter_batches(self.properties_file, parse_property, PROPERTY_COLUMNS, "properties", chunk_size=3))
+        self.assertEqual([len(b) for b in batches], [3, 1])
+        self.assertEqual(batches[1][0].property_ID, 4)
+
+    def test_progress_callback(self):
+        """测试按已读字节汇报进度，回调抛异常即取消加载"""
+        calls = []
+        load_dataset(self.test_dir, "test_client.csv", "test_property.csv", chunk_size=2,
+                     progress=lambda done, total: calls.append((done, total)))
+        total = os.path.getsize(self.clients_file) + os.path.getsize(self.properties_file)
+        self.assertTrue(all(t == total for _, t in calls))
+        done = [d for d, _ in calls]
+        self.assertEqual(done, sorted(done))
+        self.assertEqual(done[-1], total)
+
+        class Cancelled(Exception):
+            pass
+
+        def cancel(done, total):
+            raise Cancelled()
+        with self.assertRaises(Cancelled):
+            load_dataset(self.test_dir, "test_client.csv", "test_property.csv", progress=cancel)
+
+    def _write_shards(self):
+        """按区域写入分片：north 与 south 中 ID 3 冲突"""
+        shard_dir = os.path.join(self.test_dir, "shards")
+        os.makedirs(os.path.join(shard_dir, "clients"))
+        os.makedirs(os.path.join(shard_dir, "properties"))
+        shards = {
+            "clients/north.csv": "client_ID,name,contact_info,property_type,budget\n"
+                                 "1,Alice,a@x.com,HOUSE,350000\n3,Charlie,c@x.com,HOUSE,400000\n",
+            "clients/south.csv": "client_ID,name,contact_info,property_type,budget\n"
+                                 "2,Bob,b@x.com,APARTMENT,250000\n3,Carol,carol@x.com,CONDO,100000\n",
+            "properties/north.csv": "property_ID,address,price,property_type,status\n"
+                                    "1,1 North Rd,250000.0,HOUSE,AVAILABLE\n3,3 North Rd,400000.0,HOUSE,AVAILABLE\n",
+            "properties/south.csv": "property_ID,address,price,property_type,status\n"
+                                    "2,2 South Rd,300000.0,APARTMENT,SOLD\n3,3 South Rd,100.0,HOUSE,AVAILABLE\n"
+                                    "4,4 South Rd,oops,HOUSE,AVAILABLE\n",
+        }
+        for name, content in shards.items():
+            with open(os.path.join(shard_dir, name), "w", newline='', encoding='utf-8') as f:
+                f.write(content)
+        return shard_dir
+
+    def test_load_sharded_dataset(self):
+        """测试多分片并行加载，ID 冲突按分片路径顺序保留先出现的记录"""
+        shard_dir = self._write_shards()
+        for workers in (1, 2):
+            report = LoadReport()
+            client_manager, property_manager = load_sharded_dataset(
+                os.path.join(shard_dir, "clients"), os.path.join(shard_dir, "properties", "*.csv"),
+                max_workers=workers, report=report)
+            self.assertEqual([c.client_ID for c in client_manager.clients], [1, 3, 2])
+            self.assertEqual(client_manager.find_client_by_id(3).name, "Charlie")
+            self.assertEqual(get_all_keys(property_manager.tree), [(250000.0, 1), (300000.0, 2), (400000.0, 3)])
+            self.assertEqual(property_manager.find_property_by_id(2).status, PropertyStatus.SOLD)
+            self.assertEqual((report.clients_loaded, report.properties_loaded), (3, 3))
+            # 两个坏行（Carol 的 CONDO 类型、价格 "oops"）+ 一个冲突 ID
+            reasons = [(os.path.basename(path), line, reason) for path, line, _, reason in report.rejected]
+            self.assertEqual([(name, line) for name, line, _ in reasons],
+                             [("south.csv", 3), ("south.csv", 4), ("south.csv", None)])
+            self.assertIn("CONDO", reasons[0][2])
+            self.assertIn("oops", reasons[1][2])
+            self.assertEqual(reasons[2][2], "duplicate properties ID 3")
+
+        calls = []
+        load_sharded_dataset(os.path.join(shard_dir, "clients"), os.path.join(shard_dir, "properties"),
+                             max_workers=1, progress=lambda done, total: calls.append((done, total)))
+        self.assertEqual(calls, [(1, 4), (2, 4), (3, 4), (4, 4)])
+
+    def test_load_sharded_dataset_errors(self):
+        """测试找不到分片与 strict 模式"""
+        shard_dir = self._write_shards()
+        with self.assertRaises(FileNotFoundError):
+            load_sharded_dataset(os.path.join(shard_dir, "missing"), os.path.join(shard_dir, "properties"))
+        with self.assertRaises(ValueError):
+            load_sharded_dataset(os.path.join(shard_dir, "clients"), os.path.join(shard_dir, "properties"),
+                                 max_workers=2, strict=True)
+
 
 if __name__ == "__main__":
     unittest.main()
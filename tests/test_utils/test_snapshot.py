@@ -0,0 +1,82 @@
+import unittest
+import os
+import shutil
+import tempfile
+from real_estate.utils.snapshot import save_snapshot, load_snapshot, snapshot_sequence
+from real_estate.managers.client_manager import ClientManager
+from real_estate.managers.property_manager import PropertyManager
+from real_estate.models import Client, Property, PropertyType, PropertyStatus
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "state.snap")
+
+        self.property_manager = PropertyManager()
+        self.property_manager.add_property(Property(1, "123 Main St", 250000.0, PropertyType.HOUSE, PropertyStatus.AVAILABLE))
+        self.property_manager.add_property(Property(2, "456 Elm St", 250000.0, PropertyType.APARTMENT,
+                                                    PropertyStatus.SOLD, owner="张三"))
+        self.property_manager.add_property(Property(3, "123 Main St", 99000.5, PropertyType.LAND, PropertyStatus.AVAILABLE))
+        prop = self.property_manager.find_property_by_id(1)
+        prop.add_view()
+        prop.add_view()
+        prop.add_inquiry()
+        prop.features = ["garage", "garden"]
+
+        self.client_manager = ClientManager()
+        self.client_manager.add_client(Client(7, "Alice", "alice@example.com", 350000.0, PropertyType.HOUSE,
+                                              preferred_neighborhoods=["Main"], preferred_features=["garage"]))
+        self.client_manager.add_client(Client(3, "Bob", "bob@example.com", 120000.0))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """测试保存后恢复出完全相同的房产、客户与运行时状态"""
+        self.assertEqual(save_snapshot(self.path, self.client_manager, self.property_manager, sequence=42), (3, 2))
+        self.assertEqual(snapshot_sequence(self.path), 42)
+        client_manager, property_manager = load_snapshot(self.path)
+
+        self.assertEqual([n.key for n in property_manager.tree.iter_nodes()],
+                         [n.key for n in self.property_manager.tree.iter_nodes()])
+        self.assertEqual(property_manager.count_properties(), 3)
+        sold = property_manager.find_property_by_id(2)
+        self.assertEqual((sold.status, sold.owner, sold.address), (PropertyStatus.SOLD, "张三", "456 Elm St"))
+        prop = property_manager.find_property_by_id(1)
+        self.assertEqual((prop.views, prop.inquiries, prop.features), (2, 1, ("garage", "garden")))
+        self.assertIsNone(property_manager.find_property_by_id(3).owner)
+
+        self.assertEqual([c.client_ID for c in client_manager.clients], [7, 3])
+        alice = client_manager.find_client_by_id(7)
+        self.assertEqual((alice.name, alice.budget, alice.property_type), ("Alice", 350000.0, PropertyType.HOUSE))
+        self.assertEqual((alice.preferred_neighborhoods, alice.preferred_features), (["Main"], ["garage"]))
+        bob = client_manager.find_client_by_id(3)
+        self.assertIsNone(bob.property_type)
+        self.assertEqual(bob.preferred_features, [])
+
+    def test_empty_managers(self):
+        """测试空状态也能保存与恢复"""
+        save_snapshot(self.path, ClientManager(), PropertyManager())
+        client_manager, property_manager = load_snapshot(self.path)
+        self.assertTrue(client_manager.clients.is_empty())
+        self.assertEqual(property_manager.count_properties(), 0)
+
+    def test_corrupt_file(self):
+        """测试魔数错误与内容损坏时抛 ValueError"""
+        save_snapshot(self.path, self.client_manager, self.property_manager)
+        with open(self.path, "rb") as f:
+            data = bytearray(f.read())
+        data[-1] ^= 0xFF
+        with open(self.path, "wb") as f:
+            f.write(data)
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+        with open(self.path, "wb") as f:
+            f.write(b"client_ID,name\n")
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()